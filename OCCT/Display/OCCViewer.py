@@ -57,6 +57,7 @@ from OCCT.Quantity import (
     Quantity_NOC_YELLOW,
 )
 from OCCT.Prs3d import Prs3d_Arrow, Prs3d_Text, Prs3d_TextAspect
+from OCCT.TopoDS import TopoDS_Shape
 from OCCT.Graphic3d import (
     Graphic3d_NOM_NEON_GNC,
     Graphic3d_NOT_ENV_CLOUDS,
@@ -74,6 +75,8 @@ from OCCT.Graphic3d import (
 )
 from OCCT.Aspect import Aspect_TOTP_RIGHT_LOWER, Aspect_FM_STRETCH, Aspect_FM_NONE
 
+from OCCT.Extend.Meshing import MeshingPolicy, mesh_shapes
+
 def rgb_color(r, g, b):
     return Quantity_Color(r, g, b, Quantity_TOC_RGB)
 
@@ -94,6 +97,14 @@ def get_color_from_name(color_name):
         print("Color name not defined. Use White by default")
     return Quantity_Color(color_num)
 
+
+def _as_color(color):
+    if isinstance(color, str):
+        return get_color_from_name(color)
+    if isinstance(color, int):
+        return Quantity_Color(color)
+    return color
+
 class Viewer3d():
     def __init__(self):
         self._parent = None  # the parent opengl GUI container
@@ -122,6 +133,7 @@ class Viewer3d():
         self._overlay_items = []
 
         self._window_handle = None
+        self._is_offscreen = False
 
         # some thing we'll need later
         self.modes = itertools.cycle(
@@ -185,8 +197,44 @@ class Viewer3d():
         if not self.wind.IsMapped():
             self.wind.Map()
 
+        self._init_view()
+
+    def InitOffscreen(self, width, height):
+        """render to a virtual window of width x height pixels instead of a
+        widget, for batch rendering with ExportToImage.
+
+        On Linux the window is a virtual (never mapped) Xw_Window, so an X
+        display is still required: run under Xvfb (xvfb-run) with software
+        Mesa (LIBGL_ALWAYS_SOFTWARE=1) on a headless server. Elsewhere an
+        Aspect_NeutralWindow is used.
+        """
+        caps = self._graphics_driver.ChangeOptions()
+        # no swap of the back buffer, which is read back by Dump
+        caps.buffersNoSwap = True
+        caps.swapInterval = 0
+
+        if sys.platform.startswith('linux'):
+            from OCCT.Xw import Xw_Window
+
+            window = Xw_Window(self.display_connect, "pyOCCT offscreen", 0, 0, width, height)
+        else:
+            from OCCT.Aspect import Aspect_NeutralWindow
+
+            window = Aspect_NeutralWindow()
+            window.SetSize(width, height)
+        window.SetVirtual(True)
+
+        self.wind = window
+        self.View.SetWindow(self.wind)
+        self._is_offscreen = True
+
+        self._init_view()
+        # no selection highlighting in batch rendering
+        self.Context.SetAutomaticHilight(False)
+        self.View.TriedronErase()
+
+    def _init_view(self):
         # AIS interactive context
-        
         self.Context.SetAutomaticHilight(True)
 
         self.Viewer.SetDefaultLights()
@@ -212,18 +260,18 @@ class Viewer3d():
         draw_face_boundaries=True,
         phong_shading=True,
         display_glinfo=True,
+        size=(640, 480),
     ):
+        """creates the view in the widget of window_handle, or offscreen
+        with the given (width, height) size if window_handle is None"""
         self._window_handle = window_handle
         self._parent = parent
 
-        # if self._window_handle is None:
-        #     self.InitOffscreen(640, 480)
-        #     self._is_offscreen = True
-        # else:
-        #     self.Init(self._window_handle)
-        #     self._is_offscreen = False
-
-        self.ConnectToWidget(self._window_handle)
+        if self._window_handle is None:
+            self.InitOffscreen(*size)
+        else:
+            self.ConnectToWidget(self._window_handle)
+            self._is_offscreen = False
 
         # # display OpenGl Information
         # if display_glinfo:
@@ -373,7 +421,8 @@ class Viewer3d():
         )
 
     def ExportToImage(self, image_filename):
-        self.View.Dump(image_filename)
+        if not self.View.Dump(image_filename):
+            raise IOError(f"Can't write {image_filename}.")
 
     def display_graduated_trihedron(self):
         a_trihedron_data = Graphic3d_GraduatedTrihedron()
@@ -560,22 +609,17 @@ class Viewer3d():
         if material is None:
             # The default material is too shiny to show the object
             # color well, so I set it to something less reflective
-            for shape_to_display in ais_shapes:
-                shape_to_display.SetMaterial(
-                    Graphic3d_MaterialAspect(Graphic3d_NOM_NEON_GNC)
-                )
+            default_material = Graphic3d_MaterialAspect(Graphic3d_NOM_NEON_GNC)
         if color:
-            if isinstance(color, str):
-                color = get_color_from_name(color)
-            elif isinstance(color, int):
-                color = Quantity_Color(color)
-            for shp in ais_shapes:
-                self.Context.SetColor(shp, color, False)
-        if transparency:
-            for shape_to_display in ais_shapes:
-                shape_to_display.SetTransparency(transparency)
-        # display the shapes
+            color = _as_color(color)
         for shape_to_display in ais_shapes:
+            if material is None:
+                shape_to_display.SetMaterial(default_material)
+            if color:
+                self.Context.SetColor(shape_to_display, color, False)
+            if transparency:
+                shape_to_display.SetTransparency(transparency)
+            # display the shapes
             self.Context.Display(shape_to_display, False)
         if update:
             # especially this call takes up a lot of time...
@@ -584,6 +628,100 @@ class Viewer3d():
         
         return ais_shapes
 
+    def MakePresentations(
+        self,
+        shapes,
+        color=None,
+        material=None,
+        transparency=None,
+        mesh_policy=None,
+        workers=None,
+    ):
+        """build the AIS_Shape of each TopoDS_Shape of shapes, without
+        displaying them.
+
+        The shapes are triangulated first, in parallel with
+        OCCT.Extend.Meshing.mesh_shapes and mesh_policy, and the
+        presentations use this triangulation instead of meshing each shape
+        again when displayed. The shapes whose meshing failed keep the
+        automatic triangulation of the presentation. They share a single
+        material aspect.
+        color is a single color or one color per shape, as a
+        Quantity_Color, a color name or a Quantity_NameOfColor.
+        """
+        shapes = list(shapes)
+        if isinstance(color, (list, tuple)):
+            if len(color) != len(shapes):
+                raise AssertionError("Expected one color per shape.")
+            colors = [_as_color(c) if c else None for c in color]
+        else:
+            colors = itertools.repeat(_as_color(color) if color else None)
+
+        if material is None:
+            material = Graphic3d_MaterialAspect(Graphic3d_NOM_NEON_GNC)
+        elif isinstance(material, Graphic3d_NameOfMaterial):
+            material = Graphic3d_MaterialAspect(material)
+
+        topods_shapes = [shape for shape in shapes if isinstance(shape, TopoDS_Shape)]
+        meshed = []
+        if topods_shapes:
+            if mesh_policy is None:
+                mesh_policy = MeshingPolicy()
+            reports = mesh_shapes(topods_shapes, mesh_policy, workers)
+            meshed = [report.done for report in reports]
+        meshed = iter(meshed)
+
+        ais_shapes = []
+        for shape, shape_color in zip(shapes, colors):
+            if isinstance(shape, AIS_Shape):
+                ais_shapes.append(shape)
+                continue
+            shape_to_display = AIS_Shape(shape)
+            if next(meshed):
+                # use the triangulation computed above as is
+                shape_to_display.Attributes().SetAutoTriangulation(False)
+            shape_to_display.SetMaterial(material)
+            if shape_color is not None:
+                shape_to_display.SetColor(shape_color)
+            if transparency:
+                shape_to_display.SetTransparency(transparency)
+            ais_shapes.append(shape_to_display)
+        return ais_shapes
+
+    def DisplayShapes(
+        self,
+        shapes,
+        color=None,
+        material=None,
+        transparency=None,
+        update=True,
+        mesh_policy=None,
+        workers=None,
+    ):
+        """display many shapes at once with a single viewer update, see
+        MakePresentations for the parameters. Much faster than DisplayShape
+        on large assemblies."""
+        ais_shapes = self.MakePresentations(
+            shapes, color, material, transparency, mesh_policy, workers
+        )
+        for shape_to_display in ais_shapes:
+            self.Context.Display(shape_to_display, AIS_Shaded, 0, False)
+        if update:
+            self.FitAll()
+            self.Repaint()
+        return ais_shapes
+
+    def DisplayAssembly(self, assembly, grouped=False, material=None, update=False):
+        """display an OCCT.Extend.Assembly.Assembly, computing one presentation
+        per part and connecting its instances to it"""
+        ais_objects = assembly.display(
+            self.Context, grouped=grouped, material=material
+        )
+        if update:
+            self.FitAll()
+            self.Repaint()
+        return ais_objects
+
     def DisplayColoredShape(
         self,
         shapes,
@@ -713,4 +851,51 @@ class Viewer3d():
         self.View.Zoom(X, Y)
 
     def StartRotation(self, X, Y):
-        self.View.StartRotation(X, Y)
\ No newline at end of file
+        self.View.StartRotation(X, Y)
+
+class OffscreenRenderer(Viewer3d):
+    """renders shapes to image files without any widget, reusing the same
+    OpenGL context for all the images. See Viewer3d.InitOffscreen for the
+    requirements on headless Linux servers.
+
+        renderer = OffscreenRenderer(256, 256)
+        for shape, filename in zip(shapes, filenames):
+            renderer.render(shape, filename)
+    """
+
+    def __init__(
+        self,
+        width=640,
+        height=480,
+        background=(1.0, 1.0, 1.0),
+        draw_face_boundaries=True,
+        phong_shading=True,
+    ):
+        super().__init__()
+        self.Create(
+            draw_face_boundaries=draw_face_boundaries,
+            phong_shading=phong_shading,
+            display_glinfo=False,
+            size=(width, height),
+        )
+        self.View.SetBackgroundColor(Quantity_TOC_RGB, *background)
+
+    def render(self, shapes, filename, color=None, material=None, proj=V3d_XposYnegZpos):
+        """displays shapes alone, fits them in a view along proj and writes
+        the image to filename (png, jpg, bmp... according to the
+        extension)"""
+        self.Context.RemoveAll(False)
+        self.DisplayShape(shapes, color=color, material=material)
+        self.View.SetProj(proj)
+        self.FitAll()
+        self.View.Redraw()
+        self.ExportToImage(filename)
+        return filename
+
+    def render_many(self, items, filenames, color=None, material=None, proj=V3d_XposYnegZpos):
+        """renders each item (a shape or a list of shapes) of items to the
+        matching filename and returns the list of the filenames"""
+        return [
+            self.render(shapes, filename, color, material, proj)
+            for shapes, filename in zip(items, filenames)
+        ]
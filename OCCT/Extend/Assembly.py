@@ -0,0 +1,327 @@
+# This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+# geometry kernel.
+#
+# Copyright (C) 2016-2018 Laughlin Research, LLC
+# Copyright (C) 2019-2020 Trevor Laughlin and pyOCCT contributors
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+import os
+from typing import NamedTuple, Optional
+
+from OCCT.AIS import AIS_ConnectedInteractive, AIS_MultipleConnectedInteractive, AIS_Shape
+from OCCT.Graphic3d import Graphic3d_MaterialAspect, Graphic3d_NOM_NEON_GNC
+from OCCT.gp import gp_Trsf
+from OCCT.IFSelect import IFSelect_RetDone
+from OCCT.Quantity import Quantity_Color
+from OCCT.RWGltf import RWGltf_CafWriter
+from OCCT.STEPCAFControl import STEPCAFControl_Writer
+from OCCT.STEPControl import STEPControl_AsIs
+from OCCT.TCollection import TCollection_AsciiString, TCollection_ExtendedString
+from OCCT.TColStd import TColStd_IndexedDataMapOfStringString
+from OCCT.TDataStd import TDataStd_Name
+from OCCT.TDocStd import TDocStd_Document
+from OCCT.TopLoc import TopLoc_Location
+from OCCT.TopoDS import TopoDS_Shape
+from OCCT.TopTools import TopTools_IndexedMapOfShape
+from OCCT.XCAFDoc import XCAFDoc_ColorGen, XCAFDoc_DocumentTool
+
+from OCCT.Extend.DataExchange import (
+    _create_Compound,
+    _label_name,
+    _static_values,
+    iter_step_file_shapes,
+    iter_xcaf_shapes,
+)
+from OCCT.Extend.Meshing import MeshingPolicy, mesh_shapes
+from OCCT.Extend.Progress import ProgressSteps, check_progress, progress_range
+
+
+class Prototype(NamedTuple):
+    """A part of an Assembly: a shape without location, shared by all its
+    instances."""
+
+    shape: TopoDS_Shape
+    name: str
+    color: Optional[Quantity_Color]
+
+
+class Instance(NamedTuple):
+    """A placement of a Prototype in an Assembly. The color overrides the
+    one of the prototype when not None."""
+
+    prototype: int
+    location: TopLoc_Location
+    name: str
+    color: Optional[Quantity_Color]
+
+
+def _as_location(location):
+    if location is None:
+        return TopLoc_Location()
+    if isinstance(location, gp_Trsf):
+        return TopLoc_Location(location)
+    return location
+
+
+class Assembly:
+    """An instanced assembly: unique parts (prototypes) plus the locations of
+    their instances.
+
+    Memory, meshing and GPU buffers scale with the number of prototypes, not
+    with the number of instances. Instances are displayed with
+    AIS_ConnectedInteractive objects referencing one AIS_Shape per prototype,
+    and written to STEP and glTF through an XCAF document where each
+    instance is a component referring to its part.
+
+    Parameters
+    ----------
+    name : str
+        the name of the assembly, used for the root label on export
+    """
+
+    def __init__(self, name=""):
+        self.name = name
+        self.prototypes = []
+        self.instances = []
+        self._prototype_map = TopTools_IndexedMapOfShape()
+
+    def __len__(self):
+        return len(self.instances)
+
+    def __iter__(self):
+        """Iterate over the (prototype, instance) pairs."""
+        for instance in self.instances:
+            yield self.prototypes[instance.prototype], instance
+
+    @property
+    def nb_prototypes(self):
+        return len(self.prototypes)
+
+    @property
+    def nb_instances(self):
+        return len(self.instances)
+
+    def add_prototype(self, shape, name="", color=None):
+        """Add a part and return its index. The same shape (sharing its
+        TShape and location, orientation aside) is only added once, so
+        located copies of a part are distinct prototypes. Use add_shape to
+        add them as instances of their unlocated shape."""
+        index = self._prototype_map.Add(shape) - 1
+        if index == len(self.prototypes):
+            self.prototypes.append(Prototype(shape, name, color))
+        return index
+
+    def add_instance(self, prototype, location=None, name="", color=None):
+        """Place the part of index prototype at location (a TopLoc_Location
+        or a gp_Trsf) and return the instance index."""
+        if not 0 <= prototype < len(self.prototypes):
+            raise IndexError(f"No prototype {prototype}.")
+        self.instances.append(Instance(prototype, _as_location(location), name, color))
+        return len(self.instances) - 1
+
+    def add_shape(self, shape, name="", color=None, prototype_name=None):
+        """Add a located shape as an instance of its unlocated shape, which
+        becomes a prototype if not already known. Return the instance
+        index."""
+        prototype = self.add_prototype(
+            shape.Located(TopLoc_Location()),
+            name if prototype_name is None else prototype_name,
+        )
+        return self.add_instance(prototype, shape.Location(), name, color)
+
+    @classmethod
+    def from_xcaf(cls, doc, name=""):
+        """Build the assembly of the simple shapes of an XCAF document, each
+        part of the document becoming a single prototype."""
+        assembly = cls(name)
+        assembly._add_records(iter_xcaf_shapes(doc))
+        return assembly
+
+    @classmethod
+    def from_step_file(cls, filename, name=None):
+        """Read a STEP file keeping its instancing, see from_xcaf."""
+        assembly = cls(os.path.basename(filename) if name is None else name)
+        assembly._add_records(iter_step_file_shapes(filename))
+        return assembly
+
+    def _add_records(self, records):
+        for record in records:
+            # the instance is named after its component label, if any
+            instance_name = ""
+            if len(record.label_path) > 1:
+                instance_name = _label_name(record.label_path[-2])
+            self.add_shape(
+                record.located_shape(),
+                instance_name or record.name,
+                record.color,
+                prototype_name=record.name,
+            )
+
+    def located_shapes(self):
+        """Iterate over the instances as located shapes, sharing the geometry
+        of their prototype."""
+        for prototype, instance in self:
+            yield prototype.shape.Moved(instance.location)
+
+    def to_compound(self):
+        """A compound of all the instances. Its sub-shapes share the TShapes
+        of the prototypes."""
+        return _create_Compound(list(self.located_shapes()))
+
+    def mesh(self, linear_deflection=None, angular_deflection=0.5, policy=None, workers=None, progress=None):
+        """Triangulate the prototypes, once per part and in parallel, and
+        return the list of their MeshReport. Without policy, the deflection
+        is linear_deflection, or relative to the size of each part if None.
+        progress: optional, an OCCT.Extend.Progress.Progress, see
+        mesh_shapes."""
+        if policy is None:
+            policy = MeshingPolicy(linear_deflection, angular_deflection=angular_deflection)
+        reports = mesh_shapes(
+            [prototype.shape for prototype in self.prototypes], policy, workers, progress=progress
+        )
+        for prototype, report in zip(self.prototypes, reports):
+            if not report.done:
+                raise AssertionError(f"Mesh of {prototype.name} not done.")
+        return reports
+
+    ###########
+    # Display #
+    ###########
+    def display(self, display, grouped=False, material=None, update=False):
+        """Display the assembly in a Viewer3d (or an AIS_InteractiveContext)
+        and return the list of the displayed AIS objects.
+
+        One AIS_Shape is computed per prototype and color, and the instances
+        are AIS_ConnectedInteractive objects referencing it. If grouped is
+        True, all the instances are gathered in a single
+        AIS_MultipleConnectedInteractive, which is faster to display but
+        selected as a whole.
+        """
+        context = getattr(display, "Context", display)
+        if material is None:
+            material = Graphic3d_MaterialAspect(Graphic3d_NOM_NEON_GNC)
+
+        references = {}
+        group = AIS_MultipleConnectedInteractive() if grouped else None
+        displayed = []
+        for prototype, instance in self:
+            color = instance.color or prototype.color
+            rgb = None if color is None else (color.Red(), color.Green(), color.Blue())
+            key = (instance.prototype, rgb)
+            reference = references.get(key)
+            if reference is None:
+                reference = AIS_Shape(prototype.shape)
+                reference.SetMaterial(material)
+                if color is not None:
+                    reference.SetColor(color)
+                references[key] = reference
+            trsf = instance.location.Transformation()
+            if grouped:
+                group.Connect(reference, trsf)
+            else:
+                connected = AIS_ConnectedInteractive()
+                connected.Connect(reference, trsf)
+                context.Display(connected, False)
+                displayed.append(connected)
+        if grouped:
+            context.Display(group, False)
+            displayed.append(group)
+        if update:
+            context.UpdateCurrentViewer()
+        return displayed
+
+    ##########
+    # Export #
+    ##########
+    def to_xcaf(self, doc=None):
+        """Return an XCAF document with one label per prototype and one
+        component per instance."""
+        if doc is None:
+            doc = TDocStd_Document(TCollection_ExtendedString("pythonocc-doc-assembly"))
+        shape_tool = XCAFDoc_DocumentTool.ShapeTool_(doc.Main())
+        color_tool = XCAFDoc_DocumentTool.ColorTool_(doc.Main())
+
+        root = shape_tool.NewShape()
+        if self.name:
+            TDataStd_Name.Set_(root, TCollection_ExtendedString(self.name))
+
+        part_labels = []
+        for prototype in self.prototypes:
+            label = shape_tool.AddShape(prototype.shape, False)
+            if prototype.name:
+                TDataStd_Name.Set_(label, TCollection_ExtendedString(prototype.name))
+            if prototype.color is not None:
+                color_tool.SetColor(label, prototype.color, XCAFDoc_ColorGen)
+            part_labels.append(label)
+
+        for instance in self.instances:
+            label = shape_tool.AddComponent(root, part_labels[instance.prototype], instance.location)
+            if instance.name:
+                TDataStd_Name.Set_(label, TCollection_ExtendedString(instance.name))
+            if instance.color is not None:
+                color_tool.SetColor(label, instance.color, XCAFDoc_ColorGen)
+
+        shape_tool.UpdateAssemblies()
+        return doc
+
+    def write_step_file(self, filename, application_protocol="AP214IS"):
+        """Write the assembly to a STEP file, the parts being written once and
+        referenced by the instances."""
+        if application_protocol not in ["AP203", "AP214IS", "AP242DIS"]:
+            raise AssertionError(
+                f"application_protocol must be either AP203, AP214IS or AP242DIS. You passed {application_protocol}."
+            )
+        doc = self.to_xcaf()
+        with _static_values({"write.step.schema": application_protocol}):
+            writer = STEPCAFControl_Writer()
+            writer.SetColorMode(True)
+            writer.SetNameMode(True)
+            if not writer.Transfer(doc, STEPControl_AsIs):
+                raise IOError("Error while transferring the assembly to STEP.")
+            status = writer.Write(filename)
+        if status != IFSelect_RetDone:
+            raise IOError(f"Error while writing the assembly to STEP file. Err {status}")
+        if not os.path.isfile(filename):
+            raise IOError(f"{filename} not saved to filesystem.")
+
+    def write_gltf_file(
+        self, filename, binary=None, linear_deflection=None, angular_deflection=0.5, progress=None
+    ):
+        """Write the assembly to a glTF file, each part mesh being written
+        once and instanced by the nodes.
+        binary: optional, True for a .glb file. Guessed from the extension by
+        default.
+        linear_deflection: optional, mesh the prototypes first. Otherwise
+        their existing triangulation is used.
+        progress: optional, an OCCT.Extend.Progress.Progress reporting the
+        meshing and the writing. OperationCancelled is raised if it is
+        cancelled.
+        """
+        if binary is None:
+            binary = filename.lower().endswith(".glb")
+        nb_steps = 1 if linear_deflection is None else 2
+        with ProgressSteps(progress, nb_steps, "glTF export") as steps:
+            if linear_deflection is not None:
+                self.mesh(linear_deflection, angular_deflection, progress=steps.next("Meshing"))
+            doc = self.to_xcaf()
+
+            file_info = TColStd_IndexedDataMapOfStringString()
+            file_info.Add(TCollection_AsciiString("Authors"), TCollection_AsciiString("pyOCCT"))
+            writer = RWGltf_CafWriter(TCollection_AsciiString(filename), binary)
+            step = steps.next("Writing")
+            done = writer.Perform(doc, file_info, progress_range(step))
+            check_progress(step, f"Writing {filename}")
+        if not done:
+            raise IOError("Error while writing the assembly to glTF file.")
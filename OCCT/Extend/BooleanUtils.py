@@ -0,0 +1,247 @@
+# This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+# geometry kernel.
+#
+# Copyright (C) 2016-2018 Laughlin Research, LLC
+# Copyright (C) 2019-2020 Trevor Laughlin and pyOCCT contributors
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+from OCCT.BOPAlgo import (
+    BOPAlgo_COMMON,
+    BOPAlgo_CUT,
+    BOPAlgo_CUT21,
+    BOPAlgo_FUSE,
+    BOPAlgo_GlueFull,
+    BOPAlgo_GlueOff,
+    BOPAlgo_GlueShift,
+    BOPAlgo_PaveFiller,
+)
+from OCCT.BRepAlgoAPI import (
+    BRepAlgoAPI_BooleanOperation,
+    BRepAlgoAPI_BuilderAlgo,
+    BRepAlgoAPI_Section,
+)
+from OCCT.TopoDS import TopoDS_Shape
+from OCCT.TopTools import TopTools_ListOfShape
+
+from OCCT.Extend.Parallel import is_parallel
+from OCCT.Extend.Progress import check_progress, progress_range
+
+_GLUE = {"off": BOPAlgo_GlueOff, "shift": BOPAlgo_GlueShift, "full": BOPAlgo_GlueFull}
+
+_OPERATIONS = {
+    "common": BOPAlgo_COMMON,
+    "fuse": BOPAlgo_FUSE,
+    "cut": BOPAlgo_CUT,
+    "cut21": BOPAlgo_CUT21,
+}
+
+_RESULTS = ("common", "fuse", "cut", "cut21", "section", "general_fuse")
+
+
+def _as_shapes(shapes):
+    if shapes is None:
+        return []
+    if isinstance(shapes, TopoDS_Shape):
+        return [shapes]
+    return list(shapes)
+
+
+def _as_list(shapes):
+    shape_list = TopTools_ListOfShape()
+    for shape in shapes:
+        shape_list.Append(shape)
+    return shape_list
+
+
+class BooleanAlgo:
+    """A built Boolean algorithm returned by BooleanOperations.operation.
+
+    The algorithm only holds a pointer to the intersection of the
+    BooleanOperations it comes from, so this wrapper keeps a reference to
+    it. Attributes are looked up on the algorithm, e.g. Shape, Modified,
+    Generated, IsDeleted or SectionEdges.
+    """
+
+    def __init__(self, algo, operations):
+        self.algo = algo
+        self.operations = operations
+
+    def __getattr__(self, name):
+        return getattr(self.algo, name)
+
+
+class BooleanOperations:
+    """Boolean operations sharing a single intersection of their arguments.
+
+    The arguments are intersected once by a BOPAlgo_PaveFiller when the
+    object is created, which is the expensive part of a Boolean operation.
+    Then common, cut, fuse, section and general_fuse only build their result
+    from this intersection. Computing the common, cut and fuse of two
+    assemblies thus costs one intersection instead of three.
+
+    Parameters
+    ----------
+    objects : TopoDS_Shape or list of TopoDS_Shape
+        the objects of the operations
+    tools : TopoDS_Shape or list of TopoDS_Shape, optional
+        the tools of the operations. Required by common, cut, fuse and
+        section, not by general_fuse
+    fuzzy_value : float, optional
+        additional tolerance of the intersection
+    glue : str, optional
+        "off" (default), "shift" or "full", to speed up the intersection of
+        shapes sharing coincident, or only touching, sub-shapes
+    use_obb : bool
+        filter the pairs of sub-shapes with oriented bounding boxes before
+        intersecting them, faster on inclined or sparse shapes
+    non_destructive : bool
+        never modify the input shapes, True by default
+    parallel : bool, optional
+        run in parallel, the bop parallel mode of OCCT.Extend.Parallel by
+        default
+    progress : OCCT.Extend.Progress.Progress, optional
+        reports the intersection. OperationCancelled is raised if it is
+        cancelled
+
+        operations = BooleanOperations(wing_assy, fuse_assy, fuzzy_value=1.0e-5)
+        common = operations.common()
+        fused = operations.fuse()
+    """
+
+    def __init__(
+        self,
+        objects,
+        tools=None,
+        fuzzy_value=None,
+        glue="off",
+        use_obb=False,
+        non_destructive=True,
+        parallel=None,
+        progress=None,
+    ):
+        if glue not in _GLUE:
+            raise AssertionError(f"glue must be either off, shift or full. You passed {glue}.")
+        self._objects = _as_shapes(objects)
+        self._tools = _as_shapes(tools)
+        if not self._objects:
+            raise AssertionError("No object to intersect.")
+        self.fuzzy_value = fuzzy_value
+        self.glue = glue
+        self.use_obb = use_obb
+        self.non_destructive = non_destructive
+        self.parallel = is_parallel("bop") if parallel is None else parallel
+
+        self._filler = BOPAlgo_PaveFiller()
+        self._filler.SetArguments(_as_list(self._objects + self._tools))
+        self._filler.SetNonDestructive(non_destructive)
+        self._filler.SetGlue(_GLUE[glue])
+        self._filler.SetRunParallel(self.parallel)
+        self._filler.SetUseOBB(use_obb)
+        if fuzzy_value is not None:
+            self._filler.SetFuzzyValue(fuzzy_value)
+        self._filler.Perform(progress_range(progress))
+        check_progress(progress, "Intersection")
+        if self._filler.HasErrors():
+            raise AssertionError("The intersection of the arguments failed.")
+
+    @property
+    def pave_filler(self):
+        """the BOPAlgo_PaveFiller holding the intersection"""
+        return self._filler
+
+    def _build(self, algo, progress, name):
+        # the other options only apply to the intersection, already done
+        algo.SetRunParallel(self.parallel)
+        algo.Build(progress_range(progress))
+        check_progress(progress, name)
+        if algo.HasErrors():
+            raise AssertionError(f"The {name} of the arguments failed.")
+        return algo
+
+    def operation(self, operation, progress=None):
+        """the built BRepAlgoAPI_BooleanOperation of operation, "common",
+        "fuse", "cut" (objects minus tools) or "cut21" (tools minus objects),
+        to query the history of the result. It is wrapped in a BooleanAlgo,
+        which keeps this object and its intersection alive"""
+        if operation not in _OPERATIONS:
+            raise AssertionError(
+                f"operation must be either common, fuse, cut or cut21. You passed {operation}."
+            )
+        if not self._tools:
+            raise AssertionError(f"The {operation} needs tools.")
+        algo = BRepAlgoAPI_BooleanOperation(self._filler)
+        algo.SetArguments(_as_list(self._objects))
+        algo.SetTools(_as_list(self._tools))
+        algo.SetOperation(_OPERATIONS[operation])
+        return BooleanAlgo(self._build(algo, progress, operation), self)
+
+    def common(self, progress=None):
+        """the common part of the objects and the tools"""
+        return self.operation("common", progress).Shape()
+
+    def fuse(self, progress=None):
+        """the union of the objects and the tools"""
+        return self.operation("fuse", progress).Shape()
+
+    def cut(self, progress=None):
+        """the objects minus the tools"""
+        return self.operation("cut", progress).Shape()
+
+    def cut21(self, progress=None):
+        """the tools minus the objects"""
+        return self.operation("cut21", progress).Shape()
+
+    def section(self, progress=None):
+        """the intersection edges and vertices of the objects and the
+        tools"""
+        if not self._tools:
+            raise AssertionError("The section needs tools.")
+        algo = BRepAlgoAPI_Section(self._filler)
+        algo.SetArguments(_as_list(self._objects))
+        algo.SetTools(_as_list(self._tools))
+        return self._build(algo, progress, "section").Shape()
+
+    def general_fuse(self, progress=None):
+        """all the arguments split by each other (General Fuse), sharing
+        their coincident sub-shapes"""
+        algo = BRepAlgoAPI_BuilderAlgo(self._filler)
+        algo.SetArguments(_as_list(self._objects + self._tools))
+        return self._build(algo, progress, "general fuse").Shape()
+
+    def results(self, operations=("common", "cut", "fuse"), progress=None):
+        """a dict {operation: result shape} of several operations, common,
+        fuse, cut, cut21, section or general_fuse, built from the single
+        intersection"""
+        for operation in operations:
+            if operation not in _RESULTS:
+                raise ValueError(
+                    f"operation must be one of {', '.join(_RESULTS)}. You passed {operation}."
+                )
+        return {operation: getattr(self, operation)(progress) for operation in operations}
+
+
+def boolean_results(objects, tools, operations=("common", "cut", "fuse"), **options):
+    """the dict {operation: result shape} of operations of objects and tools
+    with a single intersection, see BooleanOperations for the options"""
+    return BooleanOperations(objects, tools, **options).results(operations)
+
+
+def fuse_shapes(shapes, **options):
+    """the union of N shapes with a single intersection, see
+    BooleanOperations for the options"""
+    shapes = list(shapes)
+    if len(shapes) == 1:
+        return shapes[0]
+    return BooleanOperations(shapes[:1], shapes[1:], **options).fuse()
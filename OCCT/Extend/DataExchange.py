@@ -15,17 +15,29 @@
 ##You should have received a copy of the GNU Lesser General Public License
 ##along with pythonOCC.  If not, see <http://www.gnu.org/licenses/>.
 
+import hashlib
+import json
+import mmap
 import os
-
-from OCCT.TopoDS import TopoDS_Shape
+import pickle
+import tempfile
+import time
+import multiprocessing
+from collections import deque
+from contextlib import contextmanager
+from multiprocessing.connection import wait
+from typing import NamedTuple, Optional, Tuple
+
+from OCCT.TopoDS import TopoDS_Shape, TopoDS_Iterator
 from OCCT.TopAbs import TopAbs_SOLID, TopAbs_SHELL, TopAbs_COMPOUND
 from OCCT.BRepTools import BRepTools
-from OCCT.BRepMesh import BRepMesh_IncrementalMesh
+from OCCT.BinTools import BinTools, BinTools_FormatVersion_CURRENT
 from OCCT.StlAPI import StlAPI, StlAPI_Writer
+from OCCT.RWStl import RWStl
 from OCCT.BRep import BRep_Builder
 from OCCT.gp import gp_Pnt, gp_Dir, gp_Pnt2d
 from OCCT.Bnd import Bnd_Box2d
-from OCCT.TopoDS import TopoDS_Compound
+from OCCT.TopoDS import TopoDS_Compound, TopoDS_Face
 from OCCT.IGESControl import (
     IGESControl_Controller,
     IGESControl_Reader,
@@ -42,12 +54,17 @@ from OCCT.TDocStd import TDocStd_Document
 from OCCT.XCAFDoc import (
     XCAFDoc_DocumentTool,
     XCAFDoc_ColorTool,
+    XCAFDoc_ShapeTool,
+    XCAFDoc_ColorGen,
+    XCAFDoc_ColorSurf,
+    XCAFDoc_ColorCurv,
 )
 from OCCT.STEPCAFControl import STEPCAFControl_Reader
 from OCCT.TDF import TDF_LabelSequence, TDF_Label
+from OCCT.TDataStd import TDataStd_Name
 from OCCT.Quantity import Quantity_Color, Quantity_TOC_RGB
 from OCCT.TopLoc import TopLoc_Location
-from OCCT.BRepBuilderAPI import BRepBuilderAPI_Transform
+from OCCT.TopTools import TopTools_FormatVersion_CURRENT
 
 from OCCT.TColStd import TColStd_IndexedDataMapOfStringString
 from OCCT.TCollection import TCollection_AsciiString
@@ -62,6 +79,9 @@ from OCCT.RWMesh import (
 )
 from OCCT.UnitsMethods import UnitsMethods
 
+from OCCT.Extend.Meshing import mesh_shape
+from OCCT.Extend.Parallel import configure, is_parallel as is_parallel_mode, threads_per_process
+from OCCT.Extend.Progress import check_progress, progress_range
 from OCCT.Extend.TopologyUtils import (
     discretize_edge,
     get_sorted_hlr_edges,
@@ -76,6 +96,10 @@ try:
 except ImportError:
     HAVE_SVGWRITE = False
 
+# first bytes of the binary BRep files written by BinTools, whatever the
+# format version
+_BINARY_BREP_HEADER = b"Open CASCADE Topology V"
+
 def _create_Compound(shapes: list):
     builder = BRep_Builder()
     compound = TopoDS_Compound()
@@ -94,19 +118,437 @@ def check_svgwrite_installed():
         )
 
 
+def _compound_children(shape):
+    """the direct sub-shapes of a compound, in order"""
+    shapes = []
+    iterator = TopoDS_Iterator(shape)
+    while iterator.More():
+        shapes.append(iterator.Value())
+        iterator.Next()
+    return shapes
+
+
+def _split_roots(shape, nb_roots, as_compound):
+    """the result of a STEP import packed as a single shape: the shape itself
+    for one root or if as_compound, the list of the roots otherwise"""
+    if nb_roots == 1 or as_compound:
+        return shape
+    return _compound_children(shape)
+
+
+###############
+# Shape cache #
+###############
+class ShapeCache:
+    """persistent on-disk cache of imported shapes.
+    directory: optional, where the cache files are stored, ~/.cache/pyocct
+    by default.
+    max_size: optional, the size limit of the cache in bytes, 1 GiB by
+    default. The least recently used entries are evicted past this limit.
+
+    Each entry is a binary BRep file (BinTools) holding the imported shape
+    and a json file with the metadata (number of roots, names, colors...).
+    Entries are keyed on the hash of the file content and of the reader
+    options, so a modified file is imported again. Files are written to a
+    temporary name then renamed, and the json file is written last, so that
+    several processes can share the same directory.
+
+    Pass the cache to read_step_file, read_iges_file or
+    read_step_file_with_names_colors:
+        cache = ShapeCache()
+        shape = read_step_file("part.step", cache=cache)
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, directory=None, max_size=1 << 30):
+        if directory is None:
+            directory = os.path.join(os.path.expanduser("~"), ".cache", "pyocct")
+        self.directory = os.fspath(directory)
+        self.max_size = max_size
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def file_hash(filename, chunk_size=1 << 20):
+        """the sha256 hex digest of the file content"""
+        digest = hashlib.sha256()
+        with open(filename, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def make_key(self, filename, reader, **options):
+        """the cache key of filename imported by reader (a name) with the
+        given options, which must be json serializable"""
+        digest = hashlib.sha256()
+        header = {
+            "format": self.FORMAT_VERSION,
+            "reader": reader,
+            "options": options,
+        }
+        digest.update(json.dumps(header, sort_keys=True).encode("utf-8"))
+        digest.update(self.file_hash(filename).encode("ascii"))
+        return digest.hexdigest()
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return base + ".bin", base + ".json"
+
+    def get(self, key):
+        """the (shape, metadata) tuple stored under key, None on a miss"""
+        brep_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, "r") as f:
+                metadata = json.load(f)
+            shape = TopoDS_Shape()
+            if not BinTools.Read_(shape, brep_path):
+                return None
+        except (OSError, ValueError, RuntimeError):
+            # missing, evicted meanwhile by another process or corrupted
+            return None
+        if shape.IsNull():
+            return None
+        try:
+            # the modification time of the json file is the LRU stamp
+            os.utime(meta_path)
+        except OSError:
+            pass
+        return shape, metadata
+
+    def _atomic_write(self, path, write):
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=".tmp_", suffix=os.path.splitext(path)[1], dir=self.directory
+        )
+        os.close(fd)
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def put(self, key, shape, metadata=None):
+        """stores shape and its json serializable metadata under key, then
+        evicts the least recently used entries past max_size"""
+        brep_path, meta_path = self._paths(key)
+
+        def write_brep(path):
+            if not BinTools.Write_(shape, path):
+                raise IOError(f"Can't write {path}.")
+
+        def write_metadata(path):
+            with open(path, "w") as f:
+                json.dump(metadata or {}, f)
+
+        self._atomic_write(brep_path, write_brep)
+        self._atomic_write(meta_path, write_metadata)
+        self.evict()
+
+    def entries(self):
+        """the list of (last use time, size in bytes, key) of the entries"""
+        entries = []
+        for name in os.listdir(self.directory):
+            key, ext = os.path.splitext(name)
+            if ext != ".json" or name.startswith("."):
+                continue
+            brep_path, meta_path = self._paths(key)
+            try:
+                meta_stat = os.stat(meta_path)
+                size = meta_stat.st_size + os.path.getsize(brep_path)
+            except OSError:
+                continue
+            entries.append((meta_stat.st_mtime, size, key))
+        return entries
+
+    def size(self):
+        """the total size of the entries in bytes"""
+        return sum(size for _, size, _ in self.entries())
+
+    def remove(self, key):
+        """removes an entry, the json file first so that it is never read
+        without its shape"""
+        for path in reversed(self._paths(key)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def evict(self, max_size=None):
+        """removes the least recently used entries until the cache is below
+        max_size, self.max_size by default"""
+        if max_size is None:
+            max_size = self.max_size
+        if max_size is not None:
+            entries = sorted(self.entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, key in entries:
+                if total <= max_size:
+                    break
+                self.remove(key)
+                total -= size
+        # temporary files left over by killed processes
+        limit = time.time() - 3600
+        for name in os.listdir(self.directory):
+            if not name.startswith(".tmp_"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < limit:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        """removes all the entries"""
+        self.evict(0)
+
+
+#############
+# Exporters #
+#############
+def _iter_shapes(shapes):
+    """the TopoDS_Shape of a shape, an AIS_Shape or an iterable of them"""
+    if isinstance(shapes, (TopoDS_Shape, AIS_Shape)):
+        shapes = [shapes]
+    for shape in shapes:
+        if isinstance(shape, AIS_Shape):
+            shape = shape.Shape()
+        if shape.IsNull():
+            raise AssertionError("Shape is null.")
+        yield shape
+
+
+@contextmanager
+def _static_values(values):
+    """sets the Interface_Static string parameters of values, a dict
+    {name: value}, and restores their previous values on exit"""
+    previous = {name: Interface_Static.CVal_(name) for name in values}
+    try:
+        for name, value in values.items():
+            Interface_Static.SetCVal_(name, value)
+        yield
+    finally:
+        for name, value in previous.items():
+            Interface_Static.SetCVal_(name, value)
+
+
+class _Exporter:
+    """base class of the exporters: shapes are added one by one or in bulk
+    with add, and the file is written once by write, or when leaving the
+    with block without error."""
+
+    def __init__(self, filename):
+        self.filename = os.fspath(filename)
+        self.nb_shapes = 0
+        self._written = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None and not self._written:
+            self.write()
+
+    def add(self, shapes):
+        """adds a shape, an AIS_Shape or an iterable of them"""
+        if self._written:
+            raise AssertionError(f"{self.filename} is already written.")
+        for shape in _iter_shapes(shapes):
+            self._add(shape)
+            self.nb_shapes += 1
+        return self
+
+    def write(self):
+        """writes the file"""
+        if self._written:
+            raise AssertionError(f"{self.filename} is already written.")
+        self._write()
+        self._written = True
+        if not os.path.isfile(self.filename):
+            raise IOError(f"{self.filename} not saved to filesystem.")
+
+    def _add(self, shape):
+        raise NotImplementedError
+
+    def _write(self):
+        raise NotImplementedError
+
+
+class _CompoundExporter(_Exporter):
+    """exporter of formats written from a single shape: the shapes are added
+    to one compound as they come"""
+
+    def __init__(self, filename):
+        super().__init__(filename)
+        self._builder = BRep_Builder()
+        self._compound = TopoDS_Compound()
+        self._builder.MakeCompound(self._compound)
+        self._single = None
+
+    def _add(self, shape):
+        self._single = shape if self.nb_shapes == 0 else None
+        self._builder.Add(self._compound, shape)
+
+    @property
+    def shape(self):
+        """the shape to write: the only shape added, or their compound"""
+        return self._compound if self._single is None else self._single
+
+
+class StepExporter(_Exporter):
+    """writes many shapes to one STEP file, each shape being transferred as
+    a root of the file as soon as it is added.
+    filename: the file path
+    application_protocol: "AP203", "AP214IS" or "AP242DIS"
+    unit: optional, the length unit of the file ("MM", "M", "INCH"...)
+
+        with StepExporter("parts.step", "AP214IS") as exporter:
+            for part in parts:
+                exporter.add(part)
+    """
+
+    def __init__(self, filename, application_protocol="AP203", unit=None):
+        if application_protocol not in ["AP203", "AP214IS", "AP242DIS"]:
+            raise AssertionError(
+                f"application_protocol must be either AP203, AP214IS or AP242DIS. You passed {application_protocol}."
+            )
+        super().__init__(filename)
+        # the writer model takes its schema and unit from the static
+        # parameters when it is created, they are restored afterwards so
+        # that later exports don't inherit them
+        values = {"write.step.schema": application_protocol}
+        if unit is not None:
+            values["write.step.unit"] = unit
+        with _static_values(values):
+            self._writer = STEPControl_Writer()
+
+    def _add(self, shape):
+        status = self._writer.Transfer(shape, STEPControl_AsIs)
+        if status != IFSelect_RetDone:
+            raise IOError(f"Error while transferring shape to STEP. Err {status}")
+
+    def _write(self):
+        status = self._writer.Write(self.filename)
+        if status != IFSelect_RetDone:
+            raise IOError(f"Error while writing shape to STEP file. Err {status}")
+
+
+class IgesExporter(_Exporter):
+    """writes many shapes to one IGES file.
+    filename: the file path
+    unit: optional, "MM" by default
+    brep_mode: optional, False by default. Write the shapes as BRep entities
+    (MSBO) instead of trimmed surfaces.
+    """
+
+    def __init__(self, filename, unit="MM", brep_mode=False):
+        super().__init__(filename)
+        IGESControl_Controller.Init_()
+        self._writer = IGESControl_Writer(unit, 1 if brep_mode else 0)
+
+    def _add(self, shape):
+        if not self._writer.AddShape(shape):
+            raise IOError("Error while transferring shape to IGES.")
+
+    def _write(self):
+        self._writer.ComputeModel()
+        if not self._writer.Write(self.filename):
+            raise IOError("Error while writing shape to IGES file.")
+
+
+class StlExporter(_CompoundExporter):
+    """writes many shapes to one STL file. The shapes must be meshed first,
+    with BRepMesh_IncrementalMesh.
+    filename: the file path
+    mode: optional, "ascii" by default. Can either be "binary"
+    """
+
+    def __init__(self, filename, mode="ascii"):
+        if mode not in ["ascii", "binary"]:
+            raise AssertionError("mode should be either ascii or binary")
+        super().__init__(filename)
+        self._writer = StlAPI_Writer()
+        self._writer.SetASCIIMode(mode == "ascii")
+
+    def _write(self):
+        if not self._writer.Write(self.shape, self.filename):
+            raise IOError("Error while writing shape to STL file.")
+
+
+class BrepExporter(_CompoundExporter):
+    """writes many shapes to one BRep file, gathered in a compound if more
+    than one.
+    filename: the file path
+    binary: optional, False by default. Write the binary format of BinTools
+    instead of the text format of BRepTools.
+    with_triangles: optional, True by default. Write the triangulations of
+    the faces, else strip them from the file.
+    """
+
+    def __init__(self, filename, binary=False, with_triangles=True):
+        super().__init__(filename)
+        self.binary = binary
+        self.with_triangles = with_triangles
+
+    def _write(self):
+        if self.binary:
+            done = BinTools.Write_(
+                self.shape,
+                self.filename,
+                self.with_triangles,
+                self.with_triangles,
+                BinTools_FormatVersion_CURRENT,
+                Message_ProgressRange(),
+            )
+        else:
+            done = BRepTools.Write_(
+                self.shape,
+                self.filename,
+                self.with_triangles,
+                self.with_triangles,
+                TopTools_FormatVersion_CURRENT,
+                Message_ProgressRange(),
+            )
+        if not done:
+            raise IOError("Error while writing shape to BRep file.")
+
+
 ##########################
 # Step import and export #
 ##########################
-def read_step_file(filename, as_compound=True, verbosity=True):
+def read_step_file(filename, as_compound=True, verbosity=True, cache=None, progress=None):
     """read the STEP file and returns a compound
     filename: the file path
     verbosity: optional, False by default.
     as_compound: True by default. If there are more than one shape at root,
     gather all shapes into one compound. Otherwise returns a list of shapes.
+    cache: optional, a ShapeCache. The shapes are taken from the cache if the
+    file was already imported, and stored in it otherwise.
+    progress: optional, an OCCT.Extend.Progress.Progress reporting the
+    transfer. OperationCancelled is raised if it is cancelled.
     """
     if not os.path.isfile(filename):
         raise FileNotFoundError(f"{filename} not found.")
-
+    if cache is None:
+        return _read_step_file(filename, as_compound, verbosity, progress)
+
+    key = cache.make_key(filename, "STEPControl_Reader")
+    cached = cache.get(key)
+    if cached is None:
+        roots = _read_step_file(filename, False, verbosity, progress)
+        if isinstance(roots, list):
+            cached = (_create_Compound(roots), {"nb_roots": len(roots)})
+        else:
+            cached = (roots, {"nb_roots": 1})
+        cache.put(key, *cached)
+    shape, metadata = cached
+    return _split_roots(shape, metadata["nb_roots"], as_compound)
+
+
+def _read_step_file(filename, as_compound, verbosity, progress=None):
     step_reader = STEPControl_Reader()
     status = step_reader.ReadFile(filename)
 
@@ -116,7 +558,8 @@ def read_step_file(filename, as_compound=True, verbosity=True):
         failsonly = False
         step_reader.PrintCheckLoad(failsonly, IFSelect_ItemsByEntity)
         step_reader.PrintCheckTransfer(failsonly, IFSelect_ItemsByEntity)
-    transfer_result = step_reader.TransferRoots()
+    transfer_result = step_reader.TransferRoots(progress_range(progress))
+    check_progress(progress, f"Reading {filename}")
     if not transfer_result:
         raise AssertionError("Transfer failed.")
     _nbs = step_reader.NbShapes()
@@ -125,7 +568,8 @@ def read_step_file(filename, as_compound=True, verbosity=True):
     if _nbs == 1:  # most cases
         return step_reader.Shape(1)
     if _nbs > 1:
-        print("Number of shapes:", _nbs)
+        if verbosity:
+            print("Number of shapes:", _nbs)
         shps = []
         # loop over root shapes
         for k in range(1, _nbs + 1):
@@ -137,88 +581,335 @@ def read_step_file(filename, as_compound=True, verbosity=True):
             if not result:
                 print("Warning: all shapes were not added to the compound")
             return compound
-        print("Warning, returns a list of shapes.")
+        if verbosity:
+            print("Warning, returns a list of shapes.")
         return shps
     return None
 
 
-def _write_step_file(a_shape, filename, application_protocol="AP203"):
-    """exports a shape to a STEP file
-    a_shape: the topods_shape to export (a compound, a solid etc.)
+def _read_step_worker(conn, verbosity, threads):
+    """worker process loop of read_step_files. Receives (index, filename)
+    tasks and answers (index, brep_bytes, nb_roots, error)"""
+    configure(threads=threads)
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+        index, filename = task
+        try:
+            shape = read_step_file(filename, as_compound=False, verbosity=verbosity)
+            if isinstance(shape, list):
+                nb_roots = len(shape)
+                shape = _create_Compound(shape)
+            else:
+                nb_roots = 1
+            conn.send((index, shape_to_bytes(shape), nb_roots, None))
+        except Exception as error:
+            try:
+                pickle.dumps(error)
+            except Exception:
+                error = RuntimeError(f"{type(error).__name__}: {error}")
+            conn.send((index, None, 0, error))
+    conn.close()
+
+
+def read_step_files(
+    filenames,
+    workers=None,
+    timeout=None,
+    as_compound=True,
+    verbosity=False,
+    return_exceptions=True,
+    mp_context=None,
+):
+    """read several STEP files in parallel, each in a worker process.
+    filenames: the file paths
+    workers: optional, number of worker processes, os.cpu_count() by default.
+    timeout: optional, maximum time in seconds allowed to read one file. The
+    worker reading a file past its deadline is killed and replaced.
+    as_compound: True by default, see read_step_file.
+    verbosity: optional, False by default.
+    return_exceptions: True by default. The exception raised while reading a
+    file is returned at its place in the result list. If False, the first
+    error is raised once all the files are processed.
+    mp_context: optional, the multiprocessing context, "spawn" by default.
+
+    Returns the shapes in the order of filenames. Each worker has its own
+    STEPControl_Reader and Interface_Static state so the files are truly read
+    in parallel, with a thread pool sized so that the workers don't
+    oversubscribe the processors. The results are sent back through the worker pipes as
+    binary BRep bytes, see shape_to_bytes.
+    Note that with the "spawn" context the calling script must be protected
+    by an `if __name__ == "__main__":` guard.
+    """
+    filenames = [os.fspath(filename) for filename in filenames]
+    results = [None] * len(filenames)
+    if not filenames:
+        return results
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(filenames)))
+    # share the processors between the workers
+    threads = threads_per_process(workers)
+    if mp_context is None or isinstance(mp_context, str):
+        mp_context = multiprocessing.get_context(mp_context or "spawn")
+
+    pending = deque(enumerate(filenames))
+    idle = []
+    busy = {}  # connection -> (process, index, deadline)
+
+    def start_worker():
+        parent_conn, child_conn = mp_context.Pipe()
+        process = mp_context.Process(
+            target=_read_step_worker, args=(child_conn, verbosity, threads), daemon=True
+        )
+        process.start()
+        child_conn.close()
+        return process, parent_conn
+
+    def load_result(data, nb_roots):
+        return _split_roots(shape_from_bytes(data), nb_roots, as_compound)
+
+    try:
+        for _ in range(workers):
+            idle.append(start_worker())
+        while pending or busy:
+            while pending and idle:
+                process, conn = idle.pop()
+                index, filename = pending.popleft()
+                conn.send((index, filename))
+                deadline = None if timeout is None else time.monotonic() + timeout
+                busy[conn] = (process, index, deadline)
+
+            deadlines = [d for _, _, d in busy.values() if d is not None]
+            wait_time = None
+            if deadlines:
+                wait_time = max(0.0, min(deadlines) - time.monotonic())
+            for conn in wait(list(busy), wait_time):
+                process, index, _ = busy.pop(conn)
+                try:
+                    _, data, nb_roots, error = conn.recv()
+                except EOFError:
+                    error = RuntimeError(
+                        f"Worker process died (exit code {process.exitcode}) while reading {filenames[index]}."
+                    )
+                    process.join()
+                    conn.close()
+                    if pending:
+                        idle.append(start_worker())
+                else:
+                    idle.append((process, conn))
+                    if error is None:
+                        try:
+                            results[index] = load_result(data, nb_roots)
+                        except Exception as load_error:
+                            error = load_error
+                if error is not None:
+                    results[index] = error
+
+            now = time.monotonic()
+            for conn, (process, index, deadline) in list(busy.items()):
+                if deadline is not None and now >= deadline:
+                    del busy[conn]
+                    process.terminate()
+                    process.join()
+                    conn.close()
+                    results[index] = TimeoutError(
+                        f"Reading {filenames[index]} took more than {timeout} s."
+                    )
+                    if pending:
+                        idle.append(start_worker())
+    finally:
+        for process, conn in idle:
+            try:
+                conn.send(None)
+            except (OSError, ValueError):
+                pass
+        for conn, (process, _, _) in busy.items():
+            process.terminate()
+            process.join()
+            conn.close()
+        for process, conn in idle:
+            process.join()
+            conn.close()
+
+    if not return_exceptions:
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+    return results
+
+
+def write_step_file(shapes, filename, application_protocol="AP203"):
+    """exports one or many shapes to a STEP file
+    shapes: a topods_shape, an AIS_Shape or an iterable of them
     filename: the filename
     application protocol: "AP203" or "AP214IS" or "AP242DIS"
+    Use a StepExporter to write many shapes as they are built.
+    """
+    with StepExporter(filename, application_protocol) as exporter:
+        exporter.add(shapes)
+
+
+def read_step_file_with_names_colors(filename, cache=None, verbosity=False, progress=None):
+    """Returns a dict {topods_shape: [name, color]}
+    Use OCAF.
+    The shapes are placed at their location in the assemblies, sharing the
+    geometry of their part. Parts without color are grey. Use
+    iter_step_file_shapes to stream the records instead.
+    cache: optional, a ShapeCache, see read_step_file.
+    verbosity: optional, False by default.
+    progress: optional, a Progress, see read_step_file.
     """
-    # a few checks
-    if a_shape.IsNull():
-        raise AssertionError(f"Shape {a_shape} is null.")
-    if application_protocol not in ["AP203", "AP214IS", "AP242DIS"]:
-        raise AssertionError(
-            f"application_protocol must be either AP203 or AP214IS. You passed {application_protocol}."
-        )
-    if os.path.isfile(filename):
-        print(f"Warning: {filename} file already exists and will be replaced")
-    # creates and initialise the step exporter
-    step_writer = STEPControl_Writer()
-    Interface_Static.SetCVal("write.step.schema", application_protocol)
-
-    # transfer shapes and write file
-    step_writer.Transfer(a_shape, STEPControl_AsIs)
-    status = step_writer.Write(filename)
-
-    if not status == IFSelect_RetDone:
-        raise IOError(f"Error while writing shape to STEP file.Err {status}")
     if not os.path.isfile(filename):
-        raise IOError(f"{filename} not saved to filesystem.")
-    
-def write_step_file(shapes, filename, application_protocol="AP203"):
-    '''
-        Write by potato-pythonocc
-        shapes: topods_shape or list to export
-        filename: the filename
-        application protocol: "AP203" or "AP214IS" or "AP242DIS"
-    '''
-    if isinstance(shapes, list):
-        if application_protocol not in ["AP203", "AP214IS", "AP242DIS"]:
-            raise AssertionError(
-                f"application_protocol must be either AP203 or AP214IS. You passed {application_protocol}."
+        raise FileNotFoundError(f"{filename} not found.")
+    if cache is None:
+        return _read_step_file_with_names_colors(filename, verbosity, progress)
+
+    key = cache.make_key(filename, "STEPCAFControl_Reader")
+    cached = cache.get(key)
+    if cached is not None:
+        shape, metadata = cached
+        return {
+            shp: [name, Quantity_Color(r, g, b, Quantity_TOC_RGB)]
+            for shp, name, (r, g, b) in zip(
+                _compound_children(shape), metadata["names"], metadata["colors"]
             )
-        if os.path.isfile(filename):
-            print(f"Warning: {filename} file already exists and will be replaced")
-        step_writer = STEPControl_Writer()
-        Interface_Static.SetCVal("write.step.schema", application_protocol)
-        for i in shapes:
-            if isinstance(i, AIS_Shape):
-                i = i.Shape()
-            if i.IsNull():
-                raise AssertionError(f"Shape is null.")
-            step_writer.Transfer(i, STEPControl_AsIs)
-        status = step_writer.Write(filename)
-        if not status == IFSelect_RetDone:
-            raise IOError(f"Error while writing shape to STEP file.Err {status}")
-        if not os.path.isfile(filename):
-            raise IOError(f"{filename} not saved to filesystem.")
-    else:
-        _write_step_file(shapes, filename, application_protocol)
+        }
+    output_shapes = _read_step_file_with_names_colors(filename, verbosity, progress)
+    metadata = {
+        "names": [name for name, _ in output_shapes.values()],
+        "colors": [[c.Red(), c.Green(), c.Blue()] for _, c in output_shapes.values()],
+    }
+    cache.put(key, _create_Compound(list(output_shapes)), metadata)
+    return output_shapes
 
 
-def read_step_file_with_names_colors(filename):
-    """Returns list of tuples (topods_shape, label, color)
-    Use OCAF.
+class XCAFShapeRecord(NamedTuple):
+    """a shape found while walking an XCAF document.
+    label_path: the labels from the free shape down to this shape, with the
+    component labels of the assemblies in between.
+    shape: the prototype shape, shared by all the instances of a part.
+    location: the accumulated location of the instance in the assemblies.
+    name: the label name, "" if not set.
+    color: the Quantity_Color of the instance, or of the part if the
+    instance has none, None if not set.
+    """
+
+    label_path: Tuple[TDF_Label, ...]
+    shape: TopoDS_Shape
+    location: TopLoc_Location
+    name: str
+    color: Optional[Quantity_Color]
+
+    def located_shape(self):
+        """the shape placed at its location. The geometry is shared with the
+        prototype, not copied."""
+        return self.shape.Moved(self.location)
+
+
+def _label_name(label):
+    status, name = label.FindAttribute(TDataStd_Name.GetID_(), TDataStd_Name())
+    if not status:
+        return ""
+    return name.Get().ToExtString()
+
+
+def _label_color(*labels):
+    """the first color set on labels, looking for the generic, surface and
+    curve colors in turn"""
+    for label in labels:
+        for color_type in (XCAFDoc_ColorGen, XCAFDoc_ColorSurf, XCAFDoc_ColorCurv):
+            color = Quantity_Color()
+            if XCAFDoc_ColorTool.GetColor_(label, color_type, color):
+                return color
+    return None
+
+
+def iter_xcaf_shapes(doc, subshapes=False, verbosity=False):
+    """walk the assemblies of an XCAF document and yield a XCAFShapeRecord
+    for each instance of a simple shape, depth first in the document order.
+    doc: the TDocStd_Document.
+    subshapes: optional, False by default. Also yield a record for each
+    labelled sub-shape (a named or colored face...), just after its shape.
+    verbosity: optional, False by default. Print the name of the shapes.
+
+    The tree is walked with an explicit stack, so deep assemblies don't hit
+    the recursion limit, and the records are produced one at a time.
     """
+    shape_tool = XCAFDoc_DocumentTool.ShapeTool_(doc.Main())
+    free_labels = TDF_LabelSequence()
+    shape_tool.GetFreeShapes(free_labels)
+
+    # (label path, label holding the shape, location, component color)
+    stack = []
+    for i in range(free_labels.Length(), 0, -1):
+        label = free_labels.Value(i)
+        stack.append(((label,), label, TopLoc_Location(), None))
+
+    while stack:
+        path, label, location, instance_color = stack.pop()
+        if XCAFDoc_ShapeTool.IsAssembly_(label):
+            components = TDF_LabelSequence()
+            XCAFDoc_ShapeTool.GetComponents_(label, components, False)
+            for i in range(components.Length(), 0, -1):
+                component = components.Value(i)
+                if not XCAFDoc_ShapeTool.IsReference_(component):
+                    continue
+                referred = TDF_Label()
+                XCAFDoc_ShapeTool.GetReferredShape_(component, referred)
+                stack.append(
+                    (
+                        path + (component, referred),
+                        referred,
+                        location.Multiplied(XCAFDoc_ShapeTool.GetLocation_(component)),
+                        instance_color or _label_color(component),
+                    )
+                )
+        elif XCAFDoc_ShapeTool.IsSimpleShape_(label):
+            name = _label_name(label)
+            if verbosity:
+                print("Shape:", name)
+            yield XCAFShapeRecord(
+                path,
+                XCAFDoc_ShapeTool.GetShape_(label),
+                location,
+                name,
+                instance_color or _label_color(label),
+            )
+            if not subshapes:
+                continue
+            sub_labels = TDF_LabelSequence()
+            XCAFDoc_ShapeTool.GetSubShapes_(label, sub_labels)
+            for i in range(1, sub_labels.Length() + 1):
+                sub_label = sub_labels.Value(i)
+                yield XCAFShapeRecord(
+                    path + (sub_label,),
+                    XCAFDoc_ShapeTool.GetShape_(sub_label),
+                    location,
+                    _label_name(sub_label),
+                    _label_color(sub_label),
+                )
+
+
+def iter_step_file_shapes(filename, subshapes=False, verbosity=False, progress=None):
+    """read the STEP file into an XCAF document and return an iterator over
+    its shapes, see iter_xcaf_shapes. The file is read and transferred by
+    this call, so errors are raised here and not on the first record.
+    progress: optional, a Progress, see read_step_file."""
+    doc = _read_step_file_to_xcaf(filename, progress)
+    # the generator holds the document for as long as it is iterated
+    return iter_xcaf_shapes(doc, subshapes, verbosity)
+
+
+def _read_step_file_to_xcaf(filename, progress=None):
+    """the XCAF document of a STEP file, with names, colors, layers,
+    materials and GD&T"""
     if not os.path.isfile(filename):
         raise FileNotFoundError(f"{filename} not found.")
-    # the list:
-    output_shapes = {}
 
-    # create an handle to a document
     doc = TDocStd_Document("pythonocc-doc-step-import")
 
-    # Get root assembly
-    shape_tool = XCAFDoc_DocumentTool.ShapeTool(doc.Main())
-    color_tool = XCAFDoc_DocumentTool.ColorTool(doc.Main())
-    # layer_tool = XCAFDoc_DocumentTool_LayerTool(doc.Main())
-    # mat_tool = XCAFDoc_DocumentTool_MaterialTool(doc.Main())
-
     step_reader = STEPCAFControl_Reader()
     step_reader.SetColorMode(True)
     step_reader.SetLayerMode(True)
@@ -227,207 +918,26 @@ def read_step_file_with_names_colors(filename):
     step_reader.SetGDTMode(True)
 
     status = step_reader.ReadFile(filename)
-    if status == IFSelect_RetDone:
-        step_reader.Transfer(doc)
-
-    locs = []
-
-    def _get_sub_shapes(lab, loc):
-        # global cnt, lvl
-        # cnt += 1
-        # print("\n[%d] level %d, handling LABEL %s\n" % (cnt, lvl, _get_label_name(lab)))
-        # print()
-        # print(lab.DumpToString())
-        # print()
-        # print("Is Assembly    :", shape_tool.IsAssembly(lab))
-        # print("Is Free        :", shape_tool.IsFree(lab))
-        # print("Is Shape       :", shape_tool.IsShape(lab))
-        # print("Is Compound    :", shape_tool.IsCompound(lab))
-        # print("Is Component   :", shape_tool.IsComponent(lab))
-        # print("Is SimpleShape :", shape_tool.IsSimpleShape(lab))
-        # print("Is Reference   :", shape_tool.IsReference(lab))
-
-        # users = TDF_LabelSequence()
-        # users_cnt = shape_tool.GetUsers(lab, users)
-        # print("Nr Users       :", users_cnt)
-
-        l_subss = TDF_LabelSequence()
-        shape_tool.GetSubShapes(lab, l_subss)
-        # print("Nb subshapes   :", l_subss.Length())
-        l_comps = TDF_LabelSequence()
-        shape_tool.GetComponents(lab, l_comps)
-        # print("Nb components  :", l_comps.Length())
-        # print()
-        name = lab.GetLabelName()
-        print("Name :", name)
-
-        if shape_tool.IsAssembly(lab):
-            l_c = TDF_LabelSequence()
-            shape_tool.GetComponents(lab, l_c)
-            for i in range(l_c.Length()):
-                label = l_c.Value(i + 1)
-                if shape_tool.IsReference(label):
-                    # print("\n########  reference label :", label)
-                    label_reference = TDF_Label()
-                    shape_tool.GetReferredShape(label, label_reference)
-                    loc = shape_tool.GetLocation(label)
-                    # print("    loc          :", loc)
-                    # trans = loc.Transformation()
-                    # print("    tran form    :", trans.Form())
-                    # rot = trans.GetRotation()
-                    # print("    rotation     :", rot)
-                    # print("    X            :", rot.X())
-                    # print("    Y            :", rot.Y())
-                    # print("    Z            :", rot.Z())
-                    # print("    W            :", rot.W())
-                    # tran = trans.TranslationPart()
-                    # print("    translation  :", tran)
-                    # print("    X            :", tran.X())
-                    # print("    Y            :", tran.Y())
-                    # print("    Z            :", tran.Z())
-
-                    locs.append(loc)
-                    # print(">>>>")
-                    # lvl += 1
-                    _get_sub_shapes(label_reference, loc)
-                    # lvl -= 1
-                    # print("<<<<")
-                    locs.pop()
-
-        elif shape_tool.IsSimpleShape(lab):
-            # print("\n########  simpleshape label :", lab)
-            shape = shape_tool.GetShape(lab)
-            # print("    all ass locs   :", locs)
-
-            loc = TopLoc_Location()
-            for l in locs:
-                # print("    take loc       :", l)
-                loc = loc.Multiplied(l)
-
-            # trans = loc.Transformation()
-            # print("    FINAL loc    :")
-            # print("    tran form    :", trans.Form())
-            # rot = trans.GetRotation()
-            # print("    rotation     :", rot)
-            # print("    X            :", rot.X())
-            # print("    Y            :", rot.Y())
-            # print("    Z            :", rot.Z())
-            # print("    W            :", rot.W())
-            # tran = trans.TranslationPart()
-            # print("    translation  :", tran)
-            # print("    X            :", tran.X())
-            # print("    Y            :", tran.Y())
-            # print("    Z            :", tran.Z())
-            c = Quantity_Color(0.5, 0.5, 0.5, Quantity_TOC_RGB)  # default color
-            color_set = False
-            if (
-                color_tool.GetInstanceColor(shape, 0, c)
-                or color_tool.GetInstanceColor(shape, 1, c)
-                or color_tool.GetInstanceColor(shape, 2, c)
-            ):
-                color_tool.SetInstanceColor(shape, 0, c)
-                color_tool.SetInstanceColor(shape, 1, c)
-                color_tool.SetInstanceColor(shape, 2, c)
-                color_set = True
-                n = c.Name(c.Red(), c.Green(), c.Blue())
-                print(
-                    "    instance color Name & RGB: ",
-                    c,
-                    n,
-                    c.Red(),
-                    c.Green(),
-                    c.Blue(),
-                )
-
-            if not color_set:
-                if (
-                    XCAFDoc_ColorTool.GetColor(lab, 0, c)
-                    or XCAFDoc_ColorTool.GetColor(lab, 1, c)
-                    or XCAFDoc_ColorTool.GetColor(lab, 2, c)
-                ):
-                    color_tool.SetInstanceColor(shape, 0, c)
-                    color_tool.SetInstanceColor(shape, 1, c)
-                    color_tool.SetInstanceColor(shape, 2, c)
-
-                    n = c.Name(c.Red(), c.Green(), c.Blue())
-                    print(
-                        "    shape color Name & RGB: ",
-                        c,
-                        n,
-                        c.Red(),
-                        c.Green(),
-                        c.Blue(),
-                    )
+    if status != IFSelect_RetDone:
+        raise AssertionError("Error: can't read file.")
+    transfer_result = step_reader.Transfer(doc, progress_range(progress))
+    check_progress(progress, f"Reading {filename}")
+    if not transfer_result:
+        raise AssertionError("Transfer failed.")
+    return doc
 
-            shape_disp = BRepBuilderAPI_Transform(shape, loc.Transformation()).Shape()
-            if shape_disp not in output_shapes:
-                output_shapes[shape_disp] = [lab.GetLabelName(), c]
-            for i in range(l_subss.Length()):
-                lab_subs = l_subss.Value(i + 1)
-                # print("\n########  simpleshape subshape label :", lab)
-                shape_sub = shape_tool.GetShape(lab_subs)
-
-                c = Quantity_Color(0.5, 0.5, 0.5, Quantity_TOC_RGB)  # default color
-                color_set = False
-                if (
-                    color_tool.GetInstanceColor(shape_sub, 0, c)
-                    or color_tool.GetInstanceColor(shape_sub, 1, c)
-                    or color_tool.GetInstanceColor(shape_sub, 2, c)
-                ):
-                    color_tool.SetInstanceColor(shape_sub, 0, c)
-                    color_tool.SetInstanceColor(shape_sub, 1, c)
-                    color_tool.SetInstanceColor(shape_sub, 2, c)
-                    color_set = True
-                    n = c.Name(c.Red(), c.Green(), c.Blue())
-                    print(
-                        "    instance color Name & RGB: ",
-                        c,
-                        n,
-                        c.Red(),
-                        c.Green(),
-                        c.Blue(),
-                    )
 
-                if not color_set:
-                    if (
-                        XCAFDoc_ColorTool.GetColor(lab_subs, 0, c)
-                        or XCAFDoc_ColorTool.GetColor(lab_subs, 1, c)
-                        or XCAFDoc_ColorTool.GetColor(lab_subs, 2, c)
-                    ):
-                        color_tool.SetInstanceColor(shape, 0, c)
-                        color_tool.SetInstanceColor(shape, 1, c)
-                        color_tool.SetInstanceColor(shape, 2, c)
-
-                        n = c.Name(c.Red(), c.Green(), c.Blue())
-                        print(
-                            "    shape color Name & RGB: ",
-                            c,
-                            n,
-                            c.Red(),
-                            c.Green(),
-                            c.Blue(),
-                        )
-                shape_to_disp = BRepBuilderAPI_Transform(
-                    shape_sub, loc.Transformation()
-                ).Shape()
-                # position the subshape to display
-                if shape_to_disp not in output_shapes:
-                    output_shapes[shape_to_disp] = [lab_subs.GetLabelName(), c]
-
-    def _get_shapes():
-        labels = TDF_LabelSequence()
-        shape_tool.GetFreeShapes(labels)
-        # global cnt
-        # cnt += 1
-
-        print()
-        print("Number of shapes at root :", labels.Length())
-        print()
-        for i in range(labels.Length()):
-            root_item = labels.Value(i + 1)
-            _get_sub_shapes(root_item, None)
-
-    _get_shapes()
+def _read_step_file_with_names_colors(filename, verbosity, progress=None):
+    default_color = (0.5, 0.5, 0.5)
+    output_shapes = {}
+    for record in iter_step_file_shapes(filename, True, verbosity, progress):
+        shape = record.located_shape()
+        if shape in output_shapes:
+            continue
+        color = record.color
+        if color is None:
+            color = Quantity_Color(*default_color, Quantity_TOC_RGB)
+        output_shapes[shape] = [record.name, color]
     return output_shapes
 
 
@@ -437,78 +947,37 @@ def read_step_file_with_names_colors(filename):
 def write_stl_file(
     a_shape, filename, mode="ascii", linear_deflection=0.9, angular_deflection=0.5
 ):
-    """export the shape to a STL file
-    Be careful, the shape first need to be explicitly meshed using BRepMesh_IncrementalMesh
-    a_shape: the topods_shape to export
+    """export one or many shapes to a STL file
+    Be careful, the shapes first need to be explicitly meshed using BRepMesh_IncrementalMesh
+    a_shape: a topods_shape, an AIS_Shape or an iterable of them
     filename: the filename
     mode: optional, "ascii" by default. Can either be "binary"
-    linear_deflection: optional, default to 0.001. Lower, more occurate mesh
-    angular_deflection: optional, default to 0.5. Lower, more accurate_mesh
+    linear_deflection, angular_deflection: unused, kept for compatibility
     """
-    if a_shape.IsNull():
-        raise AssertionError("Shape is null.")
-    if mode not in ["ascii", "binary"]:
-        raise AssertionError("mode should be either ascii or binary")
-    if os.path.isfile(filename):
-        print(f"Warning: {filename} already exists and will be replaced")
-
-    # potato-pythonocc: It's no need
-    # first mesh the shape
-    # mesh = BRepMesh_IncrementalMesh(
-    #     a_shape, linear_deflection, False, angular_deflection, True
-    # )
-    # # mesh.SetDeflection(0.05)
-    # mesh.Perform()
-    # if not mesh.IsDone():
-    #     raise AssertionError("Mesh is not done.")
-
-    stl_exporter = StlAPI_Writer()
-    if mode == "ascii":
-        stl_exporter.SetASCIIMode(True)
-    else:  # binary, just set the ASCII flag to False
-        stl_exporter.SetASCIIMode(False)
-    stl_exporter.Write(a_shape, filename)
+    with StlExporter(filename, mode) as exporter:
+        exporter.add(a_shape)
 
-    if not os.path.isfile(filename):
-        raise IOError("File not written to disk.")
-    
-def _write_stl_file(shapes, filename, mode="ascii", linear_deflection=0.9, angular_deflection=0.5):
-    '''
-        export the shape to a STL file
-        Write by potato-pythonocc
-        shapes: topods_shape or list to export
-        filename: the filename
-        mode: optional, "ascii" by default. Can either be "binary"
-        linear_deflection: optional, default to 0.001. Lower, more occurate mesh
-        angular_deflection: optional, default to 0.5. Lower, more accurate_mesh
-    '''
-    if mode not in ["ascii", "binary"]:
-        raise AssertionError("mode should be either ascii or binary")
-    if os.path.isfile(filename):
-        print(f"Warning: {filename} already exists and will be replaced")
-
-    stl_exporter = StlAPI_Writer()
-    if mode == "ascii":
-        stl_exporter.SetASCIIMode(True)
-    else:  # binary, just set the ASCII flag to False
-        stl_exporter.SetASCIIMode(False)
-
-    if isinstance(shapes, list):
-        shapes = _create_Compound(shapes)
-        shapes = TopoDS_Shape(shapes)
-        
-    print(shapes)
-
-    print(stl_exporter.Write(shapes, filename)) # TODO: It returns false
-    if not os.path.isfile(filename):
-        raise IOError("File not written to disk.")
 
+_write_stl_file = write_stl_file
 
-def read_stl_file(filename):
-    """opens a stl file, reads the content, and returns a BRep topods_shape object"""
+
+def read_stl_file(filename, as_mesh_face=False):
+    """opens a stl file, reads the content, and returns a BRep topods_shape object
+    as_mesh_face: optional, False by default. If True, returns a single face
+    without surface holding the mesh as a Poly_Triangulation, instead of one
+    face per triangle. See also OCCT.Extend.MeshUtils.read_mesh_file.
+    """
     if not os.path.isfile(filename):
         raise FileNotFoundError(f"{filename} not found.")
 
+    if as_mesh_face:
+        triangulation = RWStl.ReadFile_(filename, Message_ProgressRange())
+        if triangulation is None:
+            raise AssertionError("Shape is null.")
+        face = TopoDS_Face()
+        BRep_Builder().MakeFace(face, triangulation)
+        return face
+
     the_shape = TopoDS_Shape()
     StlAPI.Read_(the_shape, filename)
 
@@ -522,18 +991,49 @@ def read_stl_file(filename):
 # IGES import/export #
 ######################
 def read_iges_file(
-    filename, return_as_shapes=False, verbosity=False, visible_only=False
+    filename,
+    return_as_shapes=False,
+    verbosity=False,
+    visible_only=False,
+    cache=None,
+    progress=None,
 ):
     """read the IGES file and returns a compound
     filename: the file path
     return_as_shapes: optional, False by default. If True returns a list of shapes,
                       else returns a single compound
     verbosity: optionl, False by default.
+    cache: optional, a ShapeCache, see read_step_file.
+    progress: optional, a Progress, see read_step_file.
     """
     if not os.path.isfile(filename):
         raise FileNotFoundError(f"{filename} not found.")
+    if cache is None:
+        _shapes = _read_iges_shapes(filename, verbosity, visible_only, progress)
+    else:
+        key = cache.make_key(filename, "IGESControl_Reader", visible_only=visible_only)
+        cached = cache.get(key)
+        if cached is None:
+            _shapes = _read_iges_shapes(filename, verbosity, visible_only, progress)
+            cache.put(key, _create_Compound(_shapes), {"nb_shapes": len(_shapes)})
+        else:
+            _shapes = _compound_children(cached[0])
+
+    # create a compound and store all shapes
+    if not return_as_shapes:
+        builder_2 = BRep_Builder()
+        compound_2 = TopoDS_Compound()
+        builder_2.MakeCompound(compound_2)
+        for s in _shapes:
+            builder_2.Add(compound_2, s)
+        _shapes = compound_2
+
+    return _shapes
+
 
-    IGESControl_Controller.Init()
+def _read_iges_shapes(filename, verbosity, visible_only, progress=None):
+    """the list of the shapes transferred from the IGES file"""
+    IGESControl_Controller.Init_()
 
     iges_reader = IGESControl_Reader()
     iges_reader.SetReadVisible(visible_only)
@@ -554,7 +1054,8 @@ def read_iges_file(
         iges_reader.PrintCheckLoad(failsonly, IFSelect_ItemsByEntity)
         iges_reader.PrintCheckTransfer(failsonly, IFSelect_ItemsByEntity)
     iges_reader.ClearShapes()
-    iges_reader.TransferRoots()
+    iges_reader.TransferRoots(progress_range(progress))
+    check_progress(progress, f"Reading {filename}")
     nbr = iges_reader.NbShapes()
 
     for i in range(1, nbr + 1):
@@ -569,64 +1070,16 @@ def read_iges_file(
     if not empty_compound:
         _shapes.append(compound)
 
-    # create a compound and store all shapes
-    if not return_as_shapes:
-        builder_2 = BRep_Builder()
-        compound_2 = TopoDS_Compound()
-        builder_2.MakeCompound(compound_2)
-        for s in _shapes:
-            builder_2.Add(compound_2, s)
-        _shapes = compound_2
-
     return _shapes
 
 
-def _write_iges_file(a_shape, filename):
-    """exports a shape to a STEP file
-    a_shape: the topods_shape to export (a compound, a solid etc.)
-    filename: the filename
-    application protocol: "AP203" or "AP214"
-    """
-    # a few checks
-    if a_shape.IsNull():
-        raise AssertionError("Shape is null.")
-    if os.path.isfile(filename):
-        print(f"Warning: {filename} already exists and will be replaced")
-    # creates and initialise the step exporter
-    iges_writer = IGESControl_Writer()
-    iges_writer.AddShape(a_shape)
-    status = iges_writer.Write(filename)
-
-    if status != IFSelect_RetDone:
-        raise AssertionError("Not done.")
-    if not os.path.isfile(filename):
-        raise IOError("File not written to disk.")
-    
 def write_iges_file(shapes, filename):
-    """exports a shape to a STEP file
-    Write by potato-pythonocc
-    a_shape: the topods_shape to export (a compound, a solid etc.)
+    """exports one or many shapes to an IGES file
+    shapes: a topods_shape, an AIS_Shape or an iterable of them
     filename: the filename
-    application protocol: "AP203" or "AP214"
     """
-    if isinstance(shapes, list):
-        if os.path.isfile(filename):
-            print(f"Warning: {filename} already exists and will be replaced")
-        iges_writer = IGESControl_Writer()
-        for a_shape in shapes:
-            if isinstance(i, AIS_Shape):
-                i = i.Shape()
-            if a_shape.IsNull():
-                raise AssertionError("Shape is null.")
-            iges_writer.AddShape(a_shape)
-        status = iges_writer.Write(filename)
-    
-    if status != IFSelect_RetDone:
-        raise AssertionError("Not done.")
-    if not os.path.isfile(filename):
-        raise IOError("File not written to disk.")
-
-    
+    with IgesExporter(filename) as exporter:
+        exporter.add(shapes)
 
 
 ##############
@@ -754,31 +1207,100 @@ def export_shape_to_svg(
 ###############
 # BREP export #
 ###############
-def write_brep_file(shapes, filename):
-    if os.path.isfile(filename):
-        print(f"Warning: {filename} already exists and will be replaced")
-    if isinstance(shapes, list):
-        shapes = _create_Compound(shapes)
+def shape_to_bytes(shape, with_triangles=False):
+    """the binary BRep (BinTools) bytes of shape, to send it to another
+    process or store it without a temporary file. The subshapes shared in
+    shape stay shared when read back with shape_from_bytes.
+    with_triangles: optional, False by default. Also write the
+    triangulations and normals of the faces.
+    Shapes and Geom/Geom2d curves and surfaces can also be pickled, see
+    BinTools.SetPickleTriangles_ to pickle the triangulations as well.
+    """
+    return BinTools.ToBytes_(shape, with_triangles, with_triangles)
 
-    status = BRepTools.Write_(shapes, filename)
-    if not status:
-        raise AssertionError("Not done.")
+
+def shape_from_bytes(data):
+    """the shape of binary BRep data returned by shape_to_bytes or read from
+    a binary BRep file. data can be bytes or any contiguous buffer
+    (bytearray, memoryview, mmap...), which is read without a copy."""
+    return BinTools.FromBytes_(data)
+
+
+def _is_binary_brep_file(filename):
+    """True if filename holds the binary format of BinTools"""
+    with open(filename, "rb") as f:
+        return f.read(len(_BINARY_BREP_HEADER)) == _BINARY_BREP_HEADER
+
+
+def read_brep_file(filename, binary=None, with_triangles=True, use_mmap=True):
+    """returns the shape of a text or binary BRep file.
+    filename: the file path
+    binary: optional, guessed from the file header by default.
+    with_triangles: optional, True by default. If False, the triangulations
+    read with the faces are removed.
+    use_mmap: optional, True by default. Read binary files through a memory
+    map instead of a file stream.
+    The binary format is read several times faster than the text one, use
+    write_brep_file(shape, filename, binary=True) for large intermediate
+    results.
+    """
     if not os.path.isfile(filename):
-        raise IOError("File not written to disk.")
-    
+        raise FileNotFoundError(f"{filename} not found.")
+    if binary is None:
+        binary = _is_binary_brep_file(filename)
+
+    if binary and use_mmap and os.path.getsize(filename) > 0:
+        with open(filename, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                shape = shape_from_bytes(data)
+    else:
+        shape = TopoDS_Shape()
+        if binary:
+            done = BinTools.Read_(shape, filename, Message_ProgressRange())
+        else:
+            done = BRepTools.Read_(shape, filename, BRep_Builder(), Message_ProgressRange())
+        if not done:
+            raise IOError(f"Error while reading BRep file {filename}.")
+    if shape.IsNull():
+        raise AssertionError(f"Shape is null after reading {filename}.")
+    if not with_triangles:
+        BRepTools.Clean_(shape, True)
+    return shape
+
+
+def write_brep_file(shapes, filename, binary=None, with_triangles=True):
+    """exports one or many shapes to a BRep file, in a compound if more than
+    one
+    shapes: a topods_shape, an AIS_Shape or an iterable of them
+    filename: the filename
+    binary: optional, write the binary format of BinTools. By default, True
+    for a .bin file, False otherwise.
+    with_triangles: optional, True by default. If False, the triangulations
+    are not written.
+    """
+    if binary is None:
+        binary = os.path.splitext(filename)[1].lower() == ".bin"
+    with BrepExporter(filename, binary, with_triangles) as exporter:
+        exporter.add(shapes)
+
+
 #################################################
 # ply export (write not avaiable from upstream) #
 #################################################
-def write_ply_file(a_shape, ply_filename):
-    """ocaf based ply exporter"""
+def write_ply_file(a_shape, ply_filename, mesh_policy=None, progress=None):
+    """ocaf based ply exporter
+    mesh_policy: optional, the OCCT.Extend.Meshing.MeshingPolicy of the
+    shape, size relative deflection by default
+    progress: optional, an OCCT.Extend.Progress.Progress reporting the
+    meshing and the writing. OperationCancelled is raised if it is
+    cancelled.
+    """
     # create a document
     doc = TDocStd_Document("pythonocc-doc-ply-export")
     shape_tool = XCAFDoc_DocumentTool.ShapeTool_(doc.Main())
 
-    # mesh shape
-    BRepTools.Clean(a_shape)
-    msh_algo = BRepMesh_IncrementalMesh(a_shape, True)
-    msh_algo.Perform()
+    # mesh shape, keeping a triangulation that is already fine enough
+    mesh_shape(a_shape, mesh_policy, progress=progress)
 
     shape_tool.AddShape(a_shape)
 
@@ -796,22 +1318,23 @@ def write_ply_file(a_shape, ply_filename):
     rwply_writer.SetPartId(True)
     rwply_writer.SetFaceId(True)
 
-    rwply_writer.Perform(doc, a_file_info, Message_ProgressRange())
+    rwply_writer.Perform(doc, a_file_info, progress_range(progress))
+    check_progress(progress, f"Writing {ply_filename}")
 
 
 #################################################
 # Obj export (write not avaiable from upstream) #
 #################################################
-def write_obj_file(a_shape, obj_filename):
-    """ocaf based ply exporter"""
+def write_obj_file(a_shape, obj_filename, mesh_policy=None, progress=None):
+    """ocaf based obj exporter
+    mesh_policy, progress: optional, see write_ply_file
+    """
     # create a document
     doc = TDocStd_Document("pythonocc-doc-obj-export")
     shape_tool = XCAFDoc_DocumentTool.ShapeTool_(doc.Main())
 
-    # mesh shape
-    BRepTools.Clean(a_shape)
-    msh_algo = BRepMesh_IncrementalMesh(a_shape, True)
-    msh_algo.Perform()
+    # mesh shape, keeping a triangulation that is already fine enough
+    mesh_shape(a_shape, mesh_policy, progress=progress)
 
     shape_tool.AddShape(a_shape)
 
@@ -834,7 +1357,8 @@ def write_obj_file(a_shape, obj_filename):
 
     rwobj_writer.SetCoordinateSystemConverter(csc)
 
-    rwobj_writer.Perform(doc, a_file_info, Message_ProgressRange())
+    rwobj_writer.Perform(doc, a_file_info, progress_range(progress))
+    check_progress(progress, f"Writing {obj_filename}")
 
 
 ########
@@ -842,13 +1366,19 @@ def write_obj_file(a_shape, obj_filename):
 ########
 def read_gltf_file(
     filename,
-    is_parallel=False,
+    is_parallel=None,
     is_double_precision=False,
     skip_late_data_loading=True,
     keep_late_data=True,
     verbose=False,
     load_all_scenes=False,
+    progress=None,
 ):
+    """returns the list of the free shapes of the glTF file
+    is_parallel: optional, the readers parallel mode of OCCT.Extend.Parallel
+    by default.
+    progress: optional, a Progress, see read_step_file.
+    """
     shapes_to_return = []
 
     if not os.path.isfile(filename):
@@ -862,37 +1392,38 @@ def read_gltf_file(
     # gltf_reader.SetSystemLengthUnit (aScaleFactorM);
     gltf_reader.SetSystemCoordinateSystem(RWMesh_CoordinateSystem_posYfwd_posZup)
     gltf_reader.SetDocument(doc)
-    gltf_reader.SetParallel(is_parallel)
+    gltf_reader.SetParallel(is_parallel_mode("readers") if is_parallel is None else is_parallel)
     gltf_reader.SetDoublePrecision(is_double_precision)
     gltf_reader.SetToSkipLateDataLoading(skip_late_data_loading)
     gltf_reader.SetToKeepLateData(keep_late_data)
     gltf_reader.SetToPrintDebugMessages(verbose)
     gltf_reader.SetLoadAllScenes(load_all_scenes)
 
-    status = gltf_reader.Perform(filename, Message_ProgressRange())
+    status = gltf_reader.Perform(filename, progress_range(progress))
+    check_progress(progress, f"Reading {filename}")
 
-    if status != IFSelect_RetDone:
-        raise IOError("Error while writing shape to STEP file.")
+    if not status:
+        raise IOError("Error while reading glTF file.")
 
     labels = TDF_LabelSequence()
     shape_tool.GetFreeShapes(labels)
 
-    for i in range(1, labels.Length()):
+    for i in range(1, labels.Length() + 1):
         shapes_to_return.append(shape_tool.GetShape(labels.Value(i)))
 
     return shapes_to_return
 
 
-def write_gltf_file(a_shape, gltf_filename):
-    """ocaf based ply exporter"""
+def write_gltf_file(a_shape, gltf_filename, mesh_policy=None, progress=None):
+    """ocaf based gltf exporter
+    mesh_policy, progress: optional, see write_ply_file
+    """
     # create a document
     doc = TDocStd_Document("pythonocc-doc-gltf-export")
     shape_tool = XCAFDoc_DocumentTool.ShapeTool(doc.Main())
 
-    # mesh shape
-    BRepTools.Clean(a_shape)
-    msh_algo = BRepMesh_IncrementalMesh(a_shape, True)
-    msh_algo.Perform()
+    # mesh shape, keeping a triangulation that is already fine enough
+    mesh_shape(a_shape, mesh_policy, progress=progress)
 
     shape_tool.AddShape(a_shape)
 
@@ -904,7 +1435,8 @@ def write_gltf_file(a_shape, gltf_filename):
 
     rwgltf_writer = RWGltf_CafWriter(gltf_filename, True)
 
-    status = rwgltf_writer.Perform(doc, a_file_info, Message_ProgressRange())
+    status = rwgltf_writer.Perform(doc, a_file_info, progress_range(progress))
+    check_progress(progress, f"Writing {gltf_filename}")
 
-    if status != IFSelect_RetDone:
-        raise IOError("Error while writing shape to STEP file.")
+    if not status:
+        raise IOError("Error while writing shape to glTF file.")
@@ -58,13 +58,31 @@ class Layer:
         -------
         None
         """
-        to_display = self.display.DisplayShape(
-            shape, color=self.color, material=self.material
-        )[0]
-        self.display.Context.SetTransparency(to_display, self.transparency, True)
-        self.element_to_display[self.count] = (shape, to_display)
-        self.count += 1
-        self.display.Context.Erase(to_display, False)
+        self.add_shapes([shape])
+
+    def add_shapes(self, shapes):
+        r"""
+        Add many shapes at once, meshing them in parallel. The shapes are
+        not displayed until show is called.
+
+         Parameters
+        ----------
+        shapes: list of TopoDS_Shape
+
+        Returns
+        -------
+        None
+        """
+        shapes = list(shapes)
+        ais_shapes = self.display.MakePresentations(
+            shapes,
+            color=self.color,
+            material=self.material,
+            transparency=self.transparency,
+        )
+        for shape, to_display in zip(shapes, ais_shapes):
+            self.element_to_display[self.count] = (shape, to_display)
+            self.count += 1
 
     def replace_shape(self, shape, index):
         r"""
@@ -79,12 +97,15 @@ class Layer:
         """
         self.display.Context.Erase(self.element_to_display[index][1], False)
         self.element_to_display.pop(index)
-        to_display = self.display.DisplayShape(
-            shape, color=self.color, material=self.material
+        to_display = self.display.DisplayShapes(
+            [shape],
+            color=self.color,
+            material=self.material,
+            transparency=self.transparency,
+            update=False,
         )[0]
-        self.display.Context.SetTransparency(to_display, self.transparency, True)
+        self.display.Context.UpdateCurrentViewer()
         self.element_to_display[index] = (shape, to_display)
-        # self.display.Context.Erase(to_display, False)
 
     def update_trsf_shape(self, shape, index, transformations):
         r"""
@@ -112,8 +133,7 @@ class Layer:
         -------
         None
         """
-        for shape in layer.get_shapes():
-            self.add_shape(shape)
+        self.add_shapes(layer.get_shapes())
         if clear is True:
             layer.clear()
 
@@ -185,7 +205,7 @@ class Layer:
         for index, element in self.element_to_display.items():
             shape, ais_shape = element
             self.display.Context.Erase(ais_shape, False)
-            self.display.View.Redraw()
+        self.display.Context.UpdateCurrentViewer()
 
     def show(self):
         r"""
@@ -193,4 +213,5 @@ class Layer:
         """
         for index, element in self.element_to_display.items():
             shape, ais = element
-            self.display.Context.Display(ais, True)
+            self.display.Context.Display(ais, False)
+        self.display.Context.UpdateCurrentViewer()
@@ -0,0 +1,542 @@
+# This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+# geometry kernel.
+#
+# Copyright (C) 2016-2018 Laughlin Research, LLC
+# Copyright (C) 2019-2020 Trevor Laughlin and pyOCCT contributors
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+import os
+from typing import NamedTuple, Optional
+
+try:
+    import numpy as np
+
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+from OCCT.BRep import BRep_Builder, BRep_Tool
+from OCCT.Message import Message_ProgressRange
+from OCCT.Poly import Poly_Triangulation
+from OCCT.RWObj import RWObj
+from OCCT.RWStl import RWStl
+from OCCT.TopoDS import TopoDS_Face
+
+from OCCT.Extend.Meshing import MeshingPolicy, mesh_shape
+from OCCT.Extend.TopologyUtils import check_numpy_installed
+
+
+class ShapeMesh(NamedTuple):
+    """Triangulation of a whole shape as contiguous NumPy arrays.
+
+    Face ``i`` owns the nodes ``node_offsets[i]:node_offsets[i + 1]`` and the
+    triangles ``triangle_offsets[i]:triangle_offsets[i + 1]``. Faces are
+    numbered in the order of ``TopExp.MapShapes_(shape, TopAbs_FACE, map)``
+    (index ``i`` is map index ``i + 1``).
+    """
+
+    vertices: "np.ndarray"
+    normals: Optional["np.ndarray"]
+    triangles: "np.ndarray"
+    node_offsets: "np.ndarray"
+    triangle_offsets: "np.ndarray"
+
+    @property
+    def nb_faces(self):
+        return len(self.node_offsets) - 1
+
+    @property
+    def face_ids(self):
+        """The face index of each triangle."""
+        return np.repeat(
+            np.arange(self.nb_faces, dtype=np.int32), np.diff(self.triangle_offsets)
+        )
+
+    def face(self, index):
+        """Return the (vertices, normals, triangles) of a single face, with
+        triangle indices local to that face."""
+        n0, n1 = self.node_offsets[index], self.node_offsets[index + 1]
+        t0, t1 = self.triangle_offsets[index], self.triangle_offsets[index + 1]
+        normals = None if self.normals is None else self.normals[n0:n1]
+        return self.vertices[n0:n1], normals, self.triangles[t0:t1] - n0
+
+
+def get_shape_mesh_arrays(
+    shape, linear_deflection=None, angular_deflection=0.5, double_precision=False, compute_normals=True
+):
+    """Return the triangulation of all the faces of `shape` as a ShapeMesh.
+
+    Parameters
+    ----------
+    shape : TopoDS_Shape
+        the shape to extract the triangulation from
+    linear_deflection : float, optional
+        if given, the shape is meshed first with this deflection, unless its
+        triangulation is already fine enough. Otherwise the existing
+        triangulation is used and faces without one are left empty
+    angular_deflection : float
+        angular deflection used when meshing
+    double_precision : bool
+        return float64 vertices and normals instead of float32
+    compute_normals : bool
+        also return the per vertex normals. Normals stored on the
+        triangulation are used when present, otherwise they are averaged from
+        the triangles
+
+    Vertex positions have the face locations applied and the triangles of
+    reversed faces are flipped, so that all the triangles are oriented
+    outwards for a valid solid.
+    """
+    check_numpy_installed()
+    if linear_deflection is not None:
+        policy = MeshingPolicy(linear_deflection, angular_deflection=angular_deflection)
+        if not mesh_shape(shape, policy).done:
+            raise AssertionError("Mesh not done.")
+    return ShapeMesh(*BRep_Tool.MeshArrays_(shape, double_precision, compute_normals))
+
+
+def _as_shape_mesh(shape_or_mesh, linear_deflection=None, angular_deflection=0.5):
+    if isinstance(shape_or_mesh, ShapeMesh):
+        return shape_or_mesh
+    return get_shape_mesh_arrays(
+        shape_or_mesh, linear_deflection, angular_deflection, compute_normals=False
+    )
+
+
+if HAVE_NUMPY:
+    # Binary STL facet: normal, 3 vertices and the attribute byte count
+    _STL_FACET = np.dtype(
+        [("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attr", "<u2")]
+    )
+
+    # Binary PLY triangle: vertex count and indices, packed
+    _PLY_TRIANGLE = np.dtype([("count", "u1"), ("indices", "<i4", (3,))])
+    _PLY_TRIANGLE_ID = np.dtype(
+        [("count", "u1"), ("indices", "<i4", (3,)), ("face_id", "<i4")]
+    )
+
+
+def write_stl_mesh(
+    shape_or_mesh, filename, linear_deflection=None, angular_deflection=0.5, chunk_size=1 << 20
+):
+    """Write a binary STL file from the triangulation of a shape.
+
+    Parameters
+    ----------
+    shape_or_mesh : TopoDS_Shape or ShapeMesh
+        the shape, whose existing triangulation is used, or its mesh arrays
+    filename : str
+        the file path
+    linear_deflection : float, optional
+        if given, the shape is meshed first, see get_shape_mesh_arrays
+    angular_deflection : float
+        angular deflection used when meshing
+    chunk_size : int
+        number of triangles processed at once, which bounds the temporary
+        memory
+
+    The facets are computed with NumPy and stored straight into a memory
+    mapped file, without going through StlAPI_Writer.
+    """
+    check_numpy_installed()
+    mesh = _as_shape_mesh(shape_or_mesh, linear_deflection, angular_deflection)
+    nb_triangles = len(mesh.triangles)
+    data = np.memmap(
+        filename, dtype=np.uint8, mode="w+", shape=(84 + _STL_FACET.itemsize * nb_triangles,)
+    )
+    try:
+        header = b"binary STL written by pyOCCT"
+        data[:80] = 0
+        data[: len(header)] = np.frombuffer(header, np.uint8)
+        data[80:84] = np.frombuffer(np.array(nb_triangles, "<u4").tobytes(), np.uint8)
+        facets = data[84:].view(_STL_FACET)
+        facets["attr"] = 0
+        vertices = mesh.vertices
+        for start in range(0, nb_triangles, chunk_size):
+            stop = min(start + chunk_size, nb_triangles)
+            points = vertices[mesh.triangles[start:stop]]
+            normals = np.cross(points[:, 1] - points[:, 0], points[:, 2] - points[:, 0])
+            lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+            np.divide(normals, lengths, out=normals, where=lengths > 0)
+            facets["normal"][start:stop] = normals
+            facets["vertices"][start:stop] = points
+        data.flush()
+    finally:
+        del data
+
+
+def write_ply_mesh(
+    shape_or_mesh,
+    filename,
+    linear_deflection=None,
+    angular_deflection=0.5,
+    with_normals=True,
+    with_face_ids=False,
+):
+    """Write a binary little endian PLY file from the triangulation of a
+    shape.
+
+    Parameters
+    ----------
+    shape_or_mesh : TopoDS_Shape or ShapeMesh
+        the shape, whose existing triangulation is used, or its mesh arrays
+    filename : str
+        the file path
+    linear_deflection : float, optional
+        if given, the shape is meshed first, see get_shape_mesh_arrays
+    angular_deflection : float
+        angular deflection used when meshing
+    with_normals : bool
+        also write the vertex normals
+    with_face_ids : bool
+        also write the index of the BRep face of each triangle, as the
+        face_id property of the faces
+
+    Vertices are written as float, or double for a double precision
+    ShapeMesh. The payload is built with NumPy and written with one call
+    per element.
+    """
+    check_numpy_installed()
+    if isinstance(shape_or_mesh, ShapeMesh):
+        mesh = shape_or_mesh
+    else:
+        mesh = get_shape_mesh_arrays(
+            shape_or_mesh,
+            linear_deflection,
+            angular_deflection,
+            compute_normals=with_normals,
+        )
+    with_normals = with_normals and mesh.normals is not None
+    scalar = "double" if mesh.vertices.dtype == np.float64 else "float"
+    real = "<f8" if scalar == "double" else "<f4"
+
+    nb_vertices, nb_triangles = len(mesh.vertices), len(mesh.triangles)
+    header = [
+        "ply",
+        "format binary_little_endian 1.0",
+        "comment written by pyOCCT",
+        f"element vertex {nb_vertices}",
+        f"property {scalar} x",
+        f"property {scalar} y",
+        f"property {scalar} z",
+    ]
+    if with_normals:
+        header += [f"property {scalar} nx", f"property {scalar} ny", f"property {scalar} nz"]
+    header += [f"element face {nb_triangles}", "property list uchar int vertex_indices"]
+    if with_face_ids:
+        header.append("property int face_id")
+    header.append("end_header")
+
+    vertices = mesh.vertices.astype(real, copy=False)
+    if with_normals:
+        vertices = np.hstack([vertices, mesh.normals.astype(real, copy=False)])
+
+    triangles = np.empty(nb_triangles, _PLY_TRIANGLE_ID if with_face_ids else _PLY_TRIANGLE)
+    triangles["count"] = 3
+    triangles["indices"] = mesh.triangles
+    if with_face_ids:
+        triangles["face_id"] = mesh.face_ids
+
+    with open(filename, "wb") as f:
+        f.write(("\n".join(header) + "\n").encode("ascii"))
+        np.ascontiguousarray(vertices).tofile(f)
+        triangles.tofile(f)
+    if not os.path.isfile(filename):
+        raise IOError(f"{filename} not saved to filesystem.")
+
+
+###############
+# Mesh import #
+###############
+class TriangleMesh(NamedTuple):
+    """A triangle mesh as NumPy arrays: (N, 3) vertices, (M, 3) 0 based
+    triangles and optional (N, 3) vertex normals."""
+
+    vertices: "np.ndarray"
+    triangles: "np.ndarray"
+    normals: Optional["np.ndarray"] = None
+
+    def to_triangulation(self):
+        """Return the mesh as a single Poly_Triangulation."""
+        return Poly_Triangulation.FromArrays_(self.vertices, self.triangles, self.normals)
+
+    def to_face(self):
+        """Return a TopoDS_Face without surface holding the mesh as its
+        triangulation, see triangulation_to_face."""
+        return triangulation_to_face(self.to_triangulation())
+
+
+def triangulation_to_face(triangulation):
+    """Return a TopoDS_Face without surface holding the triangulation. The
+    face can be displayed, exported to mesh formats or placed in a compound
+    with other shapes, without creating one face per triangle."""
+    face = TopoDS_Face()
+    BRep_Builder().MakeFace(face, triangulation)
+    return face
+
+
+def _triangulation_to_mesh(triangulation):
+    if triangulation is None:
+        raise IOError("Cannot read the mesh file.")
+    vertices, triangles, normals = triangulation.Arrays()
+    return TriangleMesh(vertices, triangles, normals)
+
+
+def _merge_vertices(points):
+    """Merge the identical rows of points, return (vertices, triangles)"""
+    vertices, inverse = np.unique(points, axis=0, return_inverse=True)
+    return vertices, inverse.reshape(-1, 3).astype(np.int32)
+
+
+def _read_binary_stl(filename, merge_vertices):
+    """Read a binary STL file, None if the file is not a binary STL"""
+    size = os.path.getsize(filename)
+    if size < 84:
+        return None
+    with open(filename, "rb") as f:
+        f.seek(80)
+        nb_triangles = int(np.frombuffer(f.read(4), "<u4")[0])
+    if size != 84 + _STL_FACET.itemsize * nb_triangles:
+        return None
+    if nb_triangles == 0:
+        return TriangleMesh(np.empty((0, 3), np.float32), np.empty((0, 3), np.int32))
+    facets = np.memmap(filename, dtype=_STL_FACET, mode="r", offset=84, shape=(nb_triangles,))
+    points = facets["vertices"].reshape(-1, 3)
+    if merge_vertices:
+        return TriangleMesh(*_merge_vertices(points))
+    triangles = np.arange(3 * nb_triangles, dtype=np.int32).reshape(-1, 3)
+    return TriangleMesh(np.array(points), triangles)
+
+
+def read_stl_mesh(filename, merge_vertices=True):
+    """Read a binary or ASCII STL file into a TriangleMesh.
+
+    Binary files are memory mapped and read with NumPy. If merge_vertices is
+    True the identical vertices of adjacent triangles are merged, otherwise
+    each triangle has its own three vertices. ASCII files are read with
+    RWStl, which always merges the vertices.
+    """
+    check_numpy_installed()
+    if not os.path.isfile(filename):
+        raise FileNotFoundError(f"{filename} not found.")
+    mesh = _read_binary_stl(filename, merge_vertices)
+    if mesh is None:
+        mesh = _triangulation_to_mesh(RWStl.ReadFile_(filename, Message_ProgressRange()))
+    return mesh
+
+
+def read_obj_mesh(filename):
+    """Read the geometry of an OBJ file into a TriangleMesh with RWObj.
+    Polygons are triangulated."""
+    check_numpy_installed()
+    if not os.path.isfile(filename):
+        raise FileNotFoundError(f"{filename} not found.")
+    return _triangulation_to_mesh(RWObj.ReadFile_(filename, Message_ProgressRange()))
+
+
+_PLY_TYPES = {
+    "char": "i1",
+    "int8": "i1",
+    "uchar": "u1",
+    "uint8": "u1",
+    "short": "i2",
+    "int16": "i2",
+    "ushort": "u2",
+    "uint16": "u2",
+    "int": "i4",
+    "int32": "i4",
+    "uint": "u4",
+    "uint32": "u4",
+    "float": "f4",
+    "float32": "f4",
+    "double": "f8",
+    "float64": "f8",
+}
+
+
+def _read_ply_header(f):
+    """Parse the header of a PLY file, return (format, elements) where each
+    element is (name, count, properties) and each property (name, list count
+    type or None, type)"""
+    if f.readline().strip() != b"ply":
+        raise IOError("Not a PLY file.")
+    fmt, elements = None, []
+    while True:
+        line = f.readline()
+        if not line:
+            raise IOError("Invalid PLY header.")
+        words = line.decode("ascii", "replace").split()
+        if not words:
+            continue
+        if words[0] == "format":
+            fmt = words[1]
+        elif words[0] == "element":
+            elements.append((words[1], int(words[2]), []))
+        elif words[0] == "property":
+            if words[1] == "list":
+                elements[-1][2].append((words[4], _PLY_TYPES[words[2]], _PLY_TYPES[words[3]]))
+            else:
+                elements[-1][2].append((words[2], None, _PLY_TYPES[words[1]]))
+        elif words[0] == "end_header":
+            break
+    if fmt not in ("ascii", "binary_little_endian", "binary_big_endian"):
+        raise IOError(f"Unsupported PLY format {fmt}.")
+    return fmt, elements
+
+
+def _fan_triangles(polygons):
+    """Triangulate a list of polygons (lists of vertex indices) as fans"""
+    triangles = [
+        (polygon[0], polygon[k], polygon[k + 1])
+        for polygon in polygons
+        for k in range(1, len(polygon) - 1)
+    ]
+    return np.array(triangles, dtype=np.int32).reshape(-1, 3)
+
+
+def _ply_element_dtype(properties, endian, list_size):
+    fields = []
+    for name, count_type, item_type in properties:
+        if count_type is None:
+            fields.append((name, endian + item_type))
+        else:
+            fields.append((name + "_count", endian + count_type))
+            fields.append((name, endian + item_type, (list_size,)))
+    return np.dtype(fields)
+
+
+def _read_ply_binary(data, pos, count, properties, endian):
+    """Read one element of a binary PLY file, return (records, polygons, pos)
+    where polygons is the list of the vertex index lists when the faces are
+    not all triangles"""
+    has_list = any(count_type is not None for _, count_type, _ in properties)
+    dtype = _ply_element_dtype(properties, endian, 3)
+    end = pos + count * dtype.itemsize
+    if end <= len(data):
+        records = data[pos:end].view(dtype)
+        if not has_list or all(
+            np.all(records[name + "_count"] == 3)
+            for name, count_type, _ in properties
+            if count_type is not None
+        ):
+            return records, None, end
+
+    # variable size lists, element by element
+    polygons = []
+    for _ in range(count):
+        for name, count_type, item_type in properties:
+            if count_type is None:
+                pos += np.dtype(item_type).itemsize
+                continue
+            count_dtype = np.dtype(endian + count_type)
+            size = int(data[pos:pos + count_dtype.itemsize].view(count_dtype)[0])
+            pos += count_dtype.itemsize
+            item_dtype = np.dtype(endian + item_type)
+            items = data[pos:pos + size * item_dtype.itemsize].view(item_dtype)
+            pos += size * item_dtype.itemsize
+            if name in ("vertex_indices", "vertex_index"):
+                polygons.append(items.tolist())
+    return None, polygons, pos
+
+
+def _read_ply_ascii(tokens, pos, count, properties):
+    """Read one element of an ASCII PLY file, same as _read_ply_binary"""
+    has_list = any(count_type is not None for _, count_type, _ in properties)
+    if not has_list:
+        width = len(properties)
+        values = np.array(tokens[pos:pos + count * width], dtype=np.float64).reshape(count, width)
+        records = {name: values[:, i] for i, (name, _, _) in enumerate(properties)}
+        return records, None, pos + count * width
+    polygons = []
+    for _ in range(count):
+        for name, count_type, _ in properties:
+            if count_type is None:
+                pos += 1
+                continue
+            size = int(tokens[pos])
+            items = [int(token) for token in tokens[pos + 1:pos + 1 + size]]
+            pos += 1 + size
+            if name in ("vertex_indices", "vertex_index"):
+                polygons.append(items)
+    return None, polygons, pos
+
+
+def read_ply_mesh(filename):
+    """Read a PLY file (ASCII or binary) into a TriangleMesh.
+
+    Binary files are memory mapped and read with NumPy when all the faces are
+    triangles. Polygons are triangulated as fans. Vertex normals are read
+    from the nx, ny and nz properties when present.
+    """
+    check_numpy_installed()
+    if not os.path.isfile(filename):
+        raise FileNotFoundError(f"{filename} not found.")
+    with open(filename, "rb") as f:
+        fmt, elements = _read_ply_header(f)
+        offset = f.tell()
+
+    if fmt == "ascii":
+        with open(filename, "rb") as f:
+            f.seek(offset)
+            tokens = f.read().split()
+    else:
+        endian = "<" if fmt == "binary_little_endian" else ">"
+        if os.path.getsize(filename) > offset:
+            data = np.memmap(filename, dtype=np.uint8, mode="r", offset=offset)
+        else:
+            data = np.empty(0, np.uint8)
+
+    vertices = normals = triangles = None
+    pos = 0
+    for name, count, properties in elements:
+        if fmt == "ascii":
+            records, polygons, pos = _read_ply_ascii(tokens, pos, count, properties)
+        else:
+            records, polygons, pos = _read_ply_binary(data, pos, count, properties, endian)
+        if name == "vertex":
+            if records is None:
+                raise IOError("Truncated or unsupported PLY vertex element")
+            vertices = np.column_stack([records["x"], records["y"], records["z"]])
+            names = [property_name for property_name, _, _ in properties]
+            if all(n in names for n in ("nx", "ny", "nz")):
+                normals = np.column_stack([records["nx"], records["ny"], records["nz"]])
+        elif name == "face":
+            if polygons is None:
+                field = "vertex_indices"
+                if field not in records.dtype.names:
+                    field = "vertex_index"
+                triangles = np.asarray(records[field], dtype=np.int32)
+            else:
+                triangles = _fan_triangles(polygons)
+
+    if vertices is None:
+        raise IOError("No vertex in the PLY file.")
+    if triangles is None:
+        triangles = np.empty((0, 3), np.int32)
+    return TriangleMesh(vertices, triangles, normals)
+
+
+def read_mesh_file(filename, **kwargs):
+    """Read a STL, OBJ or PLY file into a TriangleMesh, according to its
+    extension. Use TriangleMesh.to_triangulation or TriangleMesh.to_face to
+    get a Poly_Triangulation or a TopoDS_Face. kwargs are the options of
+    read_stl_mesh, ignored for the other formats."""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".stl":
+        return read_stl_mesh(filename, **kwargs)
+    readers = {".obj": read_obj_mesh, ".ply": read_ply_mesh}
+    if extension not in readers:
+        raise IOError(f"Unsupported mesh format {extension}.")
+    return readers[extension](filename)
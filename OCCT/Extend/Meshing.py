@@ -0,0 +1,222 @@
+# This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+# geometry kernel.
+#
+# Copyright (C) 2016-2018 Laughlin Research, LLC
+# Copyright (C) 2019-2020 Trevor Laughlin and pyOCCT contributors
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+from OCCT.Bnd import Bnd_Box
+from OCCT.BRep import BRep_Tool
+from OCCT.BRepBndLib import BRepBndLib
+from OCCT.BRepMesh import BRepMesh_IncrementalMesh
+from OCCT.BRepTools import BRepTools
+from OCCT.IMeshTools import IMeshTools_Parameters
+from OCCT.TopAbs import TopAbs_EDGE, TopAbs_FACE
+from OCCT.TopExp import TopExp, TopExp_Explorer
+from OCCT.TopLoc import TopLoc_Location
+from OCCT.TopoDS import TopoDS
+from OCCT.TopTools import TopTools_IndexedMapOfShape
+
+from OCCT.Extend.Parallel import is_parallel
+from OCCT.Extend.Progress import check_progress, progress_range
+
+
+class MeshingPolicy:
+    """Meshing parameters shared by a set of shapes.
+
+    Parameters
+    ----------
+    linear_deflection : float, optional
+        absolute linear deflection. If None, the deflection of each shape is
+        relative_deflection times the diagonal of its bounding box
+    relative_deflection : float
+        deflection relative to the shape size, used when linear_deflection
+        is None
+    min_deflection : float
+        lower bound of the size relative deflection
+    angular_deflection : float
+        angular deflection in radians
+    in_parallel : bool, optional
+        mesh the faces of each shape in parallel. By default, only when the
+        shapes themselves are not meshed in parallel and the meshing
+        parallel mode of OCCT.Extend.Parallel is on
+    min_size : float, optional
+        minimum size of the triangle edges, derived from the deflection by
+        default
+    """
+
+    def __init__(
+        self,
+        linear_deflection=None,
+        relative_deflection=1.0e-3,
+        min_deflection=1.0e-4,
+        angular_deflection=0.5,
+        in_parallel=None,
+        min_size=None,
+    ):
+        self.linear_deflection = linear_deflection
+        self.relative_deflection = relative_deflection
+        self.min_deflection = min_deflection
+        self.angular_deflection = angular_deflection
+        self.in_parallel = in_parallel
+        self.min_size = min_size
+
+    def deflection(self, shape):
+        """the linear deflection used for shape"""
+        if self.linear_deflection is not None:
+            return self.linear_deflection
+        box = Bnd_Box()
+        BRepBndLib.Add_(shape, box, False)
+        if box.IsVoid():
+            return self.min_deflection
+        xmin, ymin, zmin, xmax, ymax, zmax = box.Get()
+        diagonal = math.sqrt((xmax - xmin) ** 2 + (ymax - ymin) ** 2 + (zmax - zmin) ** 2)
+        return max(self.min_deflection, self.relative_deflection * diagonal)
+
+    def parameters(self, shape, in_parallel=True):
+        """the IMeshTools_Parameters used for shape. in_parallel is used when
+        the policy doesn't set it."""
+        parameters = IMeshTools_Parameters()
+        parameters.Deflection = self.deflection(shape)
+        parameters.Angle = self.angular_deflection
+        parameters.InParallel = in_parallel if self.in_parallel is None else self.in_parallel
+        if self.min_size is not None:
+            parameters.MinSize = self.min_size
+        return parameters
+
+
+class MeshReport(NamedTuple):
+    """Result of the meshing of one shape. skipped is True when the existing
+    triangulation already met the deflection. time is the meshing time in
+    seconds."""
+
+    shape: object
+    deflection: float
+    skipped: bool
+    done: bool
+    time: float
+    nb_nodes: int
+    nb_triangles: int
+
+
+def triangulation_size(shape):
+    """the (nb_nodes, nb_triangles) of the triangulations of the faces of
+    shape, each face being counted once"""
+    faces = TopTools_IndexedMapOfShape()
+    TopExp.MapShapes_(shape, TopAbs_FACE, faces)
+    nb_nodes = nb_triangles = 0
+    for i in range(1, faces.Extent() + 1):
+        triangulation = BRep_Tool.Triangulation_(TopoDS.Face_(faces.FindKey(i)), TopLoc_Location())
+        if triangulation is not None:
+            nb_nodes += triangulation.NbNodes()
+            nb_triangles += triangulation.NbTriangles()
+    return nb_nodes, nb_triangles
+
+
+def _mesh_one(shape, policy, in_parallel, force, progress=None, report_progress=True):
+    check_progress(progress, "Meshing")
+    start = time.perf_counter()
+    parameters = policy.parameters(shape, in_parallel)
+    skipped = not force and BRepTools.Triangulation_(shape, parameters.Deflection, False)
+    done = True
+    if not skipped:
+        # the progress range is only used by one meshing at a time
+        mesh = BRepMesh_IncrementalMesh(
+            shape, parameters, progress_range(progress if report_progress else None)
+        )
+        check_progress(progress, "Meshing")
+        done = mesh.IsDone()
+    elapsed = time.perf_counter() - start
+    return MeshReport(shape, parameters.Deflection, skipped, done, elapsed, *triangulation_size(shape))
+
+
+def _share_subshapes(shapes):
+    """True if some faces or edges are shared by several shapes. BRepMesh
+    writes the triangulation of the faces and the polygons of the edges, and
+    located instances of a face or an edge share them, so they are compared
+    without their location. Sharing an edge implies sharing its vertices."""
+    unlocated = TopLoc_Location()
+    for topology_type in (TopAbs_FACE, TopAbs_EDGE):
+        subshapes = TopTools_IndexedMapOfShape()
+        nb_subshapes = 0
+        for shape in shapes:
+            explorer = TopExp_Explorer(shape, topology_type)
+            shape_subshapes = TopTools_IndexedMapOfShape()
+            while explorer.More():
+                shape_subshapes.Add(explorer.Current().Located(unlocated))
+                explorer.Next()
+            nb_subshapes += shape_subshapes.Extent()
+            for i in range(1, shape_subshapes.Extent() + 1):
+                subshapes.Add(shape_subshapes.FindKey(i))
+        if subshapes.Extent() != nb_subshapes:
+            return True
+    return False
+
+
+def mesh_shapes(shapes, policy=None, workers=None, force=False, progress=None):
+    """Mesh many shapes with a shared policy and return one MeshReport per
+    shape, in order.
+
+    Parameters
+    ----------
+    shapes : iterable of TopoDS_Shape
+        the shapes to mesh
+    policy : MeshingPolicy, optional
+        the meshing parameters, size relative deflection by default
+    workers : int, optional
+        number of threads, os.cpu_count() by default, or 1 when the meshing
+        parallel mode of OCCT.Extend.Parallel is off. BRepMesh releases the
+        GIL so the shapes are meshed concurrently
+    force : bool
+        remesh shapes whose triangulation already meets the deflection
+    progress : OCCT.Extend.Progress.Progress, optional
+        cancels the meshing, raising OperationCancelled. When the shapes are
+        meshed one after the other, it also reports the progress of each one
+
+    Shapes sharing faces or edges (located instances of the same part,
+    adjacent faces of a solid, solids glued by a common edge...) can't be
+    meshed concurrently, so they are meshed one after the other with their
+    faces in parallel instead.
+    """
+    shapes = list(shapes)
+    if policy is None:
+        policy = MeshingPolicy()
+    in_parallel = is_parallel("meshing")
+    if workers is None:
+        workers = (os.cpu_count() or 1) if in_parallel else 1
+    workers = max(1, min(workers, len(shapes)))
+    if workers > 1 and _share_subshapes(shapes):
+        workers = 1
+
+    if workers == 1:
+        return [_mesh_one(shape, policy, in_parallel, force, progress) for shape in shapes]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(lambda shape: _mesh_one(shape, policy, False, force, progress, False), shapes)
+        )
+
+
+def mesh_shape(shape, policy=None, force=False, progress=None):
+    """Mesh a single shape, its faces in parallel, and return its
+    MeshReport. progress: optional, see mesh_shapes."""
+    if policy is None:
+        policy = MeshingPolicy()
+    return _mesh_one(shape, policy, is_parallel("meshing"), force, progress)
@@ -0,0 +1,149 @@
+# This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+# geometry kernel.
+#
+# Copyright (C) 2016-2018 Laughlin Research, LLC
+# Copyright (C) 2019-2020 Trevor Laughlin and pyOCCT contributors
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+import os
+from contextlib import contextmanager
+from typing import NamedTuple
+
+from OCCT.BOPAlgo import BOPAlgo_Options
+from OCCT.OSD import OSD_Parallel, OSD_ThreadPool
+
+# parallel mode of the OCCT.Extend helpers which have no OCCT wide switch
+_settings = {"meshing": True, "readers": True}
+
+
+class ParallelConfig(NamedTuple):
+    """The parallelism settings of the process.
+
+    threads is the number of threads of the default OSD_ThreadPool, used by
+    the algorithms running in parallel. bop is the parallel mode of the
+    Boolean operations (BOPAlgo_Options), meshing the one of
+    OCCT.Extend.Meshing and readers the one of the file readers supporting
+    it (glTF). occt_threads is True when OSD_Parallel runs on the OCCT
+    thread pool rather than on TBB.
+    """
+
+    threads: int
+    bop: bool
+    meshing: bool
+    readers: bool
+    occt_threads: bool
+
+
+class PoolUsage(NamedTuple):
+    """The use of the default OSD_ThreadPool and of the host processors."""
+
+    threads: int
+    in_use: bool
+    logical_processors: int
+    cpu_count: int
+
+
+def get_config():
+    """the current ParallelConfig"""
+    return ParallelConfig(
+        OSD_ThreadPool.DefaultPool_().NbThreads(),
+        BOPAlgo_Options.GetParallelMode_(),
+        _settings["meshing"],
+        _settings["readers"],
+        OSD_Parallel.ToUseOcctThreads_(),
+    )
+
+
+def configure(threads=None, bop=None, meshing=None, readers=None, occt_threads=None):
+    """Change the parallelism settings of the process and return the previous
+    ParallelConfig. The None arguments are left unchanged.
+
+    Parameters
+    ----------
+    threads : int, optional
+        the number of threads of the default OSD_ThreadPool. It can't be
+        changed while the pool runs an algorithm
+    bop : bool, optional
+        run the Boolean operations in parallel
+    meshing : bool, optional
+        mesh the shapes, and their faces, in parallel in OCCT.Extend.Meshing
+    readers : bool, optional
+        read the files in parallel when the reader supports it
+    occt_threads : bool, optional
+        run OSD_Parallel on the OCCT thread pool instead of TBB, when OCCT is
+        built with TBB
+
+    The settings are global to the process, not to a Python thread.
+    """
+    previous = get_config()
+    if threads is not None:
+        if threads < 1:
+            raise AssertionError(f"threads must be at least 1. You passed {threads}.")
+        pool = OSD_ThreadPool.DefaultPool_()
+        if threads != pool.NbThreads():
+            if pool.IsInUse():
+                raise RuntimeError("The default thread pool is in use.")
+            pool.Init(threads)
+    if bop is not None:
+        BOPAlgo_Options.SetParallelMode_(bop)
+    if meshing is not None:
+        _settings["meshing"] = bool(meshing)
+    if readers is not None:
+        _settings["readers"] = bool(readers)
+    if occt_threads is not None:
+        OSD_Parallel.SetUseOcctThreads_(occt_threads)
+    return previous
+
+
+@contextmanager
+def parallel(threads=None, bop=None, meshing=None, readers=None, occt_threads=None):
+    """Context manager applying the settings of configure and restoring the
+    previous ones on exit. Yields the ParallelConfig in effect.
+
+        with parallel(threads=4, bop=True):
+            shape = BRepAlgoAPI_Fuse(a, b).Shape()
+    """
+    previous = configure(threads, bop, meshing, readers, occt_threads)
+    try:
+        yield get_config()
+    finally:
+        configure(*previous)
+
+
+def is_parallel(feature):
+    """the parallel mode of a feature: "bop", "meshing" or "readers"."""
+    if feature == "bop":
+        return BOPAlgo_Options.GetParallelMode_()
+    return _settings[feature]
+
+
+def pool_usage():
+    """the current PoolUsage"""
+    pool = OSD_ThreadPool.DefaultPool_()
+    return PoolUsage(
+        pool.NbThreads(),
+        pool.IsInUse(),
+        OSD_Parallel.NbLogicalProcessors_(),
+        os.cpu_count() or 1,
+    )
+
+
+def threads_per_process(nb_processes, nb_processors=None):
+    """the number of threads each of nb_processes processes should use so
+    that together they don't oversubscribe the nb_processors of the host,
+    all the logical processors by default"""
+    if nb_processors is None:
+        nb_processors = OSD_Parallel.NbLogicalProcessors_()
+    return max(1, nb_processors // max(1, nb_processes))
@@ -0,0 +1,175 @@
+# This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+# geometry kernel.
+#
+# Copyright (C) 2016-2018 Laughlin Research, LLC
+# Copyright (C) 2019-2020 Trevor Laughlin and pyOCCT contributors
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+from OCCT.Message import Message_ProgressRange, Message_ProgressScope, Message_PyProgressIndicator
+
+
+class OperationCancelled(RuntimeError):
+    """Raised when an operation is cancelled through its Progress, by
+    Progress.cancel, the callback or the time limit."""
+
+
+class Progress:
+    """Progress reporting and cooperative cancellation of OCCT algorithms.
+
+    Pass it as the progress argument of the OCCT.Extend I/O and meshing
+    helpers. The callback is called with the position, from 0 to 1, and the
+    name of the current step, at most once per interval seconds and only
+    from the thread which created the Progress. It can return False to cancel
+    the operation. cancel can be called from any thread.
+
+    Parameters
+    ----------
+    callback : callable, optional
+        called as callback(position, step_name)
+    interval : float
+        minimum time in seconds between two calls of the callback
+    time_limit : float, optional
+        cancel the operations still running after time_limit seconds, from
+        the creation of the Progress
+
+        def report(position, step):
+            print(f"{position:.0%} {step}")
+
+        progress = Progress(report, time_limit=60.0)
+        shape = read_step_file(filename, progress=progress)
+    """
+
+    def __init__(self, callback=None, interval=0.1, time_limit=None):
+        self._indicator = Message_PyProgressIndicator(callback, interval)
+        if time_limit is not None:
+            self._indicator.SetTimeLimit(time_limit)
+
+    @property
+    def indicator(self):
+        """the Message_PyProgressIndicator"""
+        return self._indicator
+
+    @property
+    def position(self):
+        return self._indicator.Position()
+
+    @property
+    def cancelled(self):
+        return self._indicator.IsCancelled() or self._indicator.UserBreak()
+
+    def cancel(self):
+        """Cancel the running operation at its next check."""
+        self._indicator.Cancel()
+
+    def start(self):
+        """Reset the position and return the Message_ProgressRange of a new
+        operation, keeping the time limit. Raise OperationCancelled if the
+        Progress was cancelled."""
+        self.check()
+        return self._indicator.Start()
+
+    def check(self, what="Operation"):
+        """Raise OperationCancelled if cancelled."""
+        if self.cancelled:
+            raise OperationCancelled(f"{what} cancelled.")
+
+
+class _ProgressStep:
+    """One step of ProgressSteps, passed as the progress of a helper. The
+    operations of the helper share the range of the step instead of
+    resetting the Progress."""
+
+    def __init__(self, progress, step_range, name):
+        self._progress = progress
+        self._range = step_range
+        self._name = name
+        self._scope = None
+
+    def start(self):
+        self.check()
+        if self._scope is None:
+            # each operation advances within the step, whatever their number
+            self._scope = Message_ProgressScope(self._range, self._name, 1.0, True)
+        return self._scope.Next()
+
+    def check(self, what="Operation"):
+        self._progress.check(what)
+
+    def close(self):
+        if self._scope is not None:
+            self._scope.Close()
+        # advance the parent now if the step was never started
+        self._range.Close()
+
+
+class ProgressSteps:
+    """Split one operation of a Progress into consecutive steps.
+
+    Each step returned by next is passed as the progress argument of a
+    helper. The position moves forward from one step to the next, instead of
+    being reset by each helper, and a cancellation is not cleared. With a
+    None progress, the steps are None.
+
+        with ProgressSteps(progress, 2, "Export") as steps:
+            assembly.mesh(0.1, progress=steps.next("Meshing"))
+            write_gltf_file(shape, filename, progress=steps.next("Writing"))
+    """
+
+    def __init__(self, progress, nb_steps, name=""):
+        self._progress = progress
+        self._scope = None
+        self._step = None
+        if progress is not None:
+            self._scope = Message_ProgressScope(progress.start(), name, nb_steps)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def next(self, name=""):
+        """the Progress like object of the next step"""
+        if self._scope is None:
+            return None
+        self._close_step()
+        self._step = _ProgressStep(self._progress, self._scope.Next(), name)
+        return self._step
+
+    def _close_step(self):
+        if self._step is not None:
+            self._step.close()
+            self._step = None
+
+    def close(self):
+        """Close the steps, the nested scopes first."""
+        self._close_step()
+        if self._scope is not None:
+            self._scope.Close()
+            self._scope = None
+
+
+def progress_range(progress):
+    """the Message_ProgressRange of a new operation of progress, a Progress,
+    a step of ProgressSteps or None"""
+    if progress is None:
+        return Message_ProgressRange()
+    return progress.start()
+
+
+def check_progress(progress, what="Operation"):
+    """Raise OperationCancelled if progress is not None and cancelled."""
+    if progress is not None:
+        progress.check(what)
@@ -0,0 +1,103 @@
+# This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+# geometry kernel.
+#
+# Copyright (C) 2016-2018 Laughlin Research, LLC
+# Copyright (C) 2019-2020 Trevor Laughlin and pyOCCT contributors
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+import math
+from typing import NamedTuple
+
+try:
+    import numpy as np
+
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+from OCCT.BRepExtrema import BRepExtrema_FacePointProjector
+
+from OCCT.Extend.TopologyUtils import check_numpy_installed
+
+
+class PointProjection(NamedTuple):
+    """Projection of N points on the faces of a shape.
+
+    ``face_index`` holds the index of the nearest face, in the order of
+    ``TopExp.MapShapes_(shape, TopAbs_FACE, map)`` (index ``i`` is map index
+    ``i + 1``), or -1 when no face is within the maximum distance. ``uv`` are
+    the (N, 2) surface parameters and ``points`` the (N, 3) closest points.
+    ``distances`` are signed, positive on the side the face normal points to,
+    so negative inside a valid solid.
+    """
+
+    face_index: "np.ndarray"
+    uv: "np.ndarray"
+    points: "np.ndarray"
+    distances: "np.ndarray"
+
+
+class PointProjector:
+    """Projects points on the faces of a shape.
+
+    The bounding volume hierarchy of the faces is built once when the
+    projector is created, so that many batches of points can be projected on
+    the same shape.
+
+    Parameters
+    ----------
+    shape : TopoDS_Shape
+        the shape to project on
+    """
+
+    def __init__(self, shape):
+        self._shape = shape
+        self._projector = BRepExtrema_FacePointProjector(shape)
+
+    @property
+    def shape(self):
+        return self._shape
+
+    @property
+    def nb_faces(self):
+        return self._projector.NbFaces()
+
+    def face(self, index):
+        """Return the face of a PointProjection.face_index value."""
+        return self._projector.Face(index)
+
+    def project(self, points, max_distance=math.inf, nb_threads=0):
+        """Project an (N, 3) array of points and return a PointProjection.
+
+        Parameters
+        ----------
+        points : array_like
+            the points to project
+        max_distance : float
+            points farther than this from the shape get a face index of -1
+            and NaN values. A finite value also speeds up the search
+        nb_threads : int
+            number of threads, 0 uses all the logical processors
+        """
+        check_numpy_installed()
+        points = np.ascontiguousarray(points, dtype=np.float64).reshape(-1, 3)
+        return PointProjection(*self._projector.Perform(points, max_distance, nb_threads))
+
+
+def project_points(shape, points, max_distance=math.inf, nb_threads=0):
+    """Project an (N, 3) array of points on the faces of `shape` and return a
+    PointProjection. Use a PointProjector to project several batches of
+    points on the same shape."""
+    return PointProjector(shape).project(points, max_distance, nb_threads)
@@ -61,8 +61,7 @@ from OCCT.gp import (
     gp_Mat,
     gp_XYZ,
 )
-from OCCT.BRepMesh import BRepMesh_IncrementalMesh
-
+from OCCT.Extend.Meshing import mesh_shape
 from OCCT.Extend.TopologyUtils import is_edge, is_face
 
 
@@ -80,6 +79,11 @@ def assert_isdone(inst, message):
 
 
 def point_list_to_TColgp_Array1OfPnt(li):
+    """converts a list of gp_Pnt, or an (N, 3) array of coordinates, to a
+    TColgp_Array1OfPnt indexed from 0. Arrays are copied in a single block.
+    """
+    if hasattr(li, "__array__"):
+        return TColgp_Array1OfPnt(li, 0)
     pts = TColgp_Array1OfPnt(0, len(li) - 1)
     for n, i in enumerate(li):
         pts.SetValue(n, i)
@@ -123,9 +127,7 @@ def make_wire(*args):
 
 
 def points_to_bspline(pnts):
-    pts = TColgp_Array1OfPnt(0, len(pnts) - 1)
-    for n, i in enumerate(pnts):
-        pts.SetValue(n, i)
+    pts = point_list_to_TColgp_Array1OfPnt(pnts)
     crv = GeomAPI_PointsToBSpline(pts)
     return crv.Curve()
 
@@ -302,16 +304,13 @@ def get_boundingbox(shape, tol=1e-6, use_mesh=True):
         tolerance of the computed boundingbox
     use_mesh : bool
         a flag that tells whether or not the shape has first to be meshed before the bbox
-        computation. This produces more accurate results
+        computation. This produces more accurate results. An existing
+        triangulation is kept if fine enough
     """
     bbox = Bnd_Box()
     bbox.SetGap(tol)
     if use_mesh:
-        mesh = BRepMesh_IncrementalMesh()
-        mesh.SetParallelDefault(True)
-        mesh.SetShape(shape)
-        mesh.Perform()
-        if not mesh.IsDone():
+        if not mesh_shape(shape).done:
             raise AssertionError("Mesh not done.")
     brepbndlib.Add(shape, bbox, use_mesh)
 
@@ -17,7 +17,7 @@
 ##You should have received a copy of the GNU Lesser General Public License
 ##along with pythonOCC.  If not, see <http://www.gnu.org/licenses/>.
 
-from typing import Any, Iterable, Iterator, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 from OCCT.BRep import BRep_Tool, BRep_Builder
 from OCCT.BRepTools import BRepTools_WireExplorer
@@ -40,6 +40,8 @@ from OCCT.TopExp import TopExp_Explorer, TopExp
 from OCCT.TopTools import (
     TopTools_ListIteratorOfListOfShape,
     TopTools_IndexedDataMapOfShapeListOfShape,
+    TopTools_IndexedMapOfShape,
+    TopTools_MapOfShape,
 )
 from OCCT.TopoDS import (
     TopoDS,
@@ -61,7 +63,12 @@ from OCCT.GCPnts import (
 )
 from OCCT.BRepAdaptor import BRepAdaptor_Curve
 
-MAX_32_BIT_INT = 2**31 - 1
+try:
+    import numpy as np
+
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
 
 
 def _number_of_topo(iterable: Iterable) -> int:
@@ -153,10 +160,19 @@ class TopologyExplorer:
 
         for further reference see TopoDS_Shape IsEqual / IsSame methods
 
+        the maps used to answer the queries are built on first use and kept
+        for the lifetime of the explorer. Call ``invalidate`` if ``my_shape``
+        is modified in place
+
         """
         self.my_shape = my_shape
         self.ignore_orientation = ignore_orientation
 
+        # (topology_type_1, topology_type_2) -> TopTools_IndexedDataMapOfShapeListOfShape
+        self._ancestor_maps = {}
+        # topology_type -> TopTools_IndexedMapOfShape
+        self._indexed_maps = {}
+
         # the topology_factory dicts maps topology types and functions that can
         # create this topology
         self.topology_factory = {
@@ -192,9 +208,20 @@ class TopologyExplorer:
             TopAbs_COMPOUND: TopoDS_Compound,
             TopAbs_COMPSOLID: TopoDS_CompSolid,
         }
-        topology_explorer = TopExp_Explorer()
         if topology_type not in topo_types:
             raise AssertionError(f"{topology_type} not one of {topo_types.keys()}")
+
+        if self.ignore_orientation and topology_type_to_avoid is None:
+            # filter out those entities that share the same TShape
+            # but do *not* share the same orientation in a single C++ pass
+            if topological_entity is None:
+                _map = self.indexed_map(topology_type)
+            else:
+                _map = TopTools_IndexedMapOfShape()
+                TopExp.MapShapes_(topological_entity, topology_type, _map)
+            return self._iter_indexed_map(_map, topology_type)
+
+        topology_explorer = TopExp_Explorer()
         # use self.my_shape if nothing is specified
         if topological_entity is None and topology_type_to_avoid is None:
             topology_explorer.Init(self.my_shape, topology_type)
@@ -206,36 +233,57 @@ class TopologyExplorer:
             topology_explorer.Init(
                 topological_entity, topology_type, topology_type_to_avoid
             )
-        seq = []
+        # the map ignores orientation, Add returns False for shapes already seen
+        seen = TopTools_MapOfShape() if self.ignore_orientation else None
+        return self._iter_explorer(topology_explorer, topology_type, seen)
+
+    def _iter_indexed_map(
+        self, _map: TopTools_IndexedMapOfShape, topology_type: TopAbs_ShapeEnum
+    ) -> Iterator[Any]:
+        factory = self.topology_factory[topology_type]
+        for i in range(1, _map.Extent() + 1):
+            yield factory(_map.FindKey(i))
+
+    def _iter_explorer(
+        self,
+        topology_explorer: TopExp_Explorer,
+        topology_type: TopAbs_ShapeEnum,
+        seen: Optional[TopTools_MapOfShape] = None,
+    ) -> Iterator[Any]:
+        factory = self.topology_factory[topology_type]
         while topology_explorer.More():
             current_item = topology_explorer.Current()
-            topo_to_add = self.topology_factory[topology_type](current_item)
-            seq.append(topo_to_add)
+            if seen is None or seen.Add(current_item):
+                yield factory(current_item)
             topology_explorer.Next()
 
-        if self.ignore_orientation:
-            # filter out those entities that share the same TShape
-            # but do *not* share the same orientation
-            filter_orientation_seq: List = []
-            filter_orientation_hash_codes = {}
-            for i in seq:
-                i_hash_code = i.HashCode(MAX_32_BIT_INT)
-                if i_hash_code not in filter_orientation_hash_codes:
-                    filter_orientation_seq.append(i)
-                    filter_orientation_hash_codes[i_hash_code] = [
-                        len(filter_orientation_seq) - 1
-                    ]
-                else:
-                    index_list = filter_orientation_hash_codes[i_hash_code]
-                    unique = not any(
-                        i.IsSame(filter_orientation_seq[j]) for j in index_list
-                    )
-                    if unique:
-                        filter_orientation_seq.append(i)
-                        index_list.append(len(filter_orientation_seq) - 1)
-            return iter(filter_orientation_seq)
+    def _number_of_subshapes(
+        self, topology_type: TopAbs_ShapeEnum, topological_entity=None
+    ) -> int:
+        """
+        the number of topology_type entities of topological_entity (my_shape
+        by default), counted natively without creating a Python object per
+        entity
+        """
+        if self.ignore_orientation and topological_entity is None:
+            return self.indexed_map(topology_type).Extent()
+        if topological_entity is None:
+            topological_entity = self.my_shape
+        return TopExp.NbShapes_(
+            topological_entity, topology_type, self.ignore_orientation
+        )
 
-        return iter(seq)
+    def count_subshapes(
+        self, topological_entity=None
+    ) -> Dict[TopAbs_ShapeEnum, int]:
+        """
+        the number of entities of each type of topological_entity (my_shape by
+        default), as a dict keyed by TopAbs_ShapeEnum
+        """
+        return {
+            topology_type: self._number_of_subshapes(topology_type, topological_entity)
+            for topology_type in self.topology_factory
+        }
 
     def faces(self) -> Iterator[TopoDS_Face]:
         """
@@ -244,7 +292,7 @@ class TopologyExplorer:
         return self._loop_topo(TopAbs_FACE)
 
     def number_of_faces(self) -> int:
-        return _number_of_topo(self.faces())
+        return self._number_of_subshapes(TopAbs_FACE)
 
     def vertices(self) -> Iterator[TopoDS_Vertex]:
         """
@@ -253,7 +301,7 @@ class TopologyExplorer:
         return self._loop_topo(TopAbs_VERTEX)
 
     def number_of_vertices(self) -> int:
-        return _number_of_topo(self.vertices())
+        return self._number_of_subshapes(TopAbs_VERTEX)
 
     def edges(self) -> Iterator[TopoDS_Edge]:
         """
@@ -262,7 +310,7 @@ class TopologyExplorer:
         return self._loop_topo(TopAbs_EDGE)
 
     def number_of_edges(self) -> int:
-        return _number_of_topo(self.edges())
+        return self._number_of_subshapes(TopAbs_EDGE)
 
     def wires(self) -> Iterator[TopoDS_Wire]:
         """
@@ -271,7 +319,7 @@ class TopologyExplorer:
         return self._loop_topo(TopAbs_WIRE)
 
     def number_of_wires(self) -> int:
-        return _number_of_topo(self.wires())
+        return self._number_of_subshapes(TopAbs_WIRE)
 
     def shells(self) -> Iterator[TopoDS_Shell]:
         """
@@ -280,7 +328,7 @@ class TopologyExplorer:
         return self._loop_topo(TopAbs_SHELL, None)
 
     def number_of_shells(self) -> int:
-        return _number_of_topo(self.shells())
+        return self._number_of_subshapes(TopAbs_SHELL)
 
     def solids(self) -> Iterator[TopoDS_Solid]:
         """
@@ -289,7 +337,7 @@ class TopologyExplorer:
         return self._loop_topo(TopAbs_SOLID, None)
 
     def number_of_solids(self) -> int:
-        return _number_of_topo(self.solids())
+        return self._number_of_subshapes(TopAbs_SOLID)
 
     def comp_solids(self) -> Iterator[TopoDS_CompSolid]:
         """
@@ -298,7 +346,7 @@ class TopologyExplorer:
         return self._loop_topo(TopAbs_COMPSOLID)
 
     def number_of_comp_solids(self) -> int:
-        return _number_of_topo(self.comp_solids())
+        return self._number_of_subshapes(TopAbs_COMPSOLID)
 
     def compounds(self) -> Iterator[TopoDS_Compound]:
         """
@@ -307,7 +355,7 @@ class TopologyExplorer:
         return self._loop_topo(TopAbs_COMPOUND)
 
     def number_of_compounds(self) -> int:
-        return _number_of_topo(self.compounds())
+        return self._number_of_subshapes(TopAbs_COMPOUND)
 
     def number_of_ordered_vertices_from_wire(self, wire: TopoDS_Wire) -> int:
         return _number_of_topo(ordered_vertices_from_wire(wire))
@@ -315,6 +363,70 @@ class TopologyExplorer:
     def number_of_ordered_edges_from_wire(self, wire: TopoDS_Wire) -> int:
         return _number_of_topo(ordered_edges_from_wire(wire))
 
+    def invalidate(self) -> None:
+        """
+        drop the cached maps, to be called when my_shape was modified
+        """
+        self._ancestor_maps.clear()
+        self._indexed_maps.clear()
+
+    def _ancestor_map(
+        self, topology_type_1, topology_type_2
+    ) -> TopTools_IndexedDataMapOfShapeListOfShape:
+        """
+        the map of the topology_type_1 entities of my_shape to their
+        topology_type_2 ancestors, built once per explorer
+        """
+        key = (topology_type_1, topology_type_2)
+        _map = self._ancestor_maps.get(key)
+        if _map is None:
+            _map = TopTools_IndexedDataMapOfShapeListOfShape()
+            TopExp.MapShapesAndAncestors_(
+                self.my_shape, topology_type_1, topology_type_2, _map
+            )
+            self._ancestor_maps[key] = _map
+        return _map
+
+    def indexed_map(self, topology_type) -> TopTools_IndexedMapOfShape:
+        """
+        the map of the unique topology_type entities of my_shape, built once
+        per explorer. The entity of index i (1 based) is _map.FindKey(i), the
+        indices are the ones used by ``adjacency``
+        """
+        _map = self._indexed_maps.get(topology_type)
+        if _map is None:
+            _map = TopTools_IndexedMapOfShape()
+            TopExp.MapShapes_(self.my_shape, topology_type, _map)
+            self._indexed_maps[topology_type] = _map
+        return _map
+
+    def adjacency(self, topology_type_1, topology_type_2) -> List[List[int]]:
+        """
+        the whole topology_type_1 -> topology_type_2 ancestor graph in one pass
+
+        for instance adjacency(TopAbs_EDGE, TopAbs_FACE)[i] lists the faces
+        bounded by the edge i. Indices are 0 based positions in
+        indexed_map(topology_type_1) and indexed_map(topology_type_2), so the
+        orientation of the entities is always ignored. Each list is sorted
+        """
+        map_1 = self.indexed_map(topology_type_1)
+        map_2 = self.indexed_map(topology_type_2)
+        ancestors = self._ancestor_map(topology_type_1, topology_type_2)
+        graph = []
+        for i in range(1, map_1.Extent() + 1):
+            neighbours = set()
+            index = ancestors.FindIndex(map_1.FindKey(i))
+            if index > 0:
+                topology_iterator = TopTools_ListIteratorOfListOfShape(
+                    ancestors.FindFromIndex(index)
+                )
+                while topology_iterator.More():
+                    neighbours.add(map_2.FindIndex(topology_iterator.Value()) - 1)
+                    topology_iterator.Next()
+                neighbours.discard(-1)
+            graph.append(sorted(neighbours))
+        return graph
+
     def _map_shapes_and_ancestors(
         self, topology_type_1, topology_type_2, topological_entity
     ):
@@ -325,11 +437,9 @@ class TopologyExplorer:
         @param topological_entity:
         """
         topo_set = set()
-        topo_set_hash_codes = {}
-        _map = TopTools_IndexedDataMapOfShapeListOfShape()
-        TopExp.MapShapesAndAncestors(
-            self.my_shape, topology_type_1, topology_type_2, _map
-        )
+        # the map ignores orientation, Add returns False for shapes already seen
+        topo_map = TopTools_MapOfShape()
+        _map = self._ancestor_map(topology_type_1, topology_type_2)
         results = _map.FindFromKey(topological_entity)
         if results.Size() == 0:
             yield None
@@ -339,28 +449,14 @@ class TopologyExplorer:
             topo_entity = self.topology_factory[topology_type_2](
                 topology_iterator.Value()
             )
-            topo_entity_hash_code = topo_entity.HashCode(MAX_32_BIT_INT)
             # return the entity if not in set
             # to assure we're not returning entities several times
-            if topo_entity not in topo_set:
-                if self.ignore_orientation:
-                    if topo_entity_hash_code not in topo_set_hash_codes:
-                        topo_set_hash_codes[topo_entity_hash_code] = [topo_entity]
-                        yield topo_entity
-                    else:
-                        unique = not any(
-                            i.IsSame(topo_entity)
-                            for i in topo_set_hash_codes[topo_entity_hash_code]
-                        )
-                        if unique:
-                            topo_set_hash_codes[topo_entity_hash_code].append(
-                                topo_entity
-                            )
-                            yield topo_entity
-                else:
+            if self.ignore_orientation:
+                if topo_map.Add(topo_entity):
                     yield topo_entity
-
-            topo_set.add(topo_entity)
+            elif topo_entity not in topo_set:
+                topo_set.add(topo_entity)
+                yield topo_entity
             topology_iterator.Next()
 
     def _number_shapes_ancestors(
@@ -374,19 +470,16 @@ class TopologyExplorer:
         @param topoTypeB:
         @param topological_entity:
         """
-        topo_set = set()
-        _map = TopTools_IndexedDataMapOfShapeListOfShape()
-        TopExp.MapShapesAndAncestors(
-            self.my_shape, topology_type_1, topology_type_2, _map
-        )
+        topo_map = TopTools_MapOfShape()
+        _map = self._ancestor_map(topology_type_1, topology_type_2)
         results = _map.FindFromKey(topological_entity)
         if results.Size() == 0:
             return None
         topology_iterator = TopTools_ListIteratorOfListOfShape(results)
         while topology_iterator.More():
-            topo_set.add(topology_iterator.Value())
+            topo_map.Add(topology_iterator.Value())
             topology_iterator.Next()
-        return len(topo_set)
+        return topo_map.Extent()
 
     # ======================================================================
     # EDGE <-> FACE
@@ -416,7 +509,7 @@ class TopologyExplorer:
         return self._loop_topo(TopAbs_EDGE, face)
 
     def number_of_edges_from_face(self, face: TopoDS_Face) -> int:
-        return sum(1 for _ in self._loop_topo(TopAbs_EDGE, face))
+        return self._number_of_subshapes(TopAbs_EDGE, face)
 
     # ======================================================================
     # VERTEX <-> EDGE
@@ -425,7 +518,7 @@ class TopologyExplorer:
         return self._loop_topo(TopAbs_VERTEX, edge)
 
     def number_of_vertices_from_edge(self, edge: TopoDS_Edge) -> int:
-        return sum(1 for _ in self._loop_topo(TopAbs_VERTEX, edge))
+        return self._number_of_subshapes(TopAbs_VERTEX, edge)
 
     def edges_from_vertex(self, vertex):
         return self._map_shapes_and_ancestors(TopAbs_VERTEX, TopAbs_EDGE, vertex)
@@ -440,7 +533,7 @@ class TopologyExplorer:
         return self._loop_topo(TopAbs_EDGE, wire)
 
     def number_of_edges_from_wire(self, wire: TopoDS_Wire) -> int:
-        return sum(1 for _ in self._loop_topo(TopAbs_EDGE, wire))
+        return self._number_of_subshapes(TopAbs_EDGE, wire)
 
     def wires_from_edge(self, edg):
         return self._map_shapes_and_ancestors(TopAbs_EDGE, TopAbs_WIRE, edg)
@@ -458,7 +551,7 @@ class TopologyExplorer:
         return self._loop_topo(TopAbs_WIRE, face)
 
     def number_of_wires_from_face(self, face: TopoDS_Face) -> int:
-        return sum(1 for _ in self._loop_topo(TopAbs_WIRE, face))
+        return self._number_of_subshapes(TopAbs_WIRE, face)
 
     def faces_from_wire(self, wire):
         return self._map_shapes_and_ancestors(TopAbs_WIRE, TopAbs_FACE, wire)
@@ -479,7 +572,7 @@ class TopologyExplorer:
         return self._loop_topo(TopAbs_VERTEX, face)
 
     def number_of_vertices_from_face(self, face: TopoDS_Face) -> int:
-        return sum(1 for _ in self._loop_topo(TopAbs_VERTEX, face))
+        return self._number_of_subshapes(TopAbs_VERTEX, face)
 
     # ======================================================================
     # FACE <-> SOLID
@@ -494,7 +587,7 @@ class TopologyExplorer:
         return self._loop_topo(TopAbs_FACE, solid)
 
     def number_of_faces_from_solids(self, solid: TopoDS_Solid) -> int:
-        return sum(1 for _ in self._loop_topo(TopAbs_FACE, solid))
+        return self._number_of_subshapes(TopAbs_FACE, solid)
 
 
 def dump_topology_to_string(
@@ -518,6 +611,83 @@ def dump_topology_to_string(
         dump_topology_to_string(shp, level + 1, buffer)
 
 
+#
+# Index based topology graph
+#
+
+
+def check_numpy_installed():
+    if not HAVE_NUMPY:
+        raise IOError(
+            "numpy is required for array outputs but is not installed. use $pip install numpy"
+        )
+
+
+class CSRAdjacency(NamedTuple):
+    """
+    compressed sparse row adjacency, the neighbours of entity i are
+    indices[indptr[i]:indptr[i + 1]] with the matching orientations
+    """
+
+    indptr: Any
+    indices: Any
+    orientations: Any
+
+    def neighbours(self, i: int):
+        return self.indices[self.indptr[i] : self.indptr[i + 1]]
+
+
+class TopologyGraph(NamedTuple):
+    """
+    index based topology of a shape, see topology_graph
+    """
+
+    face_edges: CSRAdjacency
+    edge_faces: CSRAdjacency
+    edge_vertices: CSRAdjacency
+    solid_faces: CSRAdjacency
+    face_types: Any
+    face_orientations: Any
+    edge_types: Any
+    edge_orientations: Any
+
+    @property
+    def nb_faces(self) -> int:
+        return len(self.face_types)
+
+    @property
+    def nb_edges(self) -> int:
+        return len(self.edge_types)
+
+    @property
+    def nb_solids(self) -> int:
+        return len(self.solid_faces.indptr) - 1
+
+
+def topology_graph(shape: TopoDS_Shape) -> TopologyGraph:
+    """
+    the face/edge/vertex/solid incidence of a shape as NumPy arrays
+
+    entities are numbered from 0 in the order of
+    TopExp.MapShapes_(shape, topology_type, map), i.e. entity i is
+    map.FindKey(i + 1), and orientation is ignored to identify them.
+    face_edges lists the edges of the wires of each face with their
+    orientation in the face, a seam edge appearing twice. edge_faces,
+    edge_vertices and solid_faces list each neighbour once. face_types and
+    edge_types hold the GeomAbs_SurfaceType / GeomAbs_CurveType values (-1
+    for degenerated edges), the orientations are TopAbs_Orientation values
+    """
+    check_numpy_installed()
+    face_edges, edge_faces, edge_vertices, solid_faces, *entities = TopExp.Graph_(shape)
+    return TopologyGraph(
+        CSRAdjacency(*face_edges),
+        CSRAdjacency(*edge_faces),
+        CSRAdjacency(*edge_vertices),
+        CSRAdjacency(*solid_faces),
+        *entities,
+    )
+
+
 #
 # Edge and wire discretizers
 #
@@ -587,6 +757,59 @@ def discretize_edge(
     return points
 
 
+def discretize_edges(
+    shape_or_edges, deflection=0.2, algorithm="QuasiUniformDeflection", parallel=False
+):
+    """Discretize many edges at once, returns the tuple (points, offsets)
+    points: a (N, 3) float64 numpy array with the points of all the edges
+    offsets: the points of edge i are points[offsets[i]:offsets[i + 1]]
+    shape_or_edges: a list of TopoDS_Edge, or a shape whose edges are taken in
+    connection order for a wire, in the order of TopExp.MapShapes_ otherwise
+    algorithm: to choose in ["UniformAbscissa", "QuasiUniformDeflection", "UniformDeflection"]
+    parallel: discretize the edges in parallel threads
+    Edges that can't be discretized get no point.
+    """
+    check_numpy_installed()
+    if not isinstance(shape_or_edges, TopoDS_Shape):
+        shape_or_edges = list(shape_or_edges)
+    return BRepAdaptor_Curve.Discretize_(shape_or_edges, deflection, algorithm, parallel)
+
+
+def discretize_edge_array(
+    a_topods_edge: TopoDS_Edge, deflection=0.2, algorithm="QuasiUniformDeflection"
+):
+    """Same as discretize_edge but returns a (N, 3) numpy array
+    As with discretize_edge, the points of a REVERSED edge are returned in
+    reverse order, and a null edge gives no point.
+    """
+    if not is_edge(a_topods_edge):
+        raise AssertionError(
+            "You must provide a TopoDS_Edge to the discretize_edge_array function."
+        )
+    if algorithm not in (
+        "QuasiUniformDeflection",
+        "UniformAbscissa",
+        "UniformDeflection",
+    ):
+        raise AssertionError("Unknown algorithm")
+    points, _ = discretize_edges(a_topods_edge, deflection, algorithm)
+    if len(points) == 0 and not a_topods_edge.IsNull():
+        raise AssertionError("Discretizer not done.")
+    return points
+
+
+def discretize_wire_array(
+    a_topods_wire: TopoDS_Wire, deflection: Optional[float] = 0.5
+):
+    """Same as discretize_wire but returns a (N, 3) numpy array"""
+    if not is_wire(a_topods_wire):
+        raise AssertionError(
+            "You must provide a TopoDS_Wire to the discretize_wire_array function."
+        )
+    points, _ = discretize_edges(a_topods_wire, deflection)
+    return points
+
+
 #
 # TopoDS_Shape type utils
 #
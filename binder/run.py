@@ -1,6 +1,8 @@
 import argparse
 import os
+import re
 import sys
+import tempfile
 
 # Add the binding generator to the path
 BINDER_ROOT = os.path.dirname(os.path.realpath(__file__))
@@ -88,6 +90,86 @@ def gen_includes(occt_include_path, output_path):
     return occt_mods
 
 
+def split_release_gil(config_path):
+    """
+    Extract the "+release_gil" directives from the configuration file. They are
+    handled here rather than by the binding generator.
+
+    :param str config_path: The path to config.txt.
+
+    :return: The path to a copy of the configuration file without the
+        directives and the list of (class, method) pairs to release the GIL for.
+    :rtype: tuple(str, list[tuple(str, str)])
+    """
+    targets = []
+    lines = []
+    with open(config_path, 'r') as fin:
+        for line in fin:
+            if line.startswith('+release_gil '):
+                name = line[len('+release_gil '):].strip()
+                cls, method = name.split('::')
+                targets.append((cls.strip(), method.strip()))
+            else:
+                lines.append(line)
+
+    fd, filtered_path = tempfile.mkstemp(prefix='config_', suffix='.txt', text=True)
+    with os.fdopen(fd, 'w') as fout:
+        fout.writelines(lines)
+
+    return filtered_path, targets
+
+
+def apply_release_gil(output_path, targets):
+    """
+    Add py::call_guard<py::gil_scoped_release>() to the generated definitions
+    of the given methods so that other Python threads can run while they
+    execute. A target "Class::Class" applies to all the constructors of the
+    class. Static methods are matched with or without their trailing
+    underscore.
+
+    :param str output_path: The path of the generated bindings.
+    :param list[tuple(str, str)] targets: The (class, method) pairs.
+
+    :return: The targets that did not match any definition.
+    :rtype: list[tuple(str, str)]
+    """
+    guard = ', py::call_guard<py::gil_scoped_release>()'
+    patterns = {}
+    for cls, method in targets:
+        if cls == method:
+            expr = r'cls_{0}\.def\(py::init'.format(re.escape(cls))
+        else:
+            expr = r'cls_{0}\.def(_static)?\("{1}_?",'.format(re.escape(cls), re.escape(method))
+        patterns[(cls, method)] = re.compile(r'^\s*' + expr)
+
+    matched = set()
+    for root, _, files in os.walk(output_path):
+        for fname in files:
+            if not fname.endswith(('.cxx', '.hxx')):
+                continue
+            path = os.path.join(root, fname)
+            with open(path, 'r') as fin:
+                lines = fin.readlines()
+
+            modified = False
+            for i, line in enumerate(lines):
+                stripped = line.rstrip()
+                if not stripped.endswith(');') or guard in stripped:
+                    continue
+                for target, pattern in patterns.items():
+                    if pattern.match(line):
+                        lines[i] = stripped[:-2] + guard + ');\n'
+                        matched.add(target)
+                        modified = True
+                        break
+
+            if modified:
+                with open(path, 'w') as fout:
+                    fout.writelines(lines)
+
+    return [target for target in targets if target not in matched]
+
+
 def main():
     # Setup a parser
     parser = argparse.ArgumentParser()
@@ -196,7 +278,11 @@ def main():
     gen.bind_class_templates = True
 
     # Process configuration file
-    gen.process_config(args.config_path)
+    config_path, release_gil = split_release_gil(args.config_path)
+    try:
+        gen.process_config(config_path)
+    finally:
+        os.remove(config_path)
 
     print('\nParsing headers...')
     gen.parse(os.path.join(BINDER_ROOT, 'all_includes.h'))
@@ -223,6 +309,10 @@ def main():
     print('Binding...')
     gen.bind(output_path)
 
+    print('Releasing the GIL...')
+    for cls, method in apply_release_gil(output_path, release_gil):
+        print('\tWARNING: +release_gil {}::{} did not match any definition.'.format(cls, method))
+
     print('Done!')
     print('-' * 100)
 
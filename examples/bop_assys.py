@@ -19,32 +19,31 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
 import time
 
-from OCCT.BOPAlgo import BOPAlgo_Options
-from OCCT.BRepAlgoAPI import BRepAlgoAPI_Fuse
-from OCCT.TopTools import TopTools_ListOfShape
-
-from OCCT.Exchange import ExchangeBasic
+from OCCT.Extend.BooleanUtils import BooleanOperations
+from OCCT.Extend.DataExchange import read_brep_file
+from OCCT.Extend.Parallel import configure
 from OCCT.Display._WxViewer import ShapeViewerWx
 
 fn = './models/wing_assy.brep'
-wing_assy = ExchangeBasic.read_brep(fn)
+wing_assy = read_brep_file(fn)
 
 fn = './models/fuse_assy.brep'
-fuse_assy = ExchangeBasic.read_brep(fn)
+fuse_assy = read_brep_file(fn)
+
+configure(bop=True)
+
+# The intersection of the assemblies is computed once, then the fuse, common
+# and cut are only built from it
+print('Starting intersection...')
+start = time.time()
+bop = BooleanOperations(wing_assy, fuse_assy)
+print('Complete in ', time.time() - start, ' seconds.')
 
-BOPAlgo_Options.SetParallelMode_(True)
-bop = BRepAlgoAPI_Fuse()
-args = TopTools_ListOfShape()
-args.Append(wing_assy)
-bop.SetArguments(args)
-tools = TopTools_ListOfShape()
-tools.Append(fuse_assy)
-bop.SetTools(tools)
-print('Starting fuse...')
+print('Building fuse, common and cut...')
 start = time.time()
-bop.Build()
+results = bop.results(('fuse', 'common', 'cut'))
 print('Complete in ', time.time() - start, ' seconds.')
 
 v = ShapeViewerWx()
-v.add(bop.Shape())
+v.add(results['fuse'])
 v.start()
@@ -22,14 +22,13 @@ https://tracker.dev.opencascade.org/view.php?id=22702
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
 import time
 
-from OCCT.BOPAlgo import BOPAlgo_Options
-from OCCT.BRepAlgoAPI import BRepAlgoAPI_Common
-
-from OCCT.Exchange import ExchangeBasic
+from OCCT.Extend.BooleanUtils import BooleanOperations
+from OCCT.Extend.DataExchange import read_step_file
+from OCCT.Extend.Parallel import configure
 from OCCT.Display._WxViewer import ShapeViewerWx
 
-cheese = ExchangeBasic.read_step('./models/cheese.stp')
-planes = ExchangeBasic.read_step('./models/planes.stp')
+cheese = read_step_file('./models/cheese.stp', verbosity=False)
+planes = read_step_file('./models/planes.stp', verbosity=False)
 
 v = ShapeViewerWx()
 v.add(cheese, planes)
@@ -39,15 +38,15 @@ v.clear()
 # Basic operation takes about 32 seconds
 print('Starting Boolean operation...')
 start = time.time()
-BRepAlgoAPI_Common(cheese, planes)
+BooleanOperations(cheese, planes, parallel=False).common()
 print('Complete in ', time.time() - start, ' seconds.')
 
 # Run in parallel. Should take 10 to 11 seconds on 4 cores
-BOPAlgo_Options.SetParallelMode_(True)
+configure(bop=True)
 print('Starting Boolean operation...')
 start = time.time()
-bop = BRepAlgoAPI_Common(cheese, planes)
+common = BooleanOperations(cheese, planes).common()
 print('Complete in ', time.time() - start, ' seconds.')
 
-v.add(bop.Shape())
+v.add(common)
 v.start()
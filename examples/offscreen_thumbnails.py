@@ -0,0 +1,62 @@
+"""
+Render thumbnails of many shapes offscreen, reusing a single OpenGL context,
+and report the throughput in images per second.
+
+On a headless Linux server, run it under Xvfb with software Mesa:
+    LIBGL_ALWAYS_SOFTWARE=1 xvfb-run -a python offscreen_thumbnails.py [nb_images]
+"""
+# This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+# geometry kernel.
+#
+# Copyright (C) 2016-2018 Laughlin Research, LLC
+# Copyright (C) 2019-2020 Trevor Laughlin and pyOCCT contributors
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+import os
+import sys
+import tempfile
+import time
+
+from OCCT.BRepPrimAPI import (BRepPrimAPI_MakeBox, BRepPrimAPI_MakeCone,
+                              BRepPrimAPI_MakeCylinder, BRepPrimAPI_MakeSphere,
+                              BRepPrimAPI_MakeTorus)
+
+from OCCT.Display.OCCViewer import OffscreenRenderer
+
+nb_images = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+size = 256
+
+makers = [
+    lambda i: BRepPrimAPI_MakeBox(10. + i % 7, 10., 10.).Shape(),
+    lambda i: BRepPrimAPI_MakeSphere(5. + i % 5).Shape(),
+    lambda i: BRepPrimAPI_MakeCylinder(3., 10. + i % 3).Shape(),
+    lambda i: BRepPrimAPI_MakeCone(5., 1., 10. + i % 4).Shape(),
+    lambda i: BRepPrimAPI_MakeTorus(10., 2. + i % 2).Shape(),
+]
+shapes = [makers[i % len(makers)](i) for i in range(nb_images)]
+
+start = time.perf_counter()
+renderer = OffscreenRenderer(size, size)
+init_time = time.perf_counter() - start
+
+with tempfile.TemporaryDirectory() as directory:
+    filenames = [os.path.join(directory, f'thumb_{i:04d}.png') for i in range(nb_images)]
+    start = time.perf_counter()
+    renderer.render_many(shapes, filenames)
+    elapsed = time.perf_counter() - start
+
+print(f'OpenGL context created in {init_time:.3f} s')
+print(f'{nb_images} images of {size}x{size} in {elapsed:.3f} s: '
+      f'{nb_images / elapsed:.1f} images/s')
@@ -0,0 +1,147 @@
+/*
+This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+geometry kernel.
+
+Copyright (C) 2016-2018  Laughlin Research, LLC
+Copyright (C) 2019 Trevor Laughlin and the pyOCCT contributors
+
+This library is free software; you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation; either
+version 2.1 of the License, or (at your option) any later version.
+
+This library is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public
+License along with this library; if not, write to the Free Software
+Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+*/
+#ifndef __Message_PyProgressIndicator__
+#define __Message_PyProgressIndicator__
+
+#include <pyOCCT_Common.hxx>
+
+#include <atomic>
+#include <chrono>
+#include <memory>
+#include <string>
+#include <thread>
+
+#include <Message_ProgressIndicator.hxx>
+#include <Message_ProgressRange.hxx>
+#include <Message_ProgressScope.hxx>
+#include <TCollection_AsciiString.hxx>
+
+// Progress indicator calling a Python function with the progress position
+// and the name of the current step.
+//
+// The callback is only called from the thread which created the indicator,
+// at most once per interval, so that worker threads of parallel algorithms
+// never wait for the GIL. It can return False to cancel the algorithm.
+// Cancel and the time limit are checked by UserBreak from any thread.
+class Message_PyProgressIndicator : public Message_ProgressIndicator {
+    DEFINE_STANDARD_RTTI_INLINE(Message_PyProgressIndicator, Message_ProgressIndicator)
+public:
+    Message_PyProgressIndicator(const py::object &theCallback, const Standard_Real theInterval)
+        : myCallback(theCallback),
+          myInterval(std::chrono::duration_cast<Clock::duration>(std::chrono::duration<Standard_Real>(theInterval))),
+          myOwner(std::this_thread::get_id()),
+          myLastShow(Clock::now()),
+          myIsCancelled(false),
+          myHasDeadline(false) {}
+
+    ~Message_PyProgressIndicator() {
+        py::gil_scoped_acquire aGil;
+        myCallback = py::none();
+    }
+
+    // Cancels the running algorithm at its next check
+    void Cancel() { myIsCancelled = true; }
+
+    // Returns true if cancelled, by Cancel, the callback or the time limit
+    Standard_Boolean IsCancelled() const { return myIsCancelled; }
+
+    // Cancels the algorithms running after theSeconds from now, or never if
+    // theSeconds is negative
+    void SetTimeLimit(const Standard_Real theSeconds) {
+        myHasDeadline = theSeconds >= 0.0;
+        if (myHasDeadline)
+            myDeadline = Clock::now() + std::chrono::duration_cast<Clock::duration>(std::chrono::duration<Standard_Real>(theSeconds));
+    }
+
+    Standard_Boolean UserBreak() Standard_OVERRIDE {
+        if (!myIsCancelled && myHasDeadline && Clock::now() >= myDeadline)
+            myIsCancelled = true;
+        return myIsCancelled;
+    }
+
+    void Reset() Standard_OVERRIDE {
+        Message_ProgressIndicator::Reset();
+        myIsCancelled = false;
+    }
+
+protected:
+    void Show(const Message_ProgressScope &theScope, const Standard_Boolean isForce) Standard_OVERRIDE {
+        if (std::this_thread::get_id() != myOwner)
+            return;
+        const Clock::time_point aNow = Clock::now();
+        if (!isForce && aNow - myLastShow < myInterval)
+            return;
+        myLastShow = aNow;
+
+        py::gil_scoped_acquire aGil;
+        if (myCallback.is_none())
+            return;
+        try {
+            const Standard_CString aName = theScope.Name();
+            py::object aResult = myCallback(GetPosition(), aName != nullptr ? py::str(aName) : py::str(""));
+            if (!aResult.is_none() && !aResult.cast<bool>())
+                myIsCancelled = true;
+        } catch (py::error_already_set &theError) {
+            // the algorithm can't propagate the exception, stop it instead
+            theError.discard_as_unraisable("Message_PyProgressIndicator callback");
+            myIsCancelled = true;
+        }
+    }
+
+private:
+    typedef std::chrono::steady_clock Clock;
+
+    py::object myCallback;
+    Clock::duration myInterval;
+    std::thread::id myOwner;
+    Clock::time_point myLastShow;
+    std::atomic<bool> myIsCancelled;
+    std::atomic<bool> myHasDeadline;
+    Clock::time_point myDeadline;
+};
+
+inline void bind_Message_PyProgressIndicator(py::module &mod) {
+    py::class_<Message_PyProgressIndicator, opencascade::handle<Message_PyProgressIndicator>, Message_ProgressIndicator> cls(mod, "Message_PyProgressIndicator", "Progress indicator calling a Python function with the position (0 to 1) and the current step name, at most once per theInterval seconds and only from the creating thread. The function can return False to cancel the algorithm.");
+    cls.def(py::init<const py::object &, const Standard_Real>(), py::arg("theCallback") = py::none(), py::arg("theInterval") = 0.1);
+    cls.def("Start", [](Message_PyProgressIndicator &self) { return self.Start(); }, "Resets the indicator and returns the progress range to pass to an algorithm.");
+    cls.def("Cancel", &Message_PyProgressIndicator::Cancel, "Cancels the running algorithm at its next check. Thread safe.");
+    cls.def("IsCancelled", &Message_PyProgressIndicator::IsCancelled, "Returns true if the algorithm was cancelled, by Cancel, the callback or the time limit.");
+    cls.def("SetTimeLimit", &Message_PyProgressIndicator::SetTimeLimit, "Cancels the algorithms running after theSeconds from now, or never if theSeconds is negative.", py::arg("theSeconds"));
+    cls.def("Position", [](Message_PyProgressIndicator &self) { return self.GetPosition(); }, "Returns the total progress position, from 0 to 1.");
+}
+
+// Message_ProgressScope is excluded from the generated bindings as it is
+// meant to live on the stack. It is bound with a unique_ptr holder so that
+// Python can split a range into steps, it must then be closed explicitly
+// before its parent.
+inline void bind_Message_ProgressScope(py::module &mod) {
+    py::class_<Message_ProgressScope, std::unique_ptr<Message_ProgressScope>> cls(mod, "Message_ProgressScope", "Splits a progress range into steps, each one a range returned by Next. Close it once its steps are done, before its parent scope.");
+    cls.def(py::init([](const Message_ProgressRange &theRange, const std::string &theName, const Standard_Real theMax, const Standard_Boolean isInfinite) {
+        return new Message_ProgressScope(theRange, TCollection_AsciiString(theName.c_str()), theMax, isInfinite);
+    }), py::arg("theRange"), py::arg("theName") = "", py::arg("theMax") = 1.0, py::arg("isInfinite") = false);
+    cls.def("Next", &Message_ProgressScope::Next, "Returns the range of the next theStep steps.", py::arg("theStep") = 1.0);
+    cls.def("More", &Message_ProgressScope::More, "Returns false if the operation was cancelled.");
+    cls.def("Value", &Message_ProgressScope::Value, "Returns the current value of the scope.");
+    cls.def("Close", &Message_ProgressScope::Close, "Closes the scope, advancing its parent to the end of its range.");
+}
+
+#endif
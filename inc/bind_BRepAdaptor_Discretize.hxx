@@ -0,0 +1,160 @@
+/*
+This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+geometry kernel.
+
+Copyright (C) 2016-2018  Laughlin Research, LLC
+Copyright (C) 2019 Trevor Laughlin and the pyOCCT contributors
+
+This library is free software; you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation; either
+version 2.1 of the License, or (at your option) any later version.
+
+This library is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public
+License along with this library; if not, write to the Free Software
+Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+*/
+#ifndef __bind_BRepAdaptor_Discretize__
+#define __bind_BRepAdaptor_Discretize__
+
+#include <pyOCCT_Common.hxx>
+#include <pybind11/numpy.h>
+
+#include <algorithm>
+#include <string>
+#include <vector>
+
+#include <BRep_Tool.hxx>
+#include <BRepAdaptor_Curve.hxx>
+#include <BRepTools_WireExplorer.hxx>
+#include <GCPnts_QuasiUniformDeflection.hxx>
+#include <GCPnts_UniformAbscissa.hxx>
+#include <GCPnts_UniformDeflection.hxx>
+#include <OSD_Parallel.hxx>
+#include <Standard_Failure.hxx>
+#include <TopAbs_Orientation.hxx>
+#include <TopExp.hxx>
+#include <TopoDS.hxx>
+#include <TopoDS_Edge.hxx>
+#include <TopoDS_Shape.hxx>
+#include <TopTools_IndexedMapOfShape.hxx>
+#include <gp_XYZ.hxx>
+
+enum BRepAdaptor_DiscretizeAlgorithm {
+    BRepAdaptor_QuasiUniformDeflection,
+    BRepAdaptor_UniformAbscissa,
+    BRepAdaptor_UniformDeflection
+};
+
+inline BRepAdaptor_DiscretizeAlgorithm BRepAdaptor_DiscretizeAlgorithmFromName(const std::string &theName) {
+    if (theName == "QuasiUniformDeflection")
+        return BRepAdaptor_QuasiUniformDeflection;
+    if (theName == "UniformAbscissa")
+        return BRepAdaptor_UniformAbscissa;
+    if (theName == "UniformDeflection")
+        return BRepAdaptor_UniformDeflection;
+    throw py::value_error("Unknown algorithm " + theName);
+}
+
+// Points of one edge, in the direction of the edge orientation. Null edges,
+// edges without 3D curve and failed discretizations give no point.
+template <typename TheDiscretizer>
+void BRepAdaptor_DiscretizeWith(const BRepAdaptor_Curve &theCurve, const Standard_Real theValue, std::vector<gp_XYZ> &thePoints) {
+    TheDiscretizer aDiscretizer;
+    aDiscretizer.Initialize(theCurve, theValue, theCurve.FirstParameter(), theCurve.LastParameter());
+    if (!aDiscretizer.IsDone())
+        return;
+    thePoints.reserve(aDiscretizer.NbPoints());
+    for (Standard_Integer i = 1; i <= aDiscretizer.NbPoints(); ++i)
+        thePoints.push_back(theCurve.Value(aDiscretizer.Parameter(i)).XYZ());
+}
+
+inline void BRepAdaptor_DiscretizeEdge(const TopoDS_Edge &theEdge, const Standard_Real theValue, const BRepAdaptor_DiscretizeAlgorithm theAlgorithm, std::vector<gp_XYZ> &thePoints) {
+    if (theEdge.IsNull() || !BRep_Tool::IsGeometric(theEdge))
+        return;
+    try {
+        BRepAdaptor_Curve aCurve(theEdge);
+        switch (theAlgorithm) {
+            case BRepAdaptor_QuasiUniformDeflection:
+                BRepAdaptor_DiscretizeWith<GCPnts_QuasiUniformDeflection>(aCurve, theValue, thePoints);
+                break;
+            case BRepAdaptor_UniformAbscissa:
+                BRepAdaptor_DiscretizeWith<GCPnts_UniformAbscissa>(aCurve, theValue, thePoints);
+                break;
+            case BRepAdaptor_UniformDeflection:
+                BRepAdaptor_DiscretizeWith<GCPnts_UniformDeflection>(aCurve, theValue, thePoints);
+                break;
+        }
+    } catch (const Standard_Failure &) {
+        thePoints.clear();
+        return;
+    }
+    if (theEdge.Orientation() == TopAbs_REVERSED)
+        std::reverse(thePoints.begin(), thePoints.end());
+}
+
+// Discretizes the edges, optionally in parallel, and packs the points in
+// one (N, 3) array with the offsets of each edge
+inline py::tuple BRepAdaptor_Discretize(const std::vector<TopoDS_Edge> &theEdges, const Standard_Real theValue, const std::string &theAlgorithm, const Standard_Boolean theParallel) {
+    const BRepAdaptor_DiscretizeAlgorithm anAlgorithm = BRepAdaptor_DiscretizeAlgorithmFromName(theAlgorithm);
+    const Standard_Integer aNbEdges = static_cast<Standard_Integer>(theEdges.size());
+    std::vector<std::vector<gp_XYZ>> aPoints(aNbEdges);
+    {
+        py::gil_scoped_release aRelease;
+        OSD_Parallel::For(0, aNbEdges, [&](const Standard_Integer i) {
+            BRepAdaptor_DiscretizeEdge(theEdges[i], theValue, anAlgorithm, aPoints[i]);
+        }, !theParallel);
+    }
+
+    py::array_t<Standard_Integer> anOffsets(aNbEdges + 1);
+    Standard_Integer *anOffsetsPtr = anOffsets.mutable_data();
+    anOffsetsPtr[0] = 0;
+    for (Standard_Integer i = 0; i < aNbEdges; ++i)
+        anOffsetsPtr[i + 1] = anOffsetsPtr[i] + static_cast<Standard_Integer>(aPoints[i].size());
+
+    py::array_t<Standard_Real> anArray({static_cast<py::ssize_t>(anOffsetsPtr[aNbEdges]), py::ssize_t(3)});
+    Standard_Real *aData = anArray.mutable_data();
+    for (const std::vector<gp_XYZ> &anEdgePoints : aPoints) {
+        for (const gp_XYZ &aPnt : anEdgePoints) {
+            *aData++ = aPnt.X();
+            *aData++ = aPnt.Y();
+            *aData++ = aPnt.Z();
+        }
+    }
+
+    return py::make_tuple(anArray, anOffsets);
+}
+
+// Edges of a shape: in connection order for a wire, in the order of
+// TopExp::MapShapes otherwise
+inline std::vector<TopoDS_Edge> BRepAdaptor_DiscretizeEdges(const TopoDS_Shape &theShape) {
+    std::vector<TopoDS_Edge> anEdges;
+    if (theShape.ShapeType() == TopAbs_EDGE) {
+        anEdges.push_back(TopoDS::Edge(theShape));
+    } else if (theShape.ShapeType() == TopAbs_WIRE) {
+        for (BRepTools_WireExplorer anExp(TopoDS::Wire(theShape)); anExp.More(); anExp.Next())
+            anEdges.push_back(anExp.Current());
+    } else {
+        TopTools_IndexedMapOfShape aMap;
+        TopExp::MapShapes(theShape, TopAbs_EDGE, aMap);
+        for (Standard_Integer i = 1; i <= aMap.Extent(); ++i)
+            anEdges.push_back(TopoDS::Edge(aMap(i)));
+    }
+    return anEdges;
+}
+
+// Adds BRepAdaptor_Curve.Discretize_ to the BRepAdaptor_Curve binding
+template <typename TheClass>
+void bind_BRepAdaptor_Discretize(TheClass &cls) {
+    cls.def_static("Discretize_", &BRepAdaptor_Discretize, "Discretizes the edges with the GCPnts algorithm named theAlgorithm (QuasiUniformDeflection, UniformAbscissa or UniformDeflection) and returns the tuple (points, offsets) of NumPy arrays. The points of edge i are points[offsets[i]:offsets[i + 1]], following the edge orientation. Edges that cannot be discretized give no point. If theParallel is true the edges are processed in parallel.", py::arg("theEdges"), py::arg("theValue"), py::arg("theAlgorithm") = "QuasiUniformDeflection", py::arg("theParallel") = false);
+    cls.def_static("Discretize_", [](const TopoDS_Shape &theShape, const Standard_Real theValue, const std::string &theAlgorithm, const Standard_Boolean theParallel) {
+        return BRepAdaptor_Discretize(BRepAdaptor_DiscretizeEdges(theShape), theValue, theAlgorithm, theParallel);
+    }, "Discretizes the edges of theShape, in connection order for a wire and in the order of TopExp::MapShapes otherwise.", py::arg("theShape"), py::arg("theValue"), py::arg("theAlgorithm") = "QuasiUniformDeflection", py::arg("theParallel") = false);
+}
+
+#endif
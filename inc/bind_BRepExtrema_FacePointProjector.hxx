@@ -0,0 +1,364 @@
+/*
+This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+geometry kernel.
+
+Copyright (C) 2016-2018  Laughlin Research, LLC
+Copyright (C) 2019 Trevor Laughlin and the pyOCCT contributors
+
+This library is free software; you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation; either
+version 2.1 of the License, or (at your option) any later version.
+
+This library is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public
+License along with this library; if not, write to the Free Software
+Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+*/
+#ifndef __bind_BRepExtrema_FacePointProjector__
+#define __bind_BRepExtrema_FacePointProjector__
+
+#include <pyOCCT_Common.hxx>
+#include <pybind11/numpy.h>
+
+#include <algorithm>
+#include <cmath>
+#include <limits>
+#include <memory>
+#include <utility>
+#include <vector>
+
+#include <Bnd_Box.hxx>
+#include <BRep_Tool.hxx>
+#include <BRepAdaptor_Surface.hxx>
+#include <BRepBndLib.hxx>
+#include <BRepBuilderAPI_MakeVertex.hxx>
+#include <BRepExtrema_ExtPC.hxx>
+#include <BRepExtrema_ExtPF.hxx>
+#include <BVH_BoxSet.hxx>
+#include <Geom2d_Curve.hxx>
+#include <OSD_Parallel.hxx>
+#include <Standard_Failure.hxx>
+#include <TopExp.hxx>
+#include <TopExp_Explorer.hxx>
+#include <TopoDS.hxx>
+#include <TopoDS_Edge.hxx>
+#include <TopoDS_Face.hxx>
+#include <TopoDS_Shape.hxx>
+#include <TopoDS_Vertex.hxx>
+#include <TopTools_IndexedMapOfShape.hxx>
+#include <gp.hxx>
+#include <gp_Pnt.hxx>
+#include <gp_Pnt2d.hxx>
+#include <gp_Vec.hxx>
+
+// Projects points on the faces of a shape. A BVH of the face bounding boxes
+// is built once, then each point is projected on the candidate faces only:
+// inside the face with BRepExtrema_ExtPF and on its boundary with
+// BRepExtrema_ExtPC and the vertices. Faces are numbered from 0 in the order
+// of TopExp::MapShapes.
+class BRepExtrema_FacePointProjector {
+public:
+    typedef BVH_BoxSet<Standard_Real, 3, Standard_Integer> BoxSet;
+
+    BRepExtrema_FacePointProjector(const TopoDS_Shape &theShape) : myBoxSet(new BoxSet()) {
+        TopTools_IndexedMapOfShape aFaces, anEdges, aVertices;
+        TopExp::MapShapes(theShape, TopAbs_FACE, aFaces);
+        TopExp::MapShapes(theShape, TopAbs_EDGE, anEdges);
+        TopExp::MapShapes(theShape, TopAbs_VERTEX, aVertices);
+
+        for (Standard_Integer i = 1; i <= anEdges.Extent(); ++i)
+            myEdges.push_back(TopoDS::Edge(anEdges(i)));
+        for (Standard_Integer i = 1; i <= aVertices.Extent(); ++i)
+            myVertices.push_back(BRep_Tool::Pnt(TopoDS::Vertex(aVertices(i))));
+
+        myFaces.resize(aFaces.Extent());
+        for (Standard_Integer i = 1; i <= aFaces.Extent(); ++i) {
+            FaceData &aData = myFaces[i - 1];
+            aData.Face = TopoDS::Face(aFaces(i));
+            for (TopExp_Explorer anExp(aData.Face, TopAbs_EDGE); anExp.More(); anExp.Next()) {
+                const TopoDS_Edge &anEdge = TopoDS::Edge(anExp.Current());
+                if (BRep_Tool::Degenerated(anEdge))
+                    continue;
+                aData.Edges.push_back(std::make_pair(anEdges.FindIndex(anEdge) - 1, anEdge));
+            }
+            for (TopExp_Explorer anExp(aData.Face, TopAbs_VERTEX); anExp.More(); anExp.Next()) {
+                const Standard_Integer anIndex = aVertices.FindIndex(anExp.Current()) - 1;
+                if (std::find_if(aData.Vertices.begin(), aData.Vertices.end(), [&](const std::pair<Standard_Integer, TopoDS_Vertex> &theItem) { return theItem.first == anIndex; }) == aData.Vertices.end())
+                    aData.Vertices.push_back(std::make_pair(anIndex, TopoDS::Vertex(anExp.Current())));
+            }
+
+            Bnd_Box aBox;
+            BRepBndLib::Add(aData.Face, aBox);
+            if (aBox.IsVoid())
+                continue;
+            Standard_Real aXmin, aYmin, aZmin, aXmax, aYmax, aZmax;
+            aBox.Get(aXmin, aYmin, aZmin, aXmax, aYmax, aZmax);
+            myBoxSet->Add(i - 1, BVH_Box<Standard_Real, 3>(BVH_Vec3d(aXmin, aYmin, aZmin), BVH_Vec3d(aXmax, aYmax, aZmax)));
+        }
+        myBoxSet->Build();
+    }
+
+    // Number of faces
+    Standard_Integer NbFaces() const { return static_cast<Standard_Integer>(myFaces.size()); }
+
+    // Face of index theIndex (0 based)
+    const TopoDS_Face &Face(const Standard_Integer theIndex) const {
+        if (theIndex < 0 || theIndex >= NbFaces())
+            throw py::index_error();
+        return myFaces[theIndex].Face;
+    }
+
+    // Projects the (N, 3) array of points. Returns the tuple (face_index, uv,
+    // points, distances). Points farther than theMaxDistance from the shape
+    // get the face index -1 and NaN values.
+    py::tuple Perform(const py::array_t<Standard_Real, py::array::c_style | py::array::forcecast> &thePoints, const Standard_Real theMaxDistance, const Standard_Integer theNbThreads) const {
+        if (thePoints.ndim() != 2 || thePoints.shape(1) != 3)
+            throw py::value_error("expected an array of shape (N, 3)");
+        const py::ssize_t aNb = thePoints.shape(0);
+
+        py::array_t<Standard_Integer> anIndices(aNb);
+        py::array_t<Standard_Real> aUV({aNb, py::ssize_t(2)});
+        py::array_t<Standard_Real> aProj({aNb, py::ssize_t(3)});
+        py::array_t<Standard_Real> aDist(aNb);
+
+        Result aResult;
+        aResult.Points = thePoints.data();
+        aResult.Indices = anIndices.mutable_data();
+        aResult.UV = aUV.mutable_data();
+        aResult.Proj = aProj.mutable_data();
+        aResult.Dist = aDist.mutable_data();
+
+        const Standard_Integer aNbThreads = theNbThreads > 0 ? theNbThreads : OSD_Parallel::NbLogicalProcessors();
+        const Standard_Integer aNbChunks = static_cast<Standard_Integer>(std::max<py::ssize_t>(1, std::min<py::ssize_t>(aNbThreads, aNb / 16)));
+        {
+            py::gil_scoped_release aRelease;
+            OSD_Parallel::For(0, aNbChunks, [&](const Standard_Integer theChunk) {
+                Worker aWorker(*this);
+                for (py::ssize_t i = aNb * theChunk / aNbChunks; i < aNb * (theChunk + 1) / aNbChunks; ++i)
+                    aWorker.Project(i, theMaxDistance, aResult);
+            }, aNbChunks == 1);
+        }
+
+        return py::make_tuple(anIndices, aUV, aProj, aDist);
+    }
+
+private:
+    struct FaceData {
+        TopoDS_Face Face;
+        std::vector<std::pair<Standard_Integer, TopoDS_Edge>> Edges;
+        std::vector<std::pair<Standard_Integer, TopoDS_Vertex>> Vertices;
+    };
+
+    struct Result {
+        const Standard_Real *Points;
+        Standard_Integer *Indices;
+        Standard_Real *UV;
+        Standard_Real *Proj;
+        Standard_Real *Dist;
+    };
+
+    // Closest point on one face
+    struct Candidate {
+        Standard_Real SquareDistance = std::numeric_limits<Standard_Real>::infinity();
+        Standard_Integer Face = -1;
+        gp_Pnt Point;
+        Standard_Real U = std::numeric_limits<Standard_Real>::quiet_NaN();
+        Standard_Real V = std::numeric_limits<Standard_Real>::quiet_NaN();
+    };
+
+    // Per thread state, the extrema algorithms are initialized on first use
+    class Worker {
+    public:
+        Worker(const BRepExtrema_FacePointProjector &theProjector)
+            : myProjector(theProjector),
+              myExtPF(theProjector.myFaces.size()),
+              mySurfaces(theProjector.myFaces.size()),
+              myExtPC(theProjector.myEdges.size()) {}
+
+        void Project(const py::ssize_t theIndex, const Standard_Real theMaxDistance, const Result &theResult) {
+            const Standard_Real *aXYZ = theResult.Points + 3 * theIndex;
+            const gp_Pnt aPnt(aXYZ[0], aXYZ[1], aXYZ[2]);
+            const TopoDS_Vertex aVertex = BRepBuilderAPI_MakeVertex(aPnt);
+
+            Candidate aBest;
+            aBest.SquareDistance = theMaxDistance * theMaxDistance;
+            const opencascade::handle<BVH_Tree<Standard_Real, 3>> &aTree = myProjector.myBoxSet->BVH();
+            if (!aTree.IsNull() && aTree->Length() > 0) {
+                // Best first traversal pruned by the current best distance
+                std::vector<std::pair<Standard_Real, Standard_Integer>> aStack;
+                aStack.push_back(std::make_pair(BoxSquareDistance(aTree->MinPoint(0), aTree->MaxPoint(0), aPnt), 0));
+                while (!aStack.empty()) {
+                    const std::pair<Standard_Real, Standard_Integer> aNode = aStack.back();
+                    aStack.pop_back();
+                    if (aNode.first > aBest.SquareDistance)
+                        continue;
+                    if (aTree->IsOuter(aNode.second)) {
+                        for (Standard_Integer j = aTree->BegPrimitive(aNode.second); j <= aTree->EndPrimitive(aNode.second); ++j) {
+                            if (BoxSquareDistance(myProjector.myBoxSet->Box(j).CornerMin(), myProjector.myBoxSet->Box(j).CornerMax(), aPnt) <= aBest.SquareDistance)
+                                ProjectOnFace(myProjector.myBoxSet->Element(j), aPnt, aVertex, aBest);
+                        }
+                        continue;
+                    }
+                    const Standard_Integer aLeft = aTree->template Child<0>(aNode.second);
+                    const Standard_Integer aRight = aTree->template Child<1>(aNode.second);
+                    const Standard_Real aLeftDist = BoxSquareDistance(aTree->MinPoint(aLeft), aTree->MaxPoint(aLeft), aPnt);
+                    const Standard_Real aRightDist = BoxSquareDistance(aTree->MinPoint(aRight), aTree->MaxPoint(aRight), aPnt);
+                    // Push the farthest first so that the nearest is visited first
+                    if (aLeftDist < aRightDist) {
+                        aStack.push_back(std::make_pair(aRightDist, aRight));
+                        aStack.push_back(std::make_pair(aLeftDist, aLeft));
+                    } else {
+                        aStack.push_back(std::make_pair(aLeftDist, aLeft));
+                        aStack.push_back(std::make_pair(aRightDist, aRight));
+                    }
+                }
+            }
+
+            const Standard_Real aNaN = std::numeric_limits<Standard_Real>::quiet_NaN();
+            theResult.Indices[theIndex] = aBest.Face;
+            if (aBest.Face < 0) {
+                std::fill(theResult.UV + 2 * theIndex, theResult.UV + 2 * theIndex + 2, aNaN);
+                std::fill(theResult.Proj + 3 * theIndex, theResult.Proj + 3 * theIndex + 3, aNaN);
+                theResult.Dist[theIndex] = aNaN;
+                return;
+            }
+            theResult.UV[2 * theIndex] = aBest.U;
+            theResult.UV[2 * theIndex + 1] = aBest.V;
+            theResult.Proj[3 * theIndex] = aBest.Point.X();
+            theResult.Proj[3 * theIndex + 1] = aBest.Point.Y();
+            theResult.Proj[3 * theIndex + 2] = aBest.Point.Z();
+            theResult.Dist[theIndex] = Sign(aBest, aPnt) * std::sqrt(aBest.SquareDistance);
+        }
+
+    private:
+        static Standard_Real BoxSquareDistance(const BVH_Vec3d &theMin, const BVH_Vec3d &theMax, const gp_Pnt &thePnt) {
+            const Standard_Real aDx = std::max(0.0, std::max(theMin.x() - thePnt.X(), thePnt.X() - theMax.x()));
+            const Standard_Real aDy = std::max(0.0, std::max(theMin.y() - thePnt.Y(), thePnt.Y() - theMax.y()));
+            const Standard_Real aDz = std::max(0.0, std::max(theMin.z() - thePnt.Z(), thePnt.Z() - theMax.z()));
+            return aDx * aDx + aDy * aDy + aDz * aDz;
+        }
+
+        void ProjectOnFace(const Standard_Integer theFace, const gp_Pnt &thePnt, const TopoDS_Vertex &theVertex, Candidate &theBest) {
+            const FaceData &aData = myProjector.myFaces[theFace];
+            try {
+                // Interior of the face
+                std::unique_ptr<BRepExtrema_ExtPF> &anExtPF = myExtPF[theFace];
+                if (!anExtPF) {
+                    anExtPF.reset(new BRepExtrema_ExtPF());
+                    anExtPF->Initialize(aData.Face, Extrema_ExtFlag_MIN);
+                }
+                anExtPF->Perform(theVertex, aData.Face);
+                if (anExtPF->IsDone()) {
+                    for (Standard_Integer i = 1; i <= anExtPF->NbExt(); ++i) {
+                        if (anExtPF->SquareDistance(i) < theBest.SquareDistance) {
+                            theBest.SquareDistance = anExtPF->SquareDistance(i);
+                            theBest.Face = theFace;
+                            theBest.Point = anExtPF->Point(i);
+                            anExtPF->Parameter(i, theBest.U, theBest.V);
+                        }
+                    }
+                }
+
+                // Boundary of the face
+                for (const std::pair<Standard_Integer, TopoDS_Edge> &anEdge : aData.Edges) {
+                    std::unique_ptr<BRepExtrema_ExtPC> &anExtPC = myExtPC[anEdge.first];
+                    if (!anExtPC) {
+                        anExtPC.reset(new BRepExtrema_ExtPC());
+                        anExtPC->Initialize(myProjector.myEdges[anEdge.first]);
+                    }
+                    anExtPC->Perform(theVertex);
+                    if (!anExtPC->IsDone())
+                        continue;
+                    for (Standard_Integer i = 1; i <= anExtPC->NbExt(); ++i) {
+                        if (anExtPC->SquareDistance(i) < theBest.SquareDistance) {
+                            theBest.SquareDistance = anExtPC->SquareDistance(i);
+                            theBest.Face = theFace;
+                            theBest.Point = anExtPC->Point(i);
+                            EdgeUV(anEdge.second, aData.Face, anExtPC->Parameter(i), theBest);
+                        }
+                    }
+                }
+                for (const std::pair<Standard_Integer, TopoDS_Vertex> &aVertex : aData.Vertices) {
+                    const gp_Pnt &aPnt = myProjector.myVertices[aVertex.first];
+                    const Standard_Real aSqDist = aPnt.SquareDistance(thePnt);
+                    if (aSqDist < theBest.SquareDistance) {
+                        theBest.SquareDistance = aSqDist;
+                        theBest.Face = theFace;
+                        theBest.Point = aPnt;
+                        VertexUV(aVertex.second, aData.Face, theBest);
+                    }
+                }
+            } catch (const Standard_Failure &) {
+                // Skip the faces the extrema algorithms can't handle
+            }
+        }
+
+        static void EdgeUV(const TopoDS_Edge &theEdge, const TopoDS_Face &theFace, const Standard_Real theParam, Candidate &theBest) {
+            Standard_Real aFirst, aLast;
+            const opencascade::handle<Geom2d_Curve> aPCurve = BRep_Tool::CurveOnSurface(theEdge, theFace, aFirst, aLast);
+            if (aPCurve.IsNull()) {
+                theBest.U = theBest.V = std::numeric_limits<Standard_Real>::quiet_NaN();
+                return;
+            }
+            aPCurve->Value(theParam).Coord(theBest.U, theBest.V);
+        }
+
+        static void VertexUV(const TopoDS_Vertex &theVertex, const TopoDS_Face &theFace, Candidate &theBest) {
+            try {
+                BRep_Tool::Parameters(theVertex, theFace).Coord(theBest.U, theBest.V);
+            } catch (const Standard_Failure &) {
+                theBest.U = theBest.V = std::numeric_limits<Standard_Real>::quiet_NaN();
+            }
+        }
+
+        // Sign of the distance, positive on the side the face normal
+        // (accounting for the face orientation) points to
+        Standard_Real Sign(const Candidate &theBest, const gp_Pnt &thePnt) {
+            if (std::isnan(theBest.U) || std::isnan(theBest.V))
+                return 1.0;
+            try {
+                std::unique_ptr<BRepAdaptor_Surface> &aSurface = mySurfaces[theBest.Face];
+                const TopoDS_Face &aFace = myProjector.myFaces[theBest.Face].Face;
+                if (!aSurface)
+                    aSurface.reset(new BRepAdaptor_Surface(aFace, Standard_False));
+                gp_Pnt aPnt;
+                gp_Vec aD1U, aD1V;
+                aSurface->D1(theBest.U, theBest.V, aPnt, aD1U, aD1V);
+                gp_Vec aNormal = aD1U.Crossed(aD1V);
+                if (aNormal.Magnitude() <= gp::Resolution())
+                    return 1.0;
+                if (aFace.Orientation() == TopAbs_REVERSED)
+                    aNormal.Reverse();
+                return gp_Vec(theBest.Point, thePnt).Dot(aNormal) < 0.0 ? -1.0 : 1.0;
+            } catch (const Standard_Failure &) {
+                return 1.0;
+            }
+        }
+
+        const BRepExtrema_FacePointProjector &myProjector;
+        std::vector<std::unique_ptr<BRepExtrema_ExtPF>> myExtPF;
+        std::vector<std::unique_ptr<BRepAdaptor_Surface>> mySurfaces;
+        std::vector<std::unique_ptr<BRepExtrema_ExtPC>> myExtPC;
+    };
+
+    std::vector<FaceData> myFaces;
+    std::vector<TopoDS_Edge> myEdges;
+    std::vector<gp_Pnt> myVertices;
+    opencascade::handle<BoxSet> myBoxSet;
+};
+
+// Adds the BRepExtrema_FacePointProjector class to the BRepExtrema module
+inline void bind_BRepExtrema_FacePointProjector(py::module &mod) {
+    py::class_<BRepExtrema_FacePointProjector> cls(mod, "BRepExtrema_FacePointProjector", "Projects many points on the faces of a shape. A BVH of the face bounding boxes is built once by the constructor. Faces are numbered from 0 in the order of TopExp::MapShapes.");
+    cls.def(py::init<const TopoDS_Shape &>(), py::arg("theShape"), py::call_guard<py::gil_scoped_release>());
+    cls.def("NbFaces", &BRepExtrema_FacePointProjector::NbFaces, "Returns the number of faces.");
+    cls.def("Face", &BRepExtrema_FacePointProjector::Face, "Returns the face of index theIndex (0 based).", py::arg("theIndex"));
+    cls.def("Perform", &BRepExtrema_FacePointProjector::Perform, "Projects the (N, 3) array of points on the nearest face. Returns the tuple (face_index, uv, points, distances) of NumPy arrays. Distances are signed, positive on the side the face normal points to. Points farther than theMaxDistance from the shape get the face index -1 and NaN values. The work is split across theNbThreads threads with the GIL released, 0 uses all the logical processors.", py::arg("thePoints"), py::arg("theMaxDistance") = std::numeric_limits<Standard_Real>::infinity(), py::arg("theNbThreads") = 0);
+}
+
+#endif
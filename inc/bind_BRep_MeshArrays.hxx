@@ -0,0 +1,196 @@
+/*
+This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+geometry kernel.
+
+Copyright (C) 2016-2018  Laughlin Research, LLC
+Copyright (C) 2019 Trevor Laughlin and the pyOCCT contributors
+
+This library is free software; you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation; either
+version 2.1 of the License, or (at your option) any later version.
+
+This library is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public
+License along with this library; if not, write to the Free Software
+Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+*/
+#ifndef __bind_BRep_MeshArrays__
+#define __bind_BRep_MeshArrays__
+
+#include <pyOCCT_Common.hxx>
+#include <pybind11/numpy.h>
+
+#include <utility>
+#include <vector>
+
+#include <BRep_Tool.hxx>
+#include <Poly_Triangulation.hxx>
+#include <TopAbs_Orientation.hxx>
+#include <TopExp.hxx>
+#include <TopLoc_Location.hxx>
+#include <TopoDS.hxx>
+#include <TopoDS_Face.hxx>
+#include <TopoDS_Shape.hxx>
+#include <TopTools_IndexedMapOfShape.hxx>
+#include <gp.hxx>
+#include <gp_Trsf.hxx>
+#include <gp_Vec.hxx>
+
+// Triangulation of one face as found on the shape
+struct BRep_MeshArraysFace {
+    opencascade::handle<Poly_Triangulation> Triangulation;
+    gp_Trsf Transformation;
+    Standard_Boolean IsReversed;
+    Standard_Integer NodeOffset;
+    Standard_Integer TriangleOffset;
+};
+
+// Fills the vertex, normal and index buffers of one face. Nodes are moved
+// by the face location and triangles of reversed faces are flipped so that
+// they follow the face orientation. Missing normals are computed from the
+// triangles without modifying the (possibly shared) triangulation.
+template <typename TheRealType>
+void BRep_MeshArraysFill(const BRep_MeshArraysFace &theFace, TheRealType *theNodes, TheRealType *theNormals, Standard_Integer *theTriangles) {
+    const opencascade::handle<Poly_Triangulation> &aTri = theFace.Triangulation;
+    const Standard_Integer aNbNodes = aTri->NbNodes();
+    const Standard_Integer aNbTris = aTri->NbTriangles();
+
+    for (Standard_Integer i = 1; i <= aNbNodes; ++i) {
+        const gp_Pnt aPnt = aTri->Node(i).Transformed(theFace.Transformation);
+        TheRealType *aDst = theNodes + 3 * (theFace.NodeOffset + i - 1);
+        aDst[0] = static_cast<TheRealType>(aPnt.X());
+        aDst[1] = static_cast<TheRealType>(aPnt.Y());
+        aDst[2] = static_cast<TheRealType>(aPnt.Z());
+    }
+
+    for (Standard_Integer i = 1; i <= aNbTris; ++i) {
+        Standard_Integer n1, n2, n3;
+        aTri->Triangle(i).Get(n1, n2, n3);
+        if (theFace.IsReversed)
+            std::swap(n2, n3);
+        Standard_Integer *aDst = theTriangles + 3 * (theFace.TriangleOffset + i - 1);
+        aDst[0] = theFace.NodeOffset + n1 - 1;
+        aDst[1] = theFace.NodeOffset + n2 - 1;
+        aDst[2] = theFace.NodeOffset + n3 - 1;
+    }
+
+    if (theNormals == nullptr)
+        return;
+
+    std::vector<gp_XYZ> aNormals(aNbNodes, gp_XYZ(0., 0., 0.));
+    if (aTri->HasNormals()) {
+        for (Standard_Integer i = 1; i <= aNbNodes; ++i) {
+            gp_Vec aNormal(aTri->Normal(i));
+            aNormal.Transform(theFace.Transformation);
+            aNormals[i - 1] = theFace.IsReversed ? aNormal.Reversed().XYZ() : aNormal.XYZ();
+        }
+    } else {
+        // Area weighted average of the (already transformed and oriented) triangles
+        for (Standard_Integer i = 0; i < aNbTris; ++i) {
+            const Standard_Integer *anIdx = theTriangles + 3 * (theFace.TriangleOffset + i);
+            const Standard_Integer i1 = anIdx[0] - theFace.NodeOffset;
+            const Standard_Integer i2 = anIdx[1] - theFace.NodeOffset;
+            const Standard_Integer i3 = anIdx[2] - theFace.NodeOffset;
+            const TheRealType *p1 = theNodes + 3 * anIdx[0];
+            const TheRealType *p2 = theNodes + 3 * anIdx[1];
+            const TheRealType *p3 = theNodes + 3 * anIdx[2];
+            const gp_XYZ aD1(p2[0] - p1[0], p2[1] - p1[1], p2[2] - p1[2]);
+            const gp_XYZ aD2(p3[0] - p1[0], p3[1] - p1[1], p3[2] - p1[2]);
+            const gp_XYZ aCross = aD1.Crossed(aD2);
+            aNormals[i1] += aCross;
+            aNormals[i2] += aCross;
+            aNormals[i3] += aCross;
+        }
+    }
+
+    for (Standard_Integer i = 0; i < aNbNodes; ++i) {
+        gp_XYZ &aNormal = aNormals[i];
+        const Standard_Real aMod = aNormal.Modulus();
+        if (aMod > gp::Resolution())
+            aNormal.Divide(aMod);
+        TheRealType *aDst = theNormals + 3 * (theFace.NodeOffset + i);
+        aDst[0] = static_cast<TheRealType>(aNormal.X());
+        aDst[1] = static_cast<TheRealType>(aNormal.Y());
+        aDst[2] = static_cast<TheRealType>(aNormal.Z());
+    }
+}
+
+// Collects the triangulations of all the faces of theShape. Faces are
+// enumerated in the order of TopExp::MapShapes so face i of the result is
+// the face at index i + 1 of the map. Faces without triangulation keep an
+// empty range in the offsets.
+template <typename TheRealType>
+py::tuple BRep_MeshArrays(const TopoDS_Shape &theShape, const Standard_Boolean theWithNormals) {
+    TopTools_IndexedMapOfShape aFaceMap;
+    std::vector<BRep_MeshArraysFace> aFaces;
+    Standard_Integer aNbNodes = 0, aNbTris = 0;
+    {
+        py::gil_scoped_release aRelease;
+        TopExp::MapShapes(theShape, TopAbs_FACE, aFaceMap);
+        aFaces.reserve(aFaceMap.Extent());
+        for (Standard_Integer i = 1; i <= aFaceMap.Extent(); ++i) {
+            const TopoDS_Face &aFace = TopoDS::Face(aFaceMap(i));
+            TopLoc_Location aLoc;
+            BRep_MeshArraysFace aData;
+            aData.Triangulation = BRep_Tool::Triangulation(aFace, aLoc);
+            aData.Transformation = aLoc.Transformation();
+            aData.IsReversed = aFace.Orientation() == TopAbs_REVERSED;
+            aData.NodeOffset = aNbNodes;
+            aData.TriangleOffset = aNbTris;
+            if (!aData.Triangulation.IsNull()) {
+                aNbNodes += aData.Triangulation->NbNodes();
+                aNbTris += aData.Triangulation->NbTriangles();
+            }
+            aFaces.push_back(aData);
+        }
+    }
+
+    const py::ssize_t aNbFaces = static_cast<py::ssize_t>(aFaces.size());
+    py::array_t<TheRealType> aNodes({static_cast<py::ssize_t>(aNbNodes), py::ssize_t(3)});
+    py::array_t<Standard_Integer> aTriangles({static_cast<py::ssize_t>(aNbTris), py::ssize_t(3)});
+    py::array_t<Standard_Integer> aNodeOffsets(aNbFaces + 1);
+    py::array_t<Standard_Integer> aTriangleOffsets(aNbFaces + 1);
+    py::object aNormalsObj = py::none();
+    TheRealType *aNormalsPtr = nullptr;
+    if (theWithNormals) {
+        py::array_t<TheRealType> aNormals({static_cast<py::ssize_t>(aNbNodes), py::ssize_t(3)});
+        aNormalsPtr = aNormals.mutable_data();
+        aNormalsObj = aNormals;
+    }
+
+    TheRealType *aNodesPtr = aNodes.mutable_data();
+    Standard_Integer *aTrianglesPtr = aTriangles.mutable_data();
+    Standard_Integer *aNodeOffsetsPtr = aNodeOffsets.mutable_data();
+    Standard_Integer *aTriangleOffsetsPtr = aTriangleOffsets.mutable_data();
+    {
+        py::gil_scoped_release aRelease;
+        for (py::ssize_t i = 0; i < aNbFaces; ++i) {
+            const BRep_MeshArraysFace &aFace = aFaces[i];
+            aNodeOffsetsPtr[i] = aFace.NodeOffset;
+            aTriangleOffsetsPtr[i] = aFace.TriangleOffset;
+            if (!aFace.Triangulation.IsNull())
+                BRep_MeshArraysFill<TheRealType>(aFace, aNodesPtr, aNormalsPtr, aTrianglesPtr);
+        }
+        aNodeOffsetsPtr[aNbFaces] = aNbNodes;
+        aTriangleOffsetsPtr[aNbFaces] = aNbTris;
+    }
+
+    return py::make_tuple(aNodes, aNormalsObj, aTriangles, aNodeOffsets, aTriangleOffsets);
+}
+
+// Adds BRep_Tool.MeshArrays_ to the BRep_Tool binding
+template <typename TheClass>
+void bind_BRep_MeshArrays(TheClass &cls) {
+    cls.def_static("MeshArrays_", [](const TopoDS_Shape &theShape, const Standard_Boolean theDoublePrecision, const Standard_Boolean theWithNormals) {
+        if (theDoublePrecision)
+            return BRep_MeshArrays<Standard_Real>(theShape, theWithNormals);
+        return BRep_MeshArrays<Standard_ShortReal>(theShape, theWithNormals);
+    }, "Returns the triangulations of all the faces of the shape as the tuple (nodes, normals, triangles, node_offsets, triangle_offsets) of NumPy arrays. Face locations are applied, triangles of reversed faces are flipped and node indices are zero based and global. The offsets give the range of nodes and triangles of each face, in the order of TopExp::MapShapes. normals is None unless theWithNormals is true.", py::arg("theShape"), py::arg("theDoublePrecision") = false, py::arg("theWithNormals") = true);
+}
+
+#endif
@@ -0,0 +1,182 @@
+/*
+This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+geometry kernel.
+
+Copyright (C) 2016-2018  Laughlin Research, LLC
+Copyright (C) 2019 Trevor Laughlin and the pyOCCT contributors
+
+This library is free software; you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation; either
+version 2.1 of the License, or (at your option) any later version.
+
+This library is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public
+License along with this library; if not, write to the Free Software
+Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+*/
+#ifndef __bind_BinTools_Bytes__
+#define __bind_BinTools_Bytes__
+
+#include <pyOCCT_Common.hxx>
+
+#include <istream>
+#include <sstream>
+#include <streambuf>
+#include <string>
+
+#include <BinTools.hxx>
+#include <BinTools_Curve2dSet.hxx>
+#include <BinTools_CurveSet.hxx>
+#include <BinTools_OStream.hxx>
+#include <BinTools_SurfaceSet.hxx>
+#include <Geom_Curve.hxx>
+#include <Geom_Surface.hxx>
+#include <Geom2d_Curve.hxx>
+#include <Standard_Failure.hxx>
+#include <TopAbs_ShapeEnum.hxx>
+#include <TopoDS_Shape.hxx>
+
+// Whether the pickled shapes hold the triangulations of their faces
+inline Standard_Boolean &BinTools_PickleTriangles() {
+    static Standard_Boolean aWithTriangles = Standard_False;
+    return aWithTriangles;
+}
+
+// Writes a shape, and the subshapes it shares, to binary BRep bytes
+inline py::bytes BinTools_ShapeToBytes(const TopoDS_Shape &theShape, const Standard_Boolean theWithTriangles, const Standard_Boolean theWithNormals) {
+    std::string aData;
+    {
+        py::gil_scoped_release aRelease;
+        std::ostringstream aStream(std::ios::out | std::ios::binary);
+        BinTools::Write(theShape, aStream, theWithTriangles, theWithNormals, BinTools_FormatVersion_CURRENT);
+        aData = aStream.str();
+    }
+    return py::bytes(aData);
+}
+
+// Read only, seekable stream buffer over the memory of a Python buffer, so
+// that bytes and memory mapped files are read without a copy
+class BinTools_BufferStreamBuf : public std::streambuf {
+public:
+    BinTools_BufferStreamBuf(const char *theData, const std::size_t theSize) {
+        char *aData = const_cast<char *>(theData);
+        setg(aData, aData, aData + theSize);
+    }
+
+protected:
+    pos_type seekoff(off_type theOff, std::ios_base::seekdir theDir, std::ios_base::openmode) override {
+        char *aPos = egptr() + theOff;
+        if (theDir == std::ios_base::beg)
+            aPos = eback() + theOff;
+        else if (theDir == std::ios_base::cur)
+            aPos = gptr() + theOff;
+        if (aPos < eback() || aPos > egptr())
+            return pos_type(off_type(-1));
+        setg(eback(), aPos, egptr());
+        return pos_type(aPos - eback());
+    }
+
+    pos_type seekpos(pos_type thePos, std::ios_base::openmode theMode) override {
+        return seekoff(off_type(thePos), std::ios_base::beg, theMode);
+    }
+};
+
+// Reads a shape from binary BRep data held by any contiguous buffer (bytes,
+// bytearray, memoryview, mmap...)
+inline TopoDS_Shape BinTools_ShapeFromBytes(const py::buffer &theData) {
+    py::buffer_info anInfo = theData.request();
+    if (anInfo.ndim != 1 || anInfo.strides[0] != anInfo.itemsize)
+        throw py::value_error("expected a contiguous buffer");
+    TopoDS_Shape aShape;
+    {
+        py::gil_scoped_release aRelease;
+        BinTools_BufferStreamBuf aBuffer(static_cast<const char *>(anInfo.ptr), static_cast<std::size_t>(anInfo.size * anInfo.itemsize));
+        std::istream aStream(&aBuffer);
+        BinTools::Read(aShape, aStream);
+    }
+    return aShape;
+}
+
+// Geometry readers and writers of BinTools, by handle type
+template <typename TheGeom>
+struct BinTools_GeomIO;
+
+template <>
+struct BinTools_GeomIO<Geom_Curve> {
+    static void Write(const opencascade::handle<Geom_Curve> &theGeom, BinTools_OStream &theStream) { BinTools_CurveSet::WriteCurve(theGeom, theStream); }
+    static void Read(Standard_IStream &theStream, opencascade::handle<Geom_Curve> &theGeom) { BinTools_CurveSet::ReadCurve(theStream, theGeom); }
+};
+
+template <>
+struct BinTools_GeomIO<Geom_Surface> {
+    static void Write(const opencascade::handle<Geom_Surface> &theGeom, BinTools_OStream &theStream) { BinTools_SurfaceSet::WriteSurface(theGeom, theStream); }
+    static void Read(Standard_IStream &theStream, opencascade::handle<Geom_Surface> &theGeom) { BinTools_SurfaceSet::ReadSurface(theStream, theGeom); }
+};
+
+template <>
+struct BinTools_GeomIO<Geom2d_Curve> {
+    static void Write(const opencascade::handle<Geom2d_Curve> &theGeom, BinTools_OStream &theStream) { BinTools_Curve2dSet::WriteCurve2d(theGeom, theStream); }
+    static void Read(Standard_IStream &theStream, opencascade::handle<Geom2d_Curve> &theGeom) { BinTools_Curve2dSet::ReadCurve2d(theStream, theGeom); }
+};
+
+// Adds BinTools.ToBytes_, BinTools.FromBytes_ and the pickle options to the
+// BinTools binding
+template <typename TheClass>
+void bind_BinTools_Bytes(TheClass &cls) {
+    cls.def_static("ToBytes_", &BinTools_ShapeToBytes, "Writes the shape to binary BRep bytes. Subshapes shared in the shape are written once and stay shared when read back.", py::arg("theShape"), py::arg("theWithTriangles") = false, py::arg("theWithNormals") = false);
+    cls.def_static("FromBytes_", &BinTools_ShapeFromBytes, "Reads a shape from binary BRep data held by bytes or any other contiguous buffer, such as a memory mapped file.", py::arg("theData"));
+    cls.def_static("SetPickleTriangles_", [](const Standard_Boolean theWithTriangles) { BinTools_PickleTriangles() = theWithTriangles; }, "Sets whether pickled shapes hold the triangulations of their faces, False by default.", py::arg("theWithTriangles"));
+    cls.def_static("PickleTriangles_", []() { return BinTools_PickleTriangles(); }, "Returns whether pickled shapes hold the triangulations of their faces.");
+}
+
+// Pickles a TopoDS_Shape, or one of its subclasses of type theType, as
+// binary BRep bytes
+template <typename TheShape, typename TheClass>
+void bind_TopoDS_Pickle(TheClass &cls, const TopAbs_ShapeEnum theType) {
+    cls.def(py::pickle(
+        [](const TheShape &theShape) {
+            const Standard_Boolean aWithTriangles = BinTools_PickleTriangles();
+            return py::make_tuple(BinTools_ShapeToBytes(theShape, aWithTriangles, aWithTriangles));
+        },
+        [theType](const py::tuple &theState) {
+            if (theState.size() != 1)
+                throw py::value_error("invalid pickled shape");
+            const TopoDS_Shape aShape = BinTools_ShapeFromBytes(theState[0].cast<py::buffer>());
+            if (theType != TopAbs_SHAPE && !aShape.IsNull() && aShape.ShapeType() != theType)
+                throw py::value_error("pickled shape of unexpected type");
+            TheShape aResult;
+            static_cast<TopoDS_Shape &>(aResult) = aShape;
+            return aResult;
+        }));
+}
+
+// Pickles a Geom_Curve, Geom_Surface or Geom2d_Curve subclass TheGeom as
+// the bytes of BinTools_CurveSet, BinTools_SurfaceSet or BinTools_Curve2dSet
+template <typename TheGeom, typename TheBase, typename TheClass>
+void bind_Geom_Pickle(TheClass &cls) {
+    cls.def(py::pickle(
+        [](const opencascade::handle<TheGeom> &theGeom) {
+            std::ostringstream aStream(std::ios::out | std::ios::binary);
+            BinTools_OStream aBinStream(aStream);
+            BinTools_GeomIO<TheBase>::Write(theGeom, aBinStream);
+            return py::make_tuple(py::bytes(aStream.str()));
+        },
+        [](const py::tuple &theState) {
+            if (theState.size() != 1)
+                throw py::value_error("invalid pickled geometry");
+            std::istringstream aStream(std::string(theState[0].cast<py::bytes>()), std::ios::in | std::ios::binary);
+            opencascade::handle<TheBase> aBase;
+            BinTools_GeomIO<TheBase>::Read(aStream, aBase);
+            opencascade::handle<TheGeom> aGeom = opencascade::handle<TheGeom>::DownCast(aBase);
+            if (aGeom.IsNull())
+                throw py::value_error("pickled geometry of unexpected type");
+            return aGeom;
+        }));
+}
+
+#endif
@@ -23,6 +23,7 @@ Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
 #define __Define_HArray1__
 
 #include <pyOCCT_Common.hxx>
+#include <bind_NCollection_Array_NumPy.hxx>
 
 #include <Standard_Transient.hxx>
 #include <Standard_Type.hxx>
@@ -75,6 +76,9 @@ cls.def("SetValue", (void (TheHArray1Type::*)(const Standard_Integer, const type
 cls.def("Resize", (void (TheHArray1Type::*)(const Standard_Integer, const Standard_Integer, const Standard_Boolean)) &TheHArray1Type::Resize, "Resizes the array to specified bounds. No re-allocation will be done if length of array does not change, but existing values will not be discarded if theToCopyData set to FALSE.", py::arg("theLower"), py::arg("theUpper"), py::arg("theToCopyData"));
 cls.def("__iter__", [](const TheArray1Type &self) { return py::make_iterator(self.begin(), self.end()); }, py::keep_alive<0, 1>());
 
+// NumPy support for arrays of coordinates and numbers
+bind_Define_HArray1_NumPy<TheHArray1Type, TheArray1Type>(cls);
+
 }
 
 #endif
@@ -23,6 +23,7 @@ Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
 #define __Define_HArray2__
 
 #include <pyOCCT_Common.hxx>
+#include <bind_NCollection_Array_NumPy.hxx>
 
 #include <Standard_Transient.hxx>
 #include <Standard_Type.hxx>
@@ -71,6 +72,9 @@ cls.def("__call__", (typename TheArray2Type::value_type & (TheHArray2Type::*)(co
 cls.def("SetValue", (void (TheHArray2Type::*)(const Standard_Integer, const Standard_Integer, const typename TheArray2Type::value_type &)) &TheHArray2Type::SetValue, "SetValue", py::arg("theRow"), py::arg("theCol"), py::arg("theItem"));
 cls.def("Resize", (void (TheHArray2Type::*)(Standard_Integer, Standard_Integer, Standard_Integer, Standard_Integer, Standard_Boolean)) &TheHArray2Type::Resize, "Resizes the array to specified bounds. No re-allocation will be done if length of array does not change, but existing values will not be discarded if theToCopyData set to FALSE.", py::arg("theRowLower"), py::arg("theRowUpper"), py::arg("theColLower"), py::arg("theColUpper"), py::arg("theToCopyData"));
 
+// NumPy support for arrays of coordinates and numbers
+bind_Define_HArray2_NumPy<TheHArray2Type, TheArray2Type>(cls);
+
 
 }
 
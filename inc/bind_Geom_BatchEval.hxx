@@ -0,0 +1,323 @@
+/*
+This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+geometry kernel.
+
+Copyright (C) 2016-2018  Laughlin Research, LLC
+Copyright (C) 2019 Trevor Laughlin and the pyOCCT contributors
+
+This library is free software; you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation; either
+version 2.1 of the License, or (at your option) any later version.
+
+This library is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public
+License along with this library; if not, write to the Free Software
+Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+*/
+#ifndef __bind_Geom_BatchEval__
+#define __bind_Geom_BatchEval__
+
+#include <pyOCCT_Common.hxx>
+#include <pybind11/numpy.h>
+
+#include <algorithm>
+#include <limits>
+
+#include <Adaptor2d_Curve2d.hxx>
+#include <Adaptor3d_Curve.hxx>
+#include <Adaptor3d_Surface.hxx>
+#include <Geom_Curve.hxx>
+#include <Geom_OffsetCurve.hxx>
+#include <Geom_OffsetSurface.hxx>
+#include <Geom_RectangularTrimmedSurface.hxx>
+#include <Geom_Surface.hxx>
+#include <Geom_SweptSurface.hxx>
+#include <Geom_TrimmedCurve.hxx>
+#include <Geom2d_Curve.hxx>
+#include <Geom2d_OffsetCurve.hxx>
+#include <Geom2d_TrimmedCurve.hxx>
+#include <OSD_Parallel.hxx>
+#include <Standard_Failure.hxx>
+#include <gp.hxx>
+#include <gp_Pnt.hxx>
+#include <gp_Pnt2d.hxx>
+#include <gp_Vec.hxx>
+#include <gp_Vec2d.hxx>
+
+using Geom_BatchParams = py::array_t<Standard_Real, py::array::c_style | py::array::forcecast>;
+
+// Point and vector types of the curves
+template <typename TheCurve>
+struct Geom_BatchCurveTraits {
+    typedef gp_Pnt Pnt;
+    typedef gp_Vec Vec;
+    static const int Dim = 3;
+};
+
+template <>
+struct Geom_BatchCurveTraits<Geom2d_Curve> {
+    typedef gp_Pnt2d Pnt;
+    typedef gp_Vec2d Vec;
+    static const int Dim = 2;
+};
+
+template <>
+struct Geom_BatchCurveTraits<Adaptor2d_Curve2d> {
+    typedef gp_Pnt2d Pnt;
+    typedef gp_Vec2d Vec;
+    static const int Dim = 2;
+};
+
+inline void Geom_BatchStore(const gp_XYZ &theXYZ, Standard_Real *theDst) {
+    theDst[0] = theXYZ.X();
+    theDst[1] = theXYZ.Y();
+    theDst[2] = theXYZ.Z();
+}
+
+inline void Geom_BatchStore(const gp_Pnt &thePnt, Standard_Real *theDst) {
+    Geom_BatchStore(thePnt.XYZ(), theDst);
+}
+
+inline void Geom_BatchStore(const gp_Vec &theVec, Standard_Real *theDst) {
+    Geom_BatchStore(theVec.XYZ(), theDst);
+}
+
+inline void Geom_BatchStore(const gp_Pnt2d &thePnt, Standard_Real *theDst) {
+    theDst[0] = thePnt.X();
+    theDst[1] = thePnt.Y();
+}
+
+inline void Geom_BatchStore(const gp_Vec2d &theVec, Standard_Real *theDst) {
+    theDst[0] = theVec.X();
+    theDst[1] = theVec.Y();
+}
+
+// Whether the evaluation of a Geom object updates data shared by the
+// threads. The evaluators of offset curves and surfaces and of extrusion and
+// revolution surfaces evaluate their basis through an adaptor, which
+// rebuilds its B-spline cache on the fly.
+inline Standard_Boolean Geom_BatchHasCache(const Geom_Curve &theCurve) {
+    if (theCurve.IsKind(STANDARD_TYPE(Geom_TrimmedCurve)))
+        return Geom_BatchHasCache(*static_cast<const Geom_TrimmedCurve &>(theCurve).BasisCurve());
+    return theCurve.IsKind(STANDARD_TYPE(Geom_OffsetCurve));
+}
+
+inline Standard_Boolean Geom_BatchHasCache(const Geom2d_Curve &theCurve) {
+    if (theCurve.IsKind(STANDARD_TYPE(Geom2d_TrimmedCurve)))
+        return Geom_BatchHasCache(*static_cast<const Geom2d_TrimmedCurve &>(theCurve).BasisCurve());
+    return theCurve.IsKind(STANDARD_TYPE(Geom2d_OffsetCurve));
+}
+
+inline Standard_Boolean Geom_BatchHasCache(const Geom_Surface &theSurface) {
+    if (theSurface.IsKind(STANDARD_TYPE(Geom_RectangularTrimmedSurface)))
+        return Geom_BatchHasCache(*static_cast<const Geom_RectangularTrimmedSurface &>(theSurface).BasisSurface());
+    return theSurface.IsKind(STANDARD_TYPE(Geom_OffsetSurface)) || theSurface.IsKind(STANDARD_TYPE(Geom_SweptSurface));
+}
+
+// Object used by one thread. Geom objects are evaluated concurrently as is,
+// unless they cache data during evaluation, adaptors always do. Each thread
+// then works on its own copy.
+template <typename T>
+struct Geom_BatchLocal {
+    static Standard_Boolean NeedsCopy(const T &theObj) { return Geom_BatchHasCache(theObj); }
+    static Standard_Boolean CanCopy(const T &) { return Standard_True; }
+    static opencascade::handle<T> Copy(const T &theObj) { return opencascade::handle<T>::DownCast(theObj.Copy()); }
+};
+
+template <typename T>
+struct Geom_BatchAdaptorLocal {
+    static Standard_Boolean NeedsCopy(const T &) { return Standard_True; }
+    static Standard_Boolean CanCopy(const T &theObj) {
+        try {
+            return !theObj.ShallowCopy().IsNull();
+        } catch (const Standard_Failure &) {
+            return Standard_False;
+        }
+    }
+    static opencascade::handle<T> Copy(const T &theObj) { return theObj.ShallowCopy(); }
+};
+
+template <>
+struct Geom_BatchLocal<Adaptor3d_Curve> : Geom_BatchAdaptorLocal<Adaptor3d_Curve> {};
+
+template <>
+struct Geom_BatchLocal<Adaptor3d_Surface> : Geom_BatchAdaptorLocal<Adaptor3d_Surface> {};
+
+template <>
+struct Geom_BatchLocal<Adaptor2d_Curve2d> : Geom_BatchAdaptorLocal<Adaptor2d_Curve2d> {};
+
+// Number of chunks the evaluation of theNb values is split in.
+// theNbThreads <= 0 uses all the logical processors.
+inline Standard_Integer Geom_BatchNbChunks(const py::ssize_t theNb, const Standard_Integer theNbThreads) {
+    const Standard_Integer aNbThreads = theNbThreads > 0 ? theNbThreads : OSD_Parallel::NbLogicalProcessors();
+    // Not worth a thread for less than a few hundred evaluations
+    const py::ssize_t aMax = std::max<py::ssize_t>(1, theNb / 256);
+    return static_cast<Standard_Integer>(std::max<py::ssize_t>(1, std::min<py::ssize_t>(aNbThreads, aMax)));
+}
+
+// Calls theFunctor(theLocal, begin, end) on chunks of [0, theNb) with the
+// GIL released
+template <typename T, typename TheFunctor>
+void Geom_BatchFor(const T &theObj, const py::ssize_t theNb, const Standard_Integer theNbThreads, const TheFunctor &theFunctor) {
+    Standard_Integer aNbChunks = Geom_BatchNbChunks(theNb, theNbThreads);
+    const Standard_Boolean aToCopy = aNbChunks > 1 && Geom_BatchLocal<T>::NeedsCopy(theObj);
+    if (aToCopy && !Geom_BatchLocal<T>::CanCopy(theObj))
+        aNbChunks = 1;
+
+    py::gil_scoped_release aRelease;
+    if (aNbChunks == 1) {
+        theFunctor(&theObj, py::ssize_t(0), theNb);
+        return;
+    }
+    OSD_Parallel::For(0, aNbChunks, [&](const Standard_Integer theChunk) {
+        const py::ssize_t aBegin = theNb * theChunk / aNbChunks;
+        const py::ssize_t anEnd = theNb * (theChunk + 1) / aNbChunks;
+        if (aToCopy)
+            theFunctor(Geom_BatchLocal<T>::Copy(theObj), aBegin, anEnd);
+        else
+            theFunctor(&theObj, aBegin, anEnd);
+    });
+}
+
+inline py::array_t<Standard_Real> Geom_BatchArray(const py::ssize_t theNb, const int theDim) {
+    return py::array_t<Standard_Real>({theNb, static_cast<py::ssize_t>(theDim)});
+}
+
+// Evaluates the point and the derivatives up to TheOrder of a curve at the
+// parameters theU. Failed evaluations give NaN.
+template <typename TheCurve, int TheOrder>
+py::object Geom_BatchCurveEval(const TheCurve &theCurve, const Geom_BatchParams &theU, const Standard_Integer theNbThreads) {
+    typedef Geom_BatchCurveTraits<TheCurve> Traits;
+    const int aDim = Traits::Dim;
+    const py::ssize_t aNb = theU.size();
+    const Standard_Real *aU = theU.data();
+
+    py::array_t<Standard_Real> anArrays[3];
+    Standard_Real *aData[3] = {nullptr, nullptr, nullptr};
+    for (int k = 0; k <= TheOrder; ++k) {
+        anArrays[k] = Geom_BatchArray(aNb, aDim);
+        aData[k] = anArrays[k].mutable_data();
+    }
+
+    Geom_BatchFor(theCurve, aNb, theNbThreads, [&](const auto &theLocal, const py::ssize_t theBegin, const py::ssize_t theEnd) {
+        typename Traits::Pnt aPnt;
+        typename Traits::Vec aV1, aV2;
+        for (py::ssize_t i = theBegin; i < theEnd; ++i) {
+            try {
+                if (TheOrder == 0) {
+                    theLocal->D0(aU[i], aPnt);
+                } else if (TheOrder == 1) {
+                    theLocal->D1(aU[i], aPnt, aV1);
+                } else {
+                    theLocal->D2(aU[i], aPnt, aV1, aV2);
+                }
+                Geom_BatchStore(aPnt, aData[0] + aDim * i);
+                if (TheOrder > 0)
+                    Geom_BatchStore(aV1, aData[1] + aDim * i);
+                if (TheOrder > 1)
+                    Geom_BatchStore(aV2, aData[2] + aDim * i);
+            } catch (const Standard_Failure &) {
+                for (int k = 0; k <= TheOrder; ++k)
+                    std::fill(aData[k] + aDim * i, aData[k] + aDim * (i + 1), std::numeric_limits<Standard_Real>::quiet_NaN());
+            }
+        }
+    });
+
+    if (TheOrder == 0)
+        return anArrays[0];
+    if (TheOrder == 1)
+        return py::make_tuple(anArrays[0], anArrays[1]);
+    return py::make_tuple(anArrays[0], anArrays[1], anArrays[2]);
+}
+
+// Evaluates a surface at the (u, v) parameters theUV. TheOrder is the
+// derivation order, -1 computes the unit normals. Failed evaluations and
+// undefined normals give NaN.
+template <typename TheSurface, int TheOrder>
+py::object Geom_BatchSurfaceEval(const TheSurface &theSurface, const Geom_BatchParams &theUV, const Standard_Integer theNbThreads) {
+    if (theUV.ndim() != 2 || theUV.shape(1) != 2)
+        throw py::value_error("expected an array of shape (N, 2)");
+    const py::ssize_t aNb = theUV.shape(0);
+    const Standard_Real *aUV = theUV.data();
+    const int aNbArrays = TheOrder < 0 ? 1 : (TheOrder == 0 ? 1 : (TheOrder == 1 ? 3 : 6));
+
+    py::array_t<Standard_Real> anArrays[6];
+    Standard_Real *aData[6];
+    for (int k = 0; k < aNbArrays; ++k) {
+        anArrays[k] = Geom_BatchArray(aNb, 3);
+        aData[k] = anArrays[k].mutable_data();
+    }
+
+    Geom_BatchFor(theSurface, aNb, theNbThreads, [&](const auto &theLocal, const py::ssize_t theBegin, const py::ssize_t theEnd) {
+        gp_Pnt aPnt;
+        gp_Vec aD1U, aD1V, aD2U, aD2V, aD2UV;
+        for (py::ssize_t i = theBegin; i < theEnd; ++i) {
+            const Standard_Real u = aUV[2 * i], v = aUV[2 * i + 1];
+            try {
+                if (TheOrder < 0) {
+                    theLocal->D1(u, v, aPnt, aD1U, aD1V);
+                    gp_XYZ aNormal = aD1U.XYZ().Crossed(aD1V.XYZ());
+                    const Standard_Real aMod = aNormal.Modulus();
+                    if (aMod <= gp::Resolution())
+                        throw Standard_Failure("undefined normal");
+                    Geom_BatchStore(aNormal.Divided(aMod), aData[0] + 3 * i);
+                    continue;
+                }
+                if (TheOrder == 0) {
+                    theLocal->D0(u, v, aPnt);
+                } else if (TheOrder == 1) {
+                    theLocal->D1(u, v, aPnt, aD1U, aD1V);
+                } else {
+                    theLocal->D2(u, v, aPnt, aD1U, aD1V, aD2U, aD2V, aD2UV);
+                }
+                Geom_BatchStore(aPnt, aData[0] + 3 * i);
+                if (TheOrder > 0) {
+                    Geom_BatchStore(aD1U, aData[1] + 3 * i);
+                    Geom_BatchStore(aD1V, aData[2] + 3 * i);
+                }
+                if (TheOrder > 1) {
+                    Geom_BatchStore(aD2U, aData[3] + 3 * i);
+                    Geom_BatchStore(aD2V, aData[4] + 3 * i);
+                    Geom_BatchStore(aD2UV, aData[5] + 3 * i);
+                }
+            } catch (const Standard_Failure &) {
+                for (int k = 0; k < aNbArrays; ++k)
+                    std::fill(aData[k] + 3 * i, aData[k] + 3 * (i + 1), std::numeric_limits<Standard_Real>::quiet_NaN());
+            }
+        }
+    });
+
+    if (aNbArrays == 1)
+        return anArrays[0];
+    if (aNbArrays == 3)
+        return py::make_tuple(anArrays[0], anArrays[1], anArrays[2]);
+    return py::make_tuple(anArrays[0], anArrays[1], anArrays[2], anArrays[3], anArrays[4], anArrays[5]);
+}
+
+// Adds D0Array, D1Array and D2Array to a Geom_Curve, Geom2d_Curve,
+// Adaptor3d_Curve or Adaptor2d_Curve2d binding
+template <typename TheClass>
+void bind_Geom_BatchCurve(TheClass &cls) {
+    typedef typename TheClass::type TheCurve;
+    cls.def("D0Array", &Geom_BatchCurveEval<TheCurve, 0>, "Returns the points at the parameters theU as a (N, dim) NumPy array. The work is split across theNbThreads threads with the GIL released, 0 uses all the logical processors. Failed evaluations give NaN.", py::arg("theU"), py::arg("theNbThreads") = 1);
+    cls.def("D1Array", &Geom_BatchCurveEval<TheCurve, 1>, "Returns the tuple (points, first derivatives) at the parameters theU as (N, dim) NumPy arrays.", py::arg("theU"), py::arg("theNbThreads") = 1);
+    cls.def("D2Array", &Geom_BatchCurveEval<TheCurve, 2>, "Returns the tuple (points, first derivatives, second derivatives) at the parameters theU as (N, dim) NumPy arrays.", py::arg("theU"), py::arg("theNbThreads") = 1);
+}
+
+// Adds D0Array, D1Array, D2Array and NormalArray to a Geom_Surface or
+// Adaptor3d_Surface binding
+template <typename TheClass>
+void bind_Geom_BatchSurface(TheClass &cls) {
+    typedef typename TheClass::type TheSurface;
+    cls.def("D0Array", &Geom_BatchSurfaceEval<TheSurface, 0>, "Returns the points at the (u, v) parameters theUV, an (N, 2) array, as a (N, 3) NumPy array. The work is split across theNbThreads threads with the GIL released, 0 uses all the logical processors. Failed evaluations give NaN.", py::arg("theUV"), py::arg("theNbThreads") = 1);
+    cls.def("D1Array", &Geom_BatchSurfaceEval<TheSurface, 1>, "Returns the tuple (P, D1U, D1V) at the (u, v) parameters theUV as (N, 3) NumPy arrays.", py::arg("theUV"), py::arg("theNbThreads") = 1);
+    cls.def("D2Array", &Geom_BatchSurfaceEval<TheSurface, 2>, "Returns the tuple (P, D1U, D1V, D2U, D2V, D2UV) at the (u, v) parameters theUV as (N, 3) NumPy arrays.", py::arg("theUV"), py::arg("theNbThreads") = 1);
+    cls.def("NormalArray", &Geom_BatchSurfaceEval<TheSurface, -1>, "Returns the unit normals D1U ^ D1V of the surface at the (u, v) parameters theUV as a (N, 3) NumPy array. The orientation of a face is not taken into account. Undefined normals give NaN.", py::arg("theUV"), py::arg("theNbThreads") = 1);
+}
+
+#endif
@@ -0,0 +1,236 @@
+/*
+This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+geometry kernel.
+
+Copyright (C) 2016-2018  Laughlin Research, LLC
+Copyright (C) 2019 Trevor Laughlin and the pyOCCT contributors
+
+This library is free software; you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation; either
+version 2.1 of the License, or (at your option) any later version.
+
+This library is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public
+License along with this library; if not, write to the Free Software
+Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+*/
+#ifndef __bind_NCollection_Array_NumPy__
+#define __bind_NCollection_Array_NumPy__
+
+#include <pyOCCT_Common.hxx>
+#include <pybind11/numpy.h>
+
+#include <cstring>
+#include <type_traits>
+
+#include <Standard_TypeDef.hxx>
+#include <NCollection_Array1.hxx>
+#include <NCollection_Array2.hxx>
+#include <gp_Pnt.hxx>
+#include <gp_XYZ.hxx>
+#include <gp_Pnt2d.hxx>
+#include <gp_XY.hxx>
+
+// Describes how an item type is laid out in memory. Only plain scalars and
+// the coordinate classes (which hold nothing but their coordinates) can be
+// exposed as NumPy arrays without copying.
+template <typename TheItemType>
+struct NCollection_NumPyItem {
+    static constexpr bool IsSupported = false;
+};
+
+template <typename TheScalarType, py::ssize_t TheNbComponents>
+struct NCollection_NumPyLayout {
+    static constexpr bool IsSupported = true;
+    using ScalarType = TheScalarType;
+    // Zero for scalar items, otherwise the number of coordinates per item
+    static constexpr py::ssize_t NbComponents = TheNbComponents;
+};
+
+template <> struct NCollection_NumPyItem<Standard_Real> : NCollection_NumPyLayout<Standard_Real, 0> {};
+template <> struct NCollection_NumPyItem<Standard_Integer> : NCollection_NumPyLayout<Standard_Integer, 0> {};
+template <> struct NCollection_NumPyItem<gp_XYZ> : NCollection_NumPyLayout<Standard_Real, 3> {};
+template <> struct NCollection_NumPyItem<gp_Pnt> : NCollection_NumPyLayout<Standard_Real, 3> {};
+template <> struct NCollection_NumPyItem<gp_XY> : NCollection_NumPyLayout<Standard_Real, 2> {};
+template <> struct NCollection_NumPyItem<gp_Pnt2d> : NCollection_NumPyLayout<Standard_Real, 2> {};
+
+static_assert(sizeof(gp_XYZ) == 3 * sizeof(Standard_Real), "gp_XYZ is expected to be three packed reals");
+static_assert(sizeof(gp_Pnt) == 3 * sizeof(Standard_Real), "gp_Pnt is expected to be three packed reals");
+static_assert(sizeof(gp_XY) == 2 * sizeof(Standard_Real), "gp_XY is expected to be two packed reals");
+static_assert(sizeof(gp_Pnt2d) == 2 * sizeof(Standard_Real), "gp_Pnt2d is expected to be two packed reals");
+
+// Shape and strides of a (theNbRows x theNbCols) block of items. Rows are
+// omitted for one dimensional arrays (theNbRows < 0).
+template <typename TheItemType>
+void NCollection_NumPyShape(py::ssize_t theNbRows, py::ssize_t theNbCols, std::vector<py::ssize_t> &theShape, std::vector<py::ssize_t> &theStrides) {
+    using Item = NCollection_NumPyItem<TheItemType>;
+    if (theNbRows >= 0) {
+        theShape.push_back(theNbRows);
+        theStrides.push_back(theNbCols * static_cast<py::ssize_t>(sizeof(TheItemType)));
+    }
+    theShape.push_back(theNbCols);
+    theStrides.push_back(static_cast<py::ssize_t>(sizeof(TheItemType)));
+    if (Item::NbComponents > 0) {
+        theShape.push_back(Item::NbComponents);
+        theStrides.push_back(static_cast<py::ssize_t>(sizeof(typename Item::ScalarType)));
+    }
+}
+
+// Wraps the contiguous storage starting at theData as a NumPy array. The
+// returned array does not own the memory, it keeps theOwner alive instead.
+template <typename TheItemType>
+py::array NCollection_NumPyView(TheItemType *theData, py::ssize_t theNbRows, py::ssize_t theNbCols, py::handle theOwner) {
+    using Scalar = typename NCollection_NumPyItem<TheItemType>::ScalarType;
+    std::vector<py::ssize_t> aShape, aStrides;
+    NCollection_NumPyShape<TheItemType>(theNbRows, theNbCols, aShape, aStrides);
+    if (theNbCols == 0 || theNbRows == 0) {
+        // Nothing to share, hand out an empty array of the right shape
+        return py::array_t<Scalar>(aShape);
+    }
+    return py::array_t<Scalar>(aShape, aStrides, reinterpret_cast<Scalar *>(theData), theOwner);
+}
+
+// Implements the __array__(dtype=None, copy=None) protocol on top of a view.
+inline py::object NCollection_NumPyResult(py::array theView, py::object theDType, py::object theCopy) {
+    py::object aResult = theView;
+    if (!theDType.is_none())
+        aResult = aResult.attr("astype")(theDType, py::arg("copy") = false);
+    if (!theCopy.is_none() && theCopy.cast<bool>())
+        aResult = aResult.attr("copy")();
+    return aResult;
+}
+
+// Checks the incoming array against the item layout and returns the number
+// of items along the last item axis (theNbRows receives the leading axis of
+// two dimensional containers).
+template <typename TheItemType, typename TheArrayType>
+py::ssize_t NCollection_NumPyCheck(const TheArrayType &theArray, bool theIs2d, py::ssize_t &theNbRows) {
+    using Item = NCollection_NumPyItem<TheItemType>;
+    const py::ssize_t anExpectedDim = (theIs2d ? 2 : 1) + (Item::NbComponents > 0 ? 1 : 0);
+    if (theArray.ndim() != anExpectedDim)
+        throw py::value_error("Expected an array with " + std::to_string(anExpectedDim) + " dimensions, got " + std::to_string(theArray.ndim()) + ".");
+    if (Item::NbComponents > 0 && theArray.shape(anExpectedDim - 1) != Item::NbComponents)
+        throw py::value_error("Expected the last dimension of the array to be " + std::to_string(Item::NbComponents) + ".");
+    theNbRows = theIs2d ? theArray.shape(0) : -1;
+    return theArray.shape(theIs2d ? 1 : 0);
+}
+
+// Adds __array__ and a NumPy constructor to a NCollection_Array1 binding.
+// Nothing is added for item types that cannot be viewed as plain numbers.
+template <typename TheItemType, typename TheClass>
+void bind_NCollection_Array1_NumPy(TheClass &cls) {
+    using Item = NCollection_NumPyItem<TheItemType>;
+    if constexpr (Item::IsSupported) {
+        using Scalar = typename Item::ScalarType;
+        using Array1 = NCollection_Array1<TheItemType>;
+        using Buffer = py::array_t<Scalar, py::array::c_style | py::array::forcecast>;
+
+        cls.def(py::init([](Buffer theArray, const Standard_Integer theLower) {
+            py::ssize_t aNbRows = 0;
+            const py::ssize_t aLength = NCollection_NumPyCheck<TheItemType>(theArray, false, aNbRows);
+            if (aLength == 0)
+                return new Array1();
+            Array1 *aResult = new Array1(theLower, theLower + static_cast<Standard_Integer>(aLength) - 1);
+            std::memcpy(&aResult->ChangeFirst(), theArray.data(), aLength * sizeof(TheItemType));
+            return aResult;
+        }), "Copy the items of a NumPy array in a single block.", py::arg("theArray"), py::arg("theLower") = 1);
+
+        cls.def("__array__", [](py::object self, py::object dtype, py::object copy) {
+            Array1 &anArray = self.cast<Array1 &>();
+            TheItemType *aData = anArray.IsEmpty() ? nullptr : &anArray.ChangeFirst();
+            return NCollection_NumPyResult(NCollection_NumPyView<TheItemType>(aData, -1, anArray.Size(), self), dtype, copy);
+        }, "Return a NumPy view sharing the memory of the array.", py::arg("dtype") = py::none(), py::arg("copy") = py::none());
+    }
+}
+
+// Adds __array__ and a NumPy constructor to a NCollection_Array2 binding.
+// Items are stored row by row so the view has the shape (NbRows, NbColumns).
+template <typename TheItemType, typename TheClass>
+void bind_NCollection_Array2_NumPy(TheClass &cls) {
+    using Item = NCollection_NumPyItem<TheItemType>;
+    if constexpr (Item::IsSupported) {
+        using Scalar = typename Item::ScalarType;
+        using Array2 = NCollection_Array2<TheItemType>;
+        using Buffer = py::array_t<Scalar, py::array::c_style | py::array::forcecast>;
+
+        cls.def(py::init([](Buffer theArray, const Standard_Integer theRowLower, const Standard_Integer theColLower) {
+            py::ssize_t aNbRows = 0;
+            const py::ssize_t aNbCols = NCollection_NumPyCheck<TheItemType>(theArray, true, aNbRows);
+            if (aNbRows == 0 || aNbCols == 0)
+                throw py::value_error("Cannot create an empty two dimensional array.");
+            Array2 *aResult = new Array2(theRowLower, theRowLower + static_cast<Standard_Integer>(aNbRows) - 1,
+                                         theColLower, theColLower + static_cast<Standard_Integer>(aNbCols) - 1);
+            std::memcpy(&aResult->ChangeValue(theRowLower, theColLower), theArray.data(), aNbRows * aNbCols * sizeof(TheItemType));
+            return aResult;
+        }), "Copy the items of a NumPy array in a single block.", py::arg("theArray"), py::arg("theRowLower") = 1, py::arg("theColLower") = 1);
+
+        cls.def("__array__", [](py::object self, py::object dtype, py::object copy) {
+            Array2 &anArray = self.cast<Array2 &>();
+            TheItemType *aData = anArray.Size() == 0 ? nullptr : &anArray.ChangeValue(anArray.LowerRow(), anArray.LowerCol());
+            return NCollection_NumPyResult(NCollection_NumPyView<TheItemType>(aData, anArray.NbRows(), anArray.NbColumns(), self), dtype, copy);
+        }, "Return a NumPy view sharing the memory of the array.", py::arg("dtype") = py::none(), py::arg("copy") = py::none());
+    }
+}
+
+// Same as bind_NCollection_Array1_NumPy for the handle wrapped HArray1 types.
+template <typename TheHArray1Type, typename TheArray1Type, typename TheClass>
+void bind_Define_HArray1_NumPy(TheClass &cls) {
+    using TheItemType = typename TheArray1Type::value_type;
+    using Item = NCollection_NumPyItem<TheItemType>;
+    if constexpr (Item::IsSupported) {
+        using Scalar = typename Item::ScalarType;
+        using Buffer = py::array_t<Scalar, py::array::c_style | py::array::forcecast>;
+
+        cls.def(py::init([](Buffer theArray, const Standard_Integer theLower) {
+            py::ssize_t aNbRows = 0;
+            const py::ssize_t aLength = NCollection_NumPyCheck<TheItemType>(theArray, false, aNbRows);
+            if (aLength == 0)
+                return opencascade::handle<TheHArray1Type>(new TheHArray1Type());
+            opencascade::handle<TheHArray1Type> aResult = new TheHArray1Type(theLower, theLower + static_cast<Standard_Integer>(aLength) - 1);
+            std::memcpy(&aResult->ChangeFirst(), theArray.data(), aLength * sizeof(TheItemType));
+            return aResult;
+        }), "Copy the items of a NumPy array in a single block.", py::arg("theArray"), py::arg("theLower") = 1);
+
+        cls.def("__array__", [](py::object self, py::object dtype, py::object copy) {
+            TheArray1Type &anArray = self.cast<TheHArray1Type &>().ChangeArray1();
+            TheItemType *aData = anArray.IsEmpty() ? nullptr : &anArray.ChangeFirst();
+            return NCollection_NumPyResult(NCollection_NumPyView<TheItemType>(aData, -1, anArray.Size(), self), dtype, copy);
+        }, "Return a NumPy view sharing the memory of the array.", py::arg("dtype") = py::none(), py::arg("copy") = py::none());
+    }
+}
+
+// Same as bind_NCollection_Array2_NumPy for the handle wrapped HArray2 types.
+template <typename TheHArray2Type, typename TheArray2Type, typename TheClass>
+void bind_Define_HArray2_NumPy(TheClass &cls) {
+    using TheItemType = typename TheArray2Type::value_type;
+    using Item = NCollection_NumPyItem<TheItemType>;
+    if constexpr (Item::IsSupported) {
+        using Scalar = typename Item::ScalarType;
+        using Buffer = py::array_t<Scalar, py::array::c_style | py::array::forcecast>;
+
+        cls.def(py::init([](Buffer theArray, const Standard_Integer theRowLower, const Standard_Integer theColLower) {
+            py::ssize_t aNbRows = 0;
+            const py::ssize_t aNbCols = NCollection_NumPyCheck<TheItemType>(theArray, true, aNbRows);
+            if (aNbRows == 0 || aNbCols == 0)
+                throw py::value_error("Cannot create an empty two dimensional array.");
+            opencascade::handle<TheHArray2Type> aResult = new TheHArray2Type(
+                theRowLower, theRowLower + static_cast<Standard_Integer>(aNbRows) - 1,
+                theColLower, theColLower + static_cast<Standard_Integer>(aNbCols) - 1);
+            std::memcpy(&aResult->ChangeValue(theRowLower, theColLower), theArray.data(), aNbRows * aNbCols * sizeof(TheItemType));
+            return aResult;
+        }), "Copy the items of a NumPy array in a single block.", py::arg("theArray"), py::arg("theRowLower") = 1, py::arg("theColLower") = 1);
+
+        cls.def("__array__", [](py::object self, py::object dtype, py::object copy) {
+            TheArray2Type &anArray = self.cast<TheHArray2Type &>().ChangeArray2();
+            TheItemType *aData = anArray.Size() == 0 ? nullptr : &anArray.ChangeValue(anArray.LowerRow(), anArray.LowerCol());
+            return NCollection_NumPyResult(NCollection_NumPyView<TheItemType>(aData, anArray.NbRows(), anArray.NbColumns(), self), dtype, copy);
+        }, "Return a NumPy view sharing the memory of the array.", py::arg("dtype") = py::none(), py::arg("copy") = py::none());
+    }
+}
+
+#endif
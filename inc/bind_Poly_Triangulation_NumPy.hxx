@@ -0,0 +1,130 @@
+/*
+This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+geometry kernel.
+
+Copyright (C) 2016-2018  Laughlin Research, LLC
+Copyright (C) 2019 Trevor Laughlin and the pyOCCT contributors
+
+This library is free software; you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation; either
+version 2.1 of the License, or (at your option) any later version.
+
+This library is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public
+License along with this library; if not, write to the Free Software
+Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+*/
+#ifndef __bind_Poly_Triangulation_NumPy__
+#define __bind_Poly_Triangulation_NumPy__
+
+#include <pyOCCT_Common.hxx>
+#include <pybind11/numpy.h>
+
+#include <Poly_Triangle.hxx>
+#include <Poly_Triangulation.hxx>
+#include <gp_Pnt.hxx>
+#include <gp_Vec3f.hxx>
+
+// Builds a triangulation from (N, 3) nodes, (M, 3) 0 based triangles and
+// optional (N, 3) normals
+inline opencascade::handle<Poly_Triangulation> Poly_TriangulationFromArrays(
+    const py::array_t<Standard_Real, py::array::c_style | py::array::forcecast> &theNodes,
+    const py::array_t<Standard_Integer, py::array::c_style | py::array::forcecast> &theTriangles,
+    const py::object &theNormals) {
+    if (theNodes.ndim() != 2 || theNodes.shape(1) != 3)
+        throw py::value_error("expected nodes of shape (N, 3)");
+    if (theTriangles.ndim() != 2 || theTriangles.shape(1) != 3)
+        throw py::value_error("expected triangles of shape (M, 3)");
+    const Standard_Integer aNbNodes = static_cast<Standard_Integer>(theNodes.shape(0));
+    const Standard_Integer aNbTris = static_cast<Standard_Integer>(theTriangles.shape(0));
+
+    py::array_t<Standard_ShortReal, py::array::c_style | py::array::forcecast> aNormals;
+    const Standard_ShortReal *aNormalsPtr = nullptr;
+    if (!theNormals.is_none()) {
+        aNormals = py::array_t<Standard_ShortReal, py::array::c_style | py::array::forcecast>::ensure(theNormals);
+        if (!aNormals || aNormals.ndim() != 2 || aNormals.shape(0) != aNbNodes || aNormals.shape(1) != 3)
+            throw py::value_error("expected normals of shape (N, 3)");
+        aNormalsPtr = aNormals.data();
+    }
+
+    const Standard_Real *aNodes = theNodes.data();
+    const Standard_Integer *aTris = theTriangles.data();
+    for (Standard_Integer i = 0; i < 3 * aNbTris; ++i) {
+        if (aTris[i] < 0 || aTris[i] >= aNbNodes)
+            throw py::index_error("triangle node index out of range");
+    }
+
+    opencascade::handle<Poly_Triangulation> aTri;
+    {
+        py::gil_scoped_release aRelease;
+        aTri = new Poly_Triangulation(aNbNodes, aNbTris, Standard_False, aNormalsPtr != nullptr);
+        for (Standard_Integer i = 0; i < aNbNodes; ++i)
+            aTri->SetNode(i + 1, gp_Pnt(aNodes[3 * i], aNodes[3 * i + 1], aNodes[3 * i + 2]));
+        for (Standard_Integer i = 0; i < aNbTris; ++i)
+            aTri->SetTriangle(i + 1, Poly_Triangle(aTris[3 * i] + 1, aTris[3 * i + 1] + 1, aTris[3 * i + 2] + 1));
+        if (aNormalsPtr != nullptr) {
+            for (Standard_Integer i = 0; i < aNbNodes; ++i)
+                aTri->SetNormal(i + 1, gp_Vec3f(aNormalsPtr[3 * i], aNormalsPtr[3 * i + 1], aNormalsPtr[3 * i + 2]));
+        }
+    }
+    return aTri;
+}
+
+// Copies the nodes, 0 based triangles and normals (or None) of a
+// triangulation into NumPy arrays
+inline py::tuple Poly_TriangulationArrays(const Poly_Triangulation &theTri) {
+    const Standard_Integer aNbNodes = theTri.NbNodes();
+    const Standard_Integer aNbTris = theTri.NbTriangles();
+    py::array_t<Standard_Real> aNodes({static_cast<py::ssize_t>(aNbNodes), py::ssize_t(3)});
+    py::array_t<Standard_Integer> aTris({static_cast<py::ssize_t>(aNbTris), py::ssize_t(3)});
+    Standard_Real *aNodesPtr = aNodes.mutable_data();
+    Standard_Integer *aTrisPtr = aTris.mutable_data();
+    py::object aNormalsObj = py::none();
+    Standard_ShortReal *aNormalsPtr = nullptr;
+    if (theTri.HasNormals()) {
+        py::array_t<Standard_ShortReal> aNormals({static_cast<py::ssize_t>(aNbNodes), py::ssize_t(3)});
+        aNormalsPtr = aNormals.mutable_data();
+        aNormalsObj = aNormals;
+    }
+    {
+        py::gil_scoped_release aRelease;
+        for (Standard_Integer i = 1; i <= aNbNodes; ++i) {
+            const gp_Pnt aPnt = theTri.Node(i);
+            *aNodesPtr++ = aPnt.X();
+            *aNodesPtr++ = aPnt.Y();
+            *aNodesPtr++ = aPnt.Z();
+        }
+        for (Standard_Integer i = 1; i <= aNbTris; ++i) {
+            Standard_Integer n1, n2, n3;
+            theTri.Triangle(i).Get(n1, n2, n3);
+            *aTrisPtr++ = n1 - 1;
+            *aTrisPtr++ = n2 - 1;
+            *aTrisPtr++ = n3 - 1;
+        }
+        if (aNormalsPtr != nullptr) {
+            for (Standard_Integer i = 1; i <= aNbNodes; ++i) {
+                gp_Vec3f aNormal;
+                theTri.Normal(i, aNormal);
+                *aNormalsPtr++ = aNormal.x();
+                *aNormalsPtr++ = aNormal.y();
+                *aNormalsPtr++ = aNormal.z();
+            }
+        }
+    }
+    return py::make_tuple(aNodes, aTris, aNormalsObj);
+}
+
+// Adds Poly_Triangulation.FromArrays_ and Poly_Triangulation.Arrays to the
+// Poly_Triangulation binding
+template <typename TheClass>
+void bind_Poly_Triangulation_NumPy(TheClass &cls) {
+    cls.def_static("FromArrays_", &Poly_TriangulationFromArrays, "Creates a triangulation from the (N, 3) array of nodes, the (M, 3) array of 0 based node indices of the triangles and the optional (N, 3) array of node normals.", py::arg("theNodes"), py::arg("theTriangles"), py::arg("theNormals") = py::none());
+    cls.def("Arrays", &Poly_TriangulationArrays, "Returns the tuple (nodes, triangles, normals) of NumPy arrays. Triangle node indices are 0 based and normals is None if the triangulation has no normals.");
+}
+
+#endif
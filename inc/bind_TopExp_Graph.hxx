@@ -0,0 +1,219 @@
+/*
+This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+geometry kernel.
+
+Copyright (C) 2016-2018  Laughlin Research, LLC
+Copyright (C) 2019 Trevor Laughlin and the pyOCCT contributors
+
+This library is free software; you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation; either
+version 2.1 of the License, or (at your option) any later version.
+
+This library is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public
+License along with this library; if not, write to the Free Software
+Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+*/
+#ifndef __bind_TopExp_Graph__
+#define __bind_TopExp_Graph__
+
+#include <pyOCCT_Common.hxx>
+#include <pybind11/numpy.h>
+
+#include <algorithm>
+#include <numeric>
+#include <vector>
+
+#include <BRep_Tool.hxx>
+#include <BRepAdaptor_Curve.hxx>
+#include <BRepAdaptor_Surface.hxx>
+#include <TopAbs_ShapeEnum.hxx>
+#include <TopExp.hxx>
+#include <TopExp_Explorer.hxx>
+#include <TopoDS.hxx>
+#include <TopoDS_Shape.hxx>
+#include <TopTools_IndexedMapOfShape.hxx>
+
+// Copies a std::vector into a new NumPy array
+template <typename T>
+py::array_t<T> TopExp_GraphArray(const std::vector<T> &theValues) {
+    py::array_t<T> anArray(static_cast<py::ssize_t>(theValues.size()));
+    std::copy(theValues.begin(), theValues.end(), anArray.mutable_data());
+    return anArray;
+}
+
+// Adjacency in compressed sparse row form
+struct TopExp_GraphCSR {
+    std::vector<Standard_Integer> Indptr, Indices;
+    std::vector<int8_t> Orientations;
+
+    py::tuple ToTuple() const {
+        return py::make_tuple(TopExp_GraphArray(Indptr), TopExp_GraphArray(Indices), TopExp_GraphArray(Orientations));
+    }
+};
+
+// Fills theCSR with the theSubType sub-shapes of each entity of theMap, as
+// 0 based positions in theSubMap. Orientations are the ones of the
+// sub-shapes as found in the entity, so a seam edge appears twice in its
+// face unless theUnique is true.
+inline void TopExp_GraphIncidence(const TopTools_IndexedMapOfShape &theMap, const TopTools_IndexedMapOfShape &theSubMap, const TopAbs_ShapeEnum theSubType, const Standard_Boolean theUnique, TopExp_GraphCSR &theCSR) {
+    theCSR.Indptr.reserve(theMap.Extent() + 1);
+    theCSR.Indptr.push_back(0);
+    for (Standard_Integer i = 1; i <= theMap.Extent(); ++i) {
+        const std::size_t aStart = theCSR.Indices.size();
+        for (TopExp_Explorer anExp(theMap(i), theSubType); anExp.More(); anExp.Next()) {
+            const Standard_Integer anIndex = theSubMap.FindIndex(anExp.Current()) - 1;
+            if (anIndex < 0)
+                continue;
+            if (theUnique && std::find(theCSR.Indices.begin() + aStart, theCSR.Indices.end(), anIndex) != theCSR.Indices.end())
+                continue;
+            theCSR.Indices.push_back(anIndex);
+            theCSR.Orientations.push_back(static_cast<int8_t>(anExp.Current().Orientation()));
+        }
+        theCSR.Indptr.push_back(static_cast<Standard_Integer>(theCSR.Indices.size()));
+    }
+}
+
+// Fills theTransposed with the rows of theCSR each of its theNbColumns
+// columns appears in, listing a row once per column. Rows are sorted and the
+// orientations are the ones of the first occurrence in the row.
+inline void TopExp_GraphTranspose(const TopExp_GraphCSR &theCSR, const Standard_Integer theNbColumns, TopExp_GraphCSR &theTransposed) {
+    const Standard_Integer aNbRows = static_cast<Standard_Integer>(theCSR.Indptr.size()) - 1;
+    const auto isRepeated = [&](const Standard_Integer theRow, const Standard_Integer theK) {
+        const auto aBegin = theCSR.Indices.begin();
+        return std::find(aBegin + theCSR.Indptr[theRow], aBegin + theK, theCSR.Indices[theK]) != aBegin + theK;
+    };
+
+    theTransposed.Indptr.assign(theNbColumns + 1, 0);
+    for (Standard_Integer aRow = 0; aRow < aNbRows; ++aRow)
+        for (Standard_Integer k = theCSR.Indptr[aRow]; k < theCSR.Indptr[aRow + 1]; ++k)
+            if (!isRepeated(aRow, k))
+                ++theTransposed.Indptr[theCSR.Indices[k] + 1];
+    std::partial_sum(theTransposed.Indptr.begin(), theTransposed.Indptr.end(), theTransposed.Indptr.begin());
+
+    theTransposed.Indices.resize(theTransposed.Indptr.back());
+    theTransposed.Orientations.resize(theTransposed.Indptr.back());
+    std::vector<Standard_Integer> aPositions(theTransposed.Indptr.begin(), theTransposed.Indptr.end() - 1);
+    for (Standard_Integer aRow = 0; aRow < aNbRows; ++aRow) {
+        for (Standard_Integer k = theCSR.Indptr[aRow]; k < theCSR.Indptr[aRow + 1]; ++k) {
+            if (isRepeated(aRow, k))
+                continue;
+            const Standard_Integer aPosition = aPositions[theCSR.Indices[k]]++;
+            theTransposed.Indices[aPosition] = aRow;
+            theTransposed.Orientations[aPosition] = theCSR.Orientations[k];
+        }
+    }
+}
+
+// Fills theTypes and theOrientations with the geometry type and orientation
+// of each theType entity of theMap. The type is the GeomAbs_SurfaceType of
+// faces, the GeomAbs_CurveType of edges (-1 for degenerated edges) and -1
+// for the other entities.
+inline void TopExp_GraphEntities(const TopTools_IndexedMapOfShape &theMap, const TopAbs_ShapeEnum theType, std::vector<int8_t> &theTypes, std::vector<int8_t> &theOrientations) {
+    theTypes.reserve(theMap.Extent());
+    theOrientations.reserve(theMap.Extent());
+    for (Standard_Integer i = 1; i <= theMap.Extent(); ++i) {
+        const TopoDS_Shape &aShape = theMap(i);
+        int8_t aType = -1;
+        if (theType == TopAbs_FACE) {
+            BRepAdaptor_Surface aSurface(TopoDS::Face(aShape), Standard_False);
+            aType = static_cast<int8_t>(aSurface.GetType());
+        } else if (theType == TopAbs_EDGE) {
+            const TopoDS_Edge &anEdge = TopoDS::Edge(aShape);
+            if (BRep_Tool::IsGeometric(anEdge) && !BRep_Tool::Degenerated(anEdge))
+                aType = static_cast<int8_t>(BRepAdaptor_Curve(anEdge).GetType());
+        }
+        theTypes.push_back(aType);
+        theOrientations.push_back(static_cast<int8_t>(aShape.Orientation()));
+    }
+}
+
+// Incidence of the theSubType sub-shapes of each theType entity of theShape
+// in compressed sparse row form. Indices are 0 based positions in the maps
+// of TopExp::MapShapes.
+inline py::tuple TopExp_Incidence(const TopoDS_Shape &theShape, const TopAbs_ShapeEnum theType, const TopAbs_ShapeEnum theSubType, const Standard_Boolean theUnique) {
+    TopExp_GraphCSR aCSR;
+    {
+        py::gil_scoped_release aRelease;
+        TopTools_IndexedMapOfShape aMap, aSubMap;
+        TopExp::MapShapes(theShape, theType, aMap);
+        TopExp::MapShapes(theShape, theSubType, aSubMap);
+        TopExp_GraphIncidence(aMap, aSubMap, theSubType, theUnique, aCSR);
+    }
+
+    return aCSR.ToTuple();
+}
+
+// Geometry type and orientation of each theType entity of theShape, in the
+// order of TopExp::MapShapes
+inline py::tuple TopExp_Entities(const TopoDS_Shape &theShape, const TopAbs_ShapeEnum theType) {
+    std::vector<int8_t> aTypes, anOrientations;
+    {
+        py::gil_scoped_release aRelease;
+        TopTools_IndexedMapOfShape aMap;
+        TopExp::MapShapes(theShape, theType, aMap);
+        TopExp_GraphEntities(aMap, theType, aTypes, anOrientations);
+    }
+
+    return py::make_tuple(TopExp_GraphArray(aTypes), TopExp_GraphArray(anOrientations));
+}
+
+// Face/edge/vertex/solid graph of theShape, each map being built once:
+// (face_edges, edge_faces, edge_vertices, solid_faces, face_types,
+// face_orientations, edge_types, edge_orientations). face_edges lists seam
+// edges twice, the other adjacencies list each neighbour once.
+inline py::tuple TopExp_Graph(const TopoDS_Shape &theShape) {
+    TopExp_GraphCSR aFaceEdges, anEdgeFaces, anEdgeVertices, aSolidFaces;
+    std::vector<int8_t> aFaceTypes, aFaceOrientations, anEdgeTypes, anEdgeOrientations;
+    {
+        py::gil_scoped_release aRelease;
+        TopTools_IndexedMapOfShape aSolids, aFaces, anEdges, aVertices;
+        TopExp::MapShapes(theShape, TopAbs_SOLID, aSolids);
+        TopExp::MapShapes(theShape, TopAbs_FACE, aFaces);
+        TopExp::MapShapes(theShape, TopAbs_EDGE, anEdges);
+        TopExp::MapShapes(theShape, TopAbs_VERTEX, aVertices);
+
+        TopExp_GraphIncidence(aFaces, anEdges, TopAbs_EDGE, Standard_False, aFaceEdges);
+        TopExp_GraphTranspose(aFaceEdges, anEdges.Extent(), anEdgeFaces);
+        TopExp_GraphIncidence(anEdges, aVertices, TopAbs_VERTEX, Standard_True, anEdgeVertices);
+        TopExp_GraphIncidence(aSolids, aFaces, TopAbs_FACE, Standard_True, aSolidFaces);
+        TopExp_GraphEntities(aFaces, TopAbs_FACE, aFaceTypes, aFaceOrientations);
+        TopExp_GraphEntities(anEdges, TopAbs_EDGE, anEdgeTypes, anEdgeOrientations);
+    }
+
+    return py::make_tuple(aFaceEdges.ToTuple(), anEdgeFaces.ToTuple(), anEdgeVertices.ToTuple(), aSolidFaces.ToTuple(),
+                          TopExp_GraphArray(aFaceTypes), TopExp_GraphArray(aFaceOrientations),
+                          TopExp_GraphArray(anEdgeTypes), TopExp_GraphArray(anEdgeOrientations));
+}
+
+// Number of theType sub-shapes of theShape, as found by TopExp_Explorer, or
+// as mapped by TopExp::MapShapes if theUnique is true
+inline Standard_Integer TopExp_NbShapes(const TopoDS_Shape &theShape, const TopAbs_ShapeEnum theType, const Standard_Boolean theUnique) {
+    py::gil_scoped_release aRelease;
+    if (theUnique) {
+        TopTools_IndexedMapOfShape aMap;
+        TopExp::MapShapes(theShape, theType, aMap);
+        return aMap.Extent();
+    }
+    Standard_Integer aNb = 0;
+    for (TopExp_Explorer anExp(theShape, theType); anExp.More(); anExp.Next())
+        ++aNb;
+    return aNb;
+}
+
+// Adds TopExp.Incidence_, TopExp.Entities_, TopExp.Graph_ and
+// TopExp.NbShapes_ to the TopExp binding
+template <typename TheClass>
+void bind_TopExp_Graph(TheClass &cls) {
+    cls.def_static("Incidence_", &TopExp_Incidence, "Returns the theSubType sub-shapes of each theType entity of theShape as the tuple (indptr, indices, orientations) of NumPy arrays in compressed sparse row form. Indices are 0 based positions in the maps built by TopExp::MapShapes. If theUnique is true a sub-shape is listed once per entity.", py::arg("theShape"), py::arg("theType"), py::arg("theSubType"), py::arg("theUnique") = false);
+    cls.def_static("Entities_", &TopExp_Entities, "Returns the tuple (types, orientations) of NumPy arrays for the theType entities of theShape in the order of TopExp::MapShapes. types holds the GeomAbs_SurfaceType of faces and the GeomAbs_CurveType of edges, -1 otherwise.", py::arg("theShape"), py::arg("theType"));
+    cls.def_static("Graph_", &TopExp_Graph, "Returns the tuple (face_edges, edge_faces, edge_vertices, solid_faces, face_types, face_orientations, edge_types, edge_orientations) for theShape, building the maps of TopExp::MapShapes once. Adjacencies are (indptr, indices, orientations) tuples as returned by Incidence_, face_edges lists seam edges twice and the others list each neighbour once. Types and orientations are as returned by Entities_.", py::arg("theShape"));
+    cls.def_static("NbShapes_", &TopExp_NbShapes, "Returns the number of theType sub-shapes of theShape found by TopExp_Explorer, counting a sub-shape each time it is found, or the number of distinct ones as mapped by TopExp::MapShapes if theUnique is true.", py::arg("theShape"), py::arg("theType"), py::arg("theUnique") = false);
+}
+
+#endif
@@ -0,0 +1,117 @@
+# This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+# geometry kernel.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC
+# Copyright (C) 2019 Trevor Laughlin and the pyOCCT contributors
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+import os
+import shutil
+import tempfile
+import unittest
+
+from OCCT.BRepPrimAPI import BRepPrimAPI_MakeBox
+from OCCT.TopLoc import TopLoc_Location
+from OCCT.TopoDS import TopoDS_Iterator
+from OCCT.gp import gp_Trsf, gp_Vec
+
+from OCCT.Extend.Assembly import Assembly
+from OCCT.Extend.Progress import Progress
+
+
+class Test_Assembly(unittest.TestCase):
+    """
+    Test for Assembly class.
+    """
+
+    def setUp(self):
+        """
+        Set up with two located copies of one box.
+        """
+        self._box = BRepPrimAPI_MakeBox(1.0, 2.0, 3.0).Shape()
+        self._locations = []
+        for i in range(2):
+            trsf = gp_Trsf()
+            trsf.SetTranslation(gp_Vec(10.0 * i, 0.0, 0.0))
+            self._locations.append(TopLoc_Location(trsf))
+        self._assembly = Assembly('boxes')
+        for i, location in enumerate(self._locations):
+            self._assembly.add_shape(self._box.Moved(location), f'box_{i}', prototype_name='box')
+
+    def test_add_shape(self):
+        """
+        Test Assembly::add_shape shares one prototype between located copies.
+        """
+        self.assertEqual(self._assembly.nb_prototypes, 1)
+        self.assertEqual(self._assembly.nb_instances, 2)
+        self.assertEqual(self._assembly.prototypes[0].name, 'box')
+        self.assertTrue(self._assembly.prototypes[0].shape.Location().IsIdentity())
+        for instance, location in zip(self._assembly.instances, self._locations):
+            self.assertEqual(instance.prototype, 0)
+            self.assertTrue(instance.location.IsEqual(location))
+
+    def test_located_shapes(self):
+        """
+        Test Assembly::located_shapes and Assembly::to_compound share the
+        TShape of the prototype.
+        """
+        shapes = list(self._assembly.located_shapes())
+        self.assertEqual(len(shapes), 2)
+        for shape, location in zip(shapes, self._locations):
+            self.assertTrue(shape.IsPartner(self._box))
+            self.assertTrue(shape.Location().IsEqual(location))
+
+        iterator = TopoDS_Iterator(self._assembly.to_compound())
+        children = []
+        while iterator.More():
+            children.append(iterator.Value())
+            iterator.Next()
+        self.assertEqual(len(children), 2)
+        self.assertTrue(children[0].IsPartner(children[1]))
+        self.assertFalse(children[0].IsSame(children[1]))
+
+    def test_to_xcaf(self):
+        """
+        Test Assembly::to_xcaf and Assembly::from_xcaf keep the instancing
+        and the instance names.
+        """
+        assembly = Assembly.from_xcaf(self._assembly.to_xcaf())
+        self.assertEqual(assembly.nb_prototypes, 1)
+        self.assertEqual(assembly.nb_instances, 2)
+        self.assertEqual([instance.name for instance in assembly.instances], ['box_0', 'box_1'])
+        for instance, location in zip(assembly.instances, self._locations):
+            self.assertTrue(instance.location.IsEqual(location))
+
+    def test_write_gltf_file(self):
+        """
+        Test the progress of Assembly::write_gltf_file moves forward from the
+        meshing to the writing.
+        """
+        positions = []
+        progress = Progress(lambda position, step: positions.append(position), interval=0.0)
+        directory = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(directory, 'boxes.glb')
+            self._assembly.write_gltf_file(filename, linear_deflection=0.1, progress=progress)
+            self.assertTrue(os.path.isfile(filename))
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        self.assertTrue(positions)
+        self.assertEqual(positions, sorted(positions))
+        self.assertAlmostEqual(progress.position, 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
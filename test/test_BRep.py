@@ -0,0 +1,80 @@
+# This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+# geometry kernel.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC
+# Copyright (C) 2019 Trevor Laughlin and the pyOCCT contributors
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+import unittest
+
+from OCCT.BRep import BRep_Tool
+from OCCT.BRepMesh import BRepMesh_IncrementalMesh
+from OCCT.BRepPrimAPI import BRepPrimAPI_MakeBox
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class Test_BRep_Tool_MeshArrays(unittest.TestCase):
+    """
+    Test for BRep_Tool::MeshArrays_.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Set up with a meshed box.
+        """
+        cls._box = BRepPrimAPI_MakeBox(10, 10, 10).Shape()
+        BRepMesh_IncrementalMesh(cls._box, 1.0)
+
+    def test_Arrays(self):
+        """
+        Test BRep_Tool::MeshArrays_ shapes and types.
+        """
+        nodes, normals, tris, node_offsets, tri_offsets = BRep_Tool.MeshArrays_(self._box)
+        self.assertEqual(nodes.dtype, np.float32)
+        self.assertEqual(tris.dtype, np.int32)
+        self.assertEqual(nodes.shape, normals.shape)
+        self.assertEqual(len(node_offsets), 7)
+        self.assertEqual(tri_offsets[-1], len(tris))
+        self.assertEqual(node_offsets[-1], len(nodes))
+        self.assertLess(tris.max(), len(nodes))
+        self.assertAlmostEqual(float(nodes.max()), 10.0)
+
+    def test_Orientation(self):
+        """
+        Test BRep_Tool::MeshArrays_ gives outward triangles and normals.
+        """
+        nodes, normals, tris, _, _ = BRep_Tool.MeshArrays_(self._box, True)
+        self.assertEqual(nodes.dtype, np.float64)
+        p = nodes[tris]
+        n = np.cross(p[:, 1] - p[:, 0], p[:, 2] - p[:, 0])
+        c = p.mean(axis=1) - 5.0
+        self.assertTrue(np.all(np.einsum('ij,ij->i', n, c) > 0))
+        self.assertTrue(np.all(np.einsum('ij,ij->i', normals, nodes - 5.0) > 0))
+
+    def test_NoNormals(self):
+        """
+        Test BRep_Tool::MeshArrays_ without normals.
+        """
+        self.assertIsNone(BRep_Tool.MeshArrays_(self._box, False, False)[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+# This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+# geometry kernel.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC
+# Copyright (C) 2019 Trevor Laughlin and the pyOCCT contributors
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+import unittest
+
+from OCCT.BRepExtrema import BRepExtrema_FacePointProjector
+from OCCT.BRepPrimAPI import BRepPrimAPI_MakeBox
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class Test_BRepExtrema_FacePointProjector(unittest.TestCase):
+    """
+    Test for BRepExtrema_FacePointProjector class.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Set up with a box.
+        """
+        cls._projector = BRepExtrema_FacePointProjector(BRepPrimAPI_MakeBox(10, 10, 10).Shape())
+
+    def test_Perform(self):
+        """
+        Test BRepExtrema_FacePointProjector::Perform.
+        """
+        pnts = np.array([[5, 5, 12], [5, 5, 9], [13, 14, 10], [5, 5, 5]], dtype=float)
+        faces, uv, proj, dist = self._projector.Perform(pnts)
+        self.assertEqual(self._projector.NbFaces(), 6)
+        self.assertEqual(uv.shape, (4, 2))
+        self.assertTrue(np.all(faces >= 0))
+        np.testing.assert_allclose(dist, [2.0, -1.0, 5.0, -5.0], atol=1.0e-7)
+        np.testing.assert_allclose(proj[:3], [[5, 5, 10], [5, 5, 10], [10, 10, 10]], atol=1.0e-7)
+
+    def test_Threads(self):
+        """
+        Test BRepExtrema_FacePointProjector::Perform gives the same distances
+        with several threads.
+        """
+        pnts = np.random.RandomState(0).uniform(-5, 15, (1000, 3))
+        dist1 = self._projector.Perform(pnts, theNbThreads=1)[3]
+        dist4 = self._projector.Perform(pnts, theNbThreads=4)[3]
+        np.testing.assert_allclose(dist1, dist4)
+
+    def test_MaxDistance(self):
+        """
+        Test BRepExtrema_FacePointProjector::Perform with a maximum distance.
+        """
+        faces, _, _, dist = self._projector.Perform(np.array([[5, 5, 30.0]]), 1.0)
+        self.assertEqual(faces[0], -1)
+        self.assertTrue(np.isnan(dist[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
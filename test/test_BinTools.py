@@ -0,0 +1,121 @@
+# This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+# geometry kernel.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC
+# Copyright (C) 2019 Trevor Laughlin and the pyOCCT contributors
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+import pickle
+import unittest
+
+from OCCT.BinTools import BinTools
+from OCCT.BRep import BRep_Tool
+from OCCT.BRepMesh import BRepMesh_IncrementalMesh
+from OCCT.BRepPrimAPI import BRepPrimAPI_MakeBox
+from OCCT.Geom import Geom_Line, Geom_Plane
+from OCCT.Geom2d import Geom2d_Circle
+from OCCT.gp import gp_Ax2d, gp_Dir, gp_Pnt, gp_Pnt2d, gp_Dir2d
+from OCCT.TopAbs import TopAbs_EDGE, TopAbs_FACE
+from OCCT.TopExp import TopExp
+from OCCT.TopLoc import TopLoc_Location
+from OCCT.TopoDS import TopoDS, TopoDS_Face
+from OCCT.TopTools import TopTools_IndexedMapOfShape
+
+
+def nb_subshapes(shape, shape_type):
+    subshapes = TopTools_IndexedMapOfShape()
+    TopExp.MapShapes_(shape, shape_type, subshapes)
+    return subshapes.Extent()
+
+
+class Test_BinTools_Bytes(unittest.TestCase):
+    """
+    Test for BinTools bytes serialization and pickling.
+    """
+
+    def test_Bytes(self):
+        """
+        Test BinTools::ToBytes_ and BinTools::FromBytes_.
+        """
+        box = BRepPrimAPI_MakeBox(10, 20, 30).Shape()
+        data = BinTools.ToBytes_(box)
+        self.assertIsInstance(data, bytes)
+        shape = BinTools.FromBytes_(data)
+        self.assertEqual(nb_subshapes(shape, TopAbs_FACE), 6)
+        # the edges shared by the faces are still shared
+        self.assertEqual(nb_subshapes(shape, TopAbs_EDGE), 12)
+
+    def test_Buffer(self):
+        """
+        Test BinTools::FromBytes_ with a bytearray and a memoryview.
+        """
+        data = BinTools.ToBytes_(BRepPrimAPI_MakeBox(10, 20, 30).Shape())
+        shape = BinTools.FromBytes_(bytearray(data))
+        self.assertEqual(nb_subshapes(shape, TopAbs_EDGE), 12)
+        shape = BinTools.FromBytes_(memoryview(data))
+        self.assertEqual(nb_subshapes(shape, TopAbs_FACE), 6)
+
+    def test_Triangles(self):
+        """
+        Test BinTools::ToBytes_ with and without triangulation.
+        """
+        box = BRepPrimAPI_MakeBox(10, 20, 30).Shape()
+        BRepMesh_IncrementalMesh(box, 1.0)
+
+        shape = BinTools.FromBytes_(BinTools.ToBytes_(box))
+        faces = TopTools_IndexedMapOfShape()
+        TopExp.MapShapes_(shape, TopAbs_FACE, faces)
+        face = TopoDS.Face_(faces.FindKey(1))
+        self.assertIsNone(BRep_Tool.Triangulation_(face, TopLoc_Location()))
+
+        shape = BinTools.FromBytes_(BinTools.ToBytes_(box, True))
+        faces = TopTools_IndexedMapOfShape()
+        TopExp.MapShapes_(shape, TopAbs_FACE, faces)
+        face = TopoDS.Face_(faces.FindKey(1))
+        self.assertIsNotNone(BRep_Tool.Triangulation_(face, TopLoc_Location()))
+
+    def test_PickleShape(self):
+        """
+        Test pickling a TopoDS_Shape and a TopoDS_Face.
+        """
+        box = BRepPrimAPI_MakeBox(10, 20, 30).Shape()
+        shape = pickle.loads(pickle.dumps(box))
+        self.assertEqual(nb_subshapes(shape, TopAbs_EDGE), 12)
+
+        faces = TopTools_IndexedMapOfShape()
+        TopExp.MapShapes_(box, TopAbs_FACE, faces)
+        face = pickle.loads(pickle.dumps(TopoDS.Face_(faces.FindKey(1))))
+        self.assertIsInstance(face, TopoDS_Face)
+        self.assertEqual(nb_subshapes(face, TopAbs_EDGE), 4)
+
+    def test_PickleGeom(self):
+        """
+        Test pickling Geom and Geom2d handles.
+        """
+        line = pickle.loads(pickle.dumps(Geom_Line(gp_Pnt(1, 2, 3), gp_Dir(0, 0, 1))))
+        self.assertIsInstance(line, Geom_Line)
+        self.assertAlmostEqual(line.Value(2.0).Z(), 5.0)
+
+        plane = pickle.loads(pickle.dumps(Geom_Plane(gp_Pnt(0, 0, 1), gp_Dir(0, 0, 1))))
+        self.assertIsInstance(plane, Geom_Plane)
+        self.assertAlmostEqual(plane.Value(1.0, 2.0).Z(), 1.0)
+
+        circle = pickle.loads(pickle.dumps(Geom2d_Circle(gp_Ax2d(gp_Pnt2d(), gp_Dir2d(1, 0)), 2.0)))
+        self.assertIsInstance(circle, Geom2d_Circle)
+        self.assertAlmostEqual(circle.Radius(), 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+# This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+# geometry kernel.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC
+# Copyright (C) 2019 Trevor Laughlin and the pyOCCT contributors
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+import gc
+import unittest
+
+from OCCT.BRepAlgoAPI import BRepAlgoAPI_Common, BRepAlgoAPI_Cut, BRepAlgoAPI_Fuse
+from OCCT.BRepGProp import BRepGProp
+from OCCT.BRepPrimAPI import BRepPrimAPI_MakeBox
+from OCCT.GProp import GProp_GProps
+from OCCT.gp import gp_Pnt
+
+from OCCT.Extend.BooleanUtils import BooleanAlgo, BooleanOperations, boolean_results, fuse_shapes
+
+
+def _volume(shape):
+    """
+    Volume of a shape.
+    """
+    props = GProp_GProps()
+    BRepGProp.VolumeProperties_(shape, props)
+    return props.Mass()
+
+
+class Test_BooleanOperations(unittest.TestCase):
+    """
+    Test for BooleanOperations class.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Set up with two overlapping boxes.
+        """
+        cls._box1 = BRepPrimAPI_MakeBox(10.0, 10.0, 10.0).Shape()
+        cls._box2 = BRepPrimAPI_MakeBox(gp_Pnt(5.0, 5.0, 5.0), 10.0, 10.0, 10.0).Shape()
+
+    def test_Operations(self):
+        """
+        Test common, fuse, cut and cut21 against BRepAlgoAPI_Common,
+        BRepAlgoAPI_Fuse and BRepAlgoAPI_Cut.
+        """
+        bop = BooleanOperations(self._box1, self._box2)
+        expected = {
+            'common': BRepAlgoAPI_Common(self._box1, self._box2).Shape(),
+            'fuse': BRepAlgoAPI_Fuse(self._box1, self._box2).Shape(),
+            'cut': BRepAlgoAPI_Cut(self._box1, self._box2).Shape(),
+            'cut21': BRepAlgoAPI_Cut(self._box2, self._box1).Shape(),
+        }
+        for name, shape in expected.items():
+            self.assertAlmostEqual(_volume(getattr(bop, name)()), _volume(shape))
+        self.assertAlmostEqual(_volume(bop.common()), 125.0)
+        self.assertAlmostEqual(_volume(bop.fuse()), 1875.0)
+
+    def test_SectionAndGeneralFuse(self):
+        """
+        Test BooleanOperations::section and BooleanOperations::general_fuse.
+        """
+        bop = BooleanOperations(self._box1, self._box2)
+        self.assertFalse(bop.section().IsNull())
+        self.assertAlmostEqual(_volume(bop.general_fuse()), 1875.0)
+
+    def test_Results(self):
+        """
+        Test BooleanOperations::results and boolean_results.
+        """
+        results = boolean_results(self._box1, self._box2)
+        self.assertEqual(set(results), {'common', 'cut', 'fuse'})
+        self.assertAlmostEqual(_volume(results['cut']), 875.0)
+
+        bop = BooleanOperations(self._box1, self._box2)
+        self.assertRaises(ValueError, bop.results, ['__init__'])
+        self.assertRaises(ValueError, bop.results, ['pave_filler'])
+
+    def test_OperationLifetime(self):
+        """
+        Test the algorithm of BooleanOperations::operation keeps the
+        intersection alive.
+        """
+        algo = BooleanOperations(self._box1, self._box2).operation('cut')
+        gc.collect()
+        self.assertIsInstance(algo, BooleanAlgo)
+        self.assertFalse(algo.SectionEdges().IsEmpty())
+        self.assertAlmostEqual(_volume(algo.Shape()), 875.0)
+
+    def test_NoTools(self):
+        """
+        Test the operations needing tools raise without them.
+        """
+        bop = BooleanOperations([self._box1, self._box2])
+        self.assertRaises(AssertionError, bop.fuse)
+        self.assertAlmostEqual(_volume(bop.general_fuse()), 1875.0)
+
+
+class Test_fuse_shapes(unittest.TestCase):
+    """
+    Test for fuse_shapes function.
+    """
+
+    def test_Single(self):
+        """
+        Test fuse_shapes returns a single shape as is.
+        """
+        box = BRepPrimAPI_MakeBox(1.0, 2.0, 3.0).Shape()
+        self.assertTrue(fuse_shapes([box]).IsSame(box))
+
+    def test_Three(self):
+        """
+        Test fuse_shapes with three overlapping boxes.
+        """
+        boxes = [BRepPrimAPI_MakeBox(gp_Pnt(5.0 * i, 0.0, 0.0), 10.0, 10.0, 10.0).Shape()
+                 for i in range(3)]
+        self.assertAlmostEqual(_volume(fuse_shapes(boxes)), 2000.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
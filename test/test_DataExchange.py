@@ -0,0 +1,301 @@
+# This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+# geometry kernel.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC
+# Copyright (C) 2019 Trevor Laughlin and the pyOCCT contributors
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from OCCT.BRepGProp import BRepGProp
+from OCCT.BRepPrimAPI import BRepPrimAPI_MakeBox
+from OCCT.GProp import GProp_GProps
+from OCCT.Interface import Interface_Static
+from OCCT.Quantity import Quantity_Color, Quantity_TOC_RGB
+from OCCT.TCollection import TCollection_ExtendedString
+from OCCT.TDocStd import TDocStd_Document
+from OCCT.TopAbs import TopAbs_FACE
+from OCCT.TopExp import TopExp_Explorer
+from OCCT.TopLoc import TopLoc_Location
+from OCCT.XCAFDoc import XCAFDoc_ColorGen, XCAFDoc_DocumentTool
+from OCCT.gp import gp_Trsf, gp_Vec
+
+from OCCT.Extend.DataExchange import (BrepExporter, IgesExporter, ShapeCache, StepExporter,
+                                      StlExporter, read_brep_file, read_iges_file, read_step_file,
+                                      iter_step_file_shapes, iter_xcaf_shapes, read_step_files,
+                                      read_stl_file, write_step_file)
+from OCCT.Extend.Meshing import MeshingPolicy, mesh_shapes
+
+
+def _volume(shape):
+    """
+    Volume of a shape.
+    """
+    props = GProp_GProps()
+    BRepGProp.VolumeProperties_(shape, props)
+    return props.Mass()
+
+
+def _nb_faces(shape):
+    """
+    Number of faces of a shape.
+    """
+    nb_faces = 0
+    explorer = TopExp_Explorer(shape, TopAbs_FACE)
+    while explorer.More():
+        nb_faces += 1
+        explorer.Next()
+    return nb_faces
+
+
+class Test_ShapeCache(unittest.TestCase):
+    """
+    Test for ShapeCache class.
+    """
+
+    def setUp(self):
+        """
+        Set up with an empty cache in a temporary directory and a box.
+        """
+        self._dir = tempfile.mkdtemp()
+        self._cache = ShapeCache(self._dir, max_size=None)
+        self._box = BRepPrimAPI_MakeBox(10.0, 20.0, 30.0).Shape()
+
+    def tearDown(self):
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def test_PutGet(self):
+        """
+        Test ShapeCache::put and ShapeCache::get round trip.
+        """
+        self.assertIsNone(self._cache.get('missing'))
+        self._cache.put('box', self._box, {'nb_roots': 1})
+        shape, metadata = self._cache.get('box')
+        self.assertEqual(metadata, {'nb_roots': 1})
+        self.assertEqual(shape.ShapeType(), self._box.ShapeType())
+        self.assertEqual(shape.NbChildren(), self._box.NbChildren())
+        self.assertFalse([name for name in os.listdir(self._dir) if name.startswith('.tmp_')])
+
+    def test_Evict(self):
+        """
+        Test ShapeCache::evict removes the least recently used entries.
+        """
+        for i, key in enumerate(('a', 'b', 'c')):
+            self._cache.put(key, self._box)
+            meta_path = os.path.join(self._dir, key + '.json')
+            os.utime(meta_path, (1000.0 * (i + 1), 1000.0 * (i + 1)))
+        # a becomes the most recently used
+        self.assertIsNotNone(self._cache.get('a'))
+
+        self._cache.evict(self._cache.size() - 1)
+        self.assertIsNone(self._cache.get('b'))
+        self.assertIsNotNone(self._cache.get('a'))
+        self.assertIsNotNone(self._cache.get('c'))
+        self.assertEqual(len(self._cache.entries()), 2)
+
+    def test_StaleTemporaryFiles(self):
+        """
+        Test ShapeCache::evict removes the old temporary files only.
+        """
+        stale = os.path.join(self._dir, '.tmp_stale.bin')
+        recent = os.path.join(self._dir, '.tmp_recent.bin')
+        for path in (stale, recent):
+            with open(path, 'wb') as f:
+                f.write(b'partial')
+        old = time.time() - 7200
+        os.utime(stale, (old, old))
+        self._cache.evict()
+        self.assertFalse(os.path.exists(stale))
+        self.assertTrue(os.path.exists(recent))
+
+    def test_Truncated(self):
+        """
+        Test ShapeCache::get gives a miss on a truncated shape file.
+        """
+        self._cache.put('box', self._box)
+        brep_path = os.path.join(self._dir, 'box.bin')
+        with open(brep_path, 'rb') as f:
+            data = f.read()
+        with open(brep_path, 'wb') as f:
+            f.write(data[:len(data) // 2])
+        self.assertIsNone(self._cache.get('box'))
+
+
+class Test_read_step_files(unittest.TestCase):
+    """
+    Test for read_step_files function.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Write a STEP file with one box and a STEP file with two boxes.
+        """
+        cls._dir = tempfile.mkdtemp()
+        cls._one = os.path.join(cls._dir, 'one.stp')
+        cls._two = os.path.join(cls._dir, 'two.stp')
+        write_step_file(BRepPrimAPI_MakeBox(1.0, 2.0, 3.0).Shape(), cls._one)
+        write_step_file([BRepPrimAPI_MakeBox(1.0, 1.0, 1.0).Shape(),
+                         BRepPrimAPI_MakeBox(2.0, 2.0, 2.0).Shape()], cls._two)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls._dir, ignore_errors=True)
+
+    def test_Order(self):
+        """
+        Test read_step_files returns the results in the order of the files,
+        with the error of a bad file at its place.
+        """
+        missing = os.path.join(self._dir, 'missing.stp')
+        results = read_step_files([self._two, missing, self._one], workers=2, as_compound=False)
+        self.assertEqual(len(results), 3)
+        self.assertEqual(len(results[0]), 2)
+        self.assertAlmostEqual(_volume(results[0][0]), 1.0)
+        self.assertAlmostEqual(_volume(results[0][1]), 8.0)
+        self.assertIsInstance(results[1], FileNotFoundError)
+        self.assertAlmostEqual(_volume(results[2]), 6.0)
+
+    def test_RaiseExceptions(self):
+        """
+        Test read_step_files raises the error of a bad file when
+        return_exceptions is False.
+        """
+        missing = os.path.join(self._dir, 'missing.stp')
+        with self.assertRaises(FileNotFoundError):
+            read_step_files([self._one, missing], workers=1, return_exceptions=False)
+
+
+class Test_Exporters(unittest.TestCase):
+    """
+    Test for the StepExporter, IgesExporter, StlExporter and BrepExporter
+    classes.
+    """
+
+    def setUp(self):
+        """
+        Set up with two boxes of volume 1 and 8 in a temporary directory.
+        """
+        self._dir = tempfile.mkdtemp()
+        self._boxes = [BRepPrimAPI_MakeBox(1.0, 1.0, 1.0).Shape(),
+                       BRepPrimAPI_MakeBox(2.0, 2.0, 2.0).Shape()]
+
+    def tearDown(self):
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def test_StepExporter(self):
+        """
+        Test StepExporter writes one root per shape and restores the static
+        parameters.
+        """
+        filename = os.path.join(self._dir, 'boxes.stp')
+        unit = Interface_Static.CVal_('write.step.unit')
+        with StepExporter(filename, 'AP214IS', unit='M') as exporter:
+            self.assertEqual(Interface_Static.CVal_('write.step.unit'), unit)
+            for box in self._boxes:
+                exporter.add(box)
+        self.assertEqual(exporter.nb_shapes, 2)
+        shapes = read_step_file(filename, as_compound=False, verbosity=False)
+        self.assertEqual(len(shapes), 2)
+        self.assertEqual(_nb_faces(shapes[1]), 6)
+
+    def test_IgesExporter(self):
+        """
+        Test IgesExporter.
+        """
+        filename = os.path.join(self._dir, 'boxes.igs')
+        with IgesExporter(filename) as exporter:
+            exporter.add(self._boxes)
+        self.assertEqual(_nb_faces(read_iges_file(filename)), 12)
+
+    def test_StlExporter(self):
+        """
+        Test StlExporter with meshed boxes.
+        """
+        mesh_shapes(self._boxes, MeshingPolicy(0.1))
+        for mode in ('ascii', 'binary'):
+            filename = os.path.join(self._dir, f'boxes_{mode}.stl')
+            with StlExporter(filename, mode) as exporter:
+                exporter.add(self._boxes)
+            # two triangles per face of the boxes
+            self.assertEqual(_nb_faces(read_stl_file(filename)), 24)
+
+    def test_BrepExporter(self):
+        """
+        Test BrepExporter in text and binary formats.
+        """
+        for binary in (False, True):
+            filename = os.path.join(self._dir, f'boxes_{binary}.brep')
+            with BrepExporter(filename, binary) as exporter:
+                exporter.add(self._boxes)
+            shape = read_brep_file(filename)
+            self.assertEqual(shape.NbChildren(), 2)
+            self.assertAlmostEqual(_volume(shape), 9.0)
+
+
+class Test_iter_xcaf_shapes(unittest.TestCase):
+    """
+    Test for iter_xcaf_shapes and iter_step_file_shapes functions.
+    """
+
+    def test_Instances(self):
+        """
+        Test the records of one part instanced twice in an assembly.
+        """
+        doc = TDocStd_Document(TCollection_ExtendedString('test'))
+        shape_tool = XCAFDoc_DocumentTool.ShapeTool_(doc.Main())
+        color_tool = XCAFDoc_DocumentTool.ColorTool_(doc.Main())
+        red = Quantity_Color(1.0, 0.0, 0.0, Quantity_TOC_RGB)
+        blue = Quantity_Color(0.0, 0.0, 1.0, Quantity_TOC_RGB)
+
+        root = shape_tool.NewShape()
+        part = shape_tool.AddShape(BRepPrimAPI_MakeBox(1.0, 2.0, 3.0).Shape(), False)
+        color_tool.SetColor(part, red, XCAFDoc_ColorGen)
+        locations = []
+        components = []
+        for i in range(2):
+            trsf = gp_Trsf()
+            trsf.SetTranslation(gp_Vec(10.0 * i, 0.0, 0.0))
+            locations.append(TopLoc_Location(trsf))
+            components.append(shape_tool.AddComponent(root, part, locations[-1]))
+        # the instance color takes precedence over the part color
+        color_tool.SetColor(components[1], blue, XCAFDoc_ColorGen)
+        shape_tool.UpdateAssemblies()
+
+        records = list(iter_xcaf_shapes(doc))
+        self.assertEqual(len(records), 2)
+        for record, component, location in zip(records, components, locations):
+            self.assertEqual(len(record.label_path), 3)
+            self.assertTrue(record.label_path[0].IsEqual(root))
+            self.assertTrue(record.label_path[1].IsEqual(component))
+            self.assertTrue(record.label_path[2].IsEqual(part))
+            self.assertTrue(record.location.IsEqual(location))
+        self.assertTrue(records[0].shape.IsSame(records[1].shape))
+        self.assertTrue(records[0].color.IsEqual(red))
+        self.assertTrue(records[1].color.IsEqual(blue))
+
+    def test_Missing(self):
+        """
+        Test iter_step_file_shapes raises on a missing file when called.
+        """
+        self.assertRaises(FileNotFoundError, iter_step_file_shapes, 'missing.stp')
+
+
+if __name__ == '__main__':
+    unittest.main()
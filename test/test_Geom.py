@@ -25,6 +25,11 @@ from OCCT.GeomConvert import GeomConvert
 from OCCT.TColStd import TColStd_Array2OfReal
 from OCCT.gp import gp_Pnt, gp_Ax3, gp_Dir, gp_Sphere
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class Test_Geom_Surface(unittest.TestCase):
     """
@@ -114,5 +119,49 @@ class Test_Geom_BSplineSurface(unittest.TestCase):
         self.assertAlmostEqual(weights.Value(3, 3), 1.0)
 
 
+@unittest.skipIf(np is None, 'numpy is not installed')
+class Test_Geom_BatchEval(unittest.TestCase):
+    """
+    Test for the batch evaluation methods of Geom_Surface.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Set up with a Geom_SphericalSurface and random parameters.
+        """
+        cls._surf = Geom_SphericalSurface(gp_Ax3(), 2.0)
+        rng = np.random.default_rng(0)
+        cls._uv = np.column_stack([rng.uniform(0., 2. * math.pi, 2000),
+                                   rng.uniform(-1.5, 1.5, 2000)])
+
+    def test_D0Array(self):
+        """
+        Test Geom_Surface::D0Array against Geom_Surface::Value.
+        """
+        pnts = self._surf.D0Array(self._uv)
+        self.assertEqual(pnts.shape, (2000, 3))
+        u, v = self._uv[10]
+        self.assertTrue(np.allclose(pnts[10], self._surf.Value(u, v).Coord()))
+        self.assertTrue(np.allclose(np.linalg.norm(pnts, axis=1), 2.0))
+
+    def test_Threads(self):
+        """
+        Test Geom_Surface::D1Array gives the same result on several threads.
+        """
+        single = self._surf.D1Array(self._uv)
+        multi = self._surf.D1Array(self._uv, 4)
+        for a, b in zip(single, multi):
+            self.assertTrue(np.array_equal(a, b))
+
+    def test_NormalArray(self):
+        """
+        Test Geom_Surface::NormalArray.
+        """
+        pnts = self._surf.D0Array(self._uv)
+        normals = self._surf.NormalArray(self._uv, 0)
+        self.assertTrue(np.allclose(np.abs(np.einsum('ij,ij->i', normals, pnts)), 2.0))
+
+
 if __name__ == '__main__':
     unittest.main()
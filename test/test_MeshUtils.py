@@ -0,0 +1,128 @@
+# This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+# geometry kernel.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC
+# Copyright (C) 2019 Trevor Laughlin and the pyOCCT contributors
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+import os
+import shutil
+import tempfile
+import unittest
+
+from OCCT.BRepPrimAPI import BRepPrimAPI_MakeBox
+
+from OCCT.Extend.MeshUtils import (get_shape_mesh_arrays, read_mesh_file, read_ply_mesh,
+                                   read_stl_mesh, write_ply_mesh, write_stl_mesh)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_PLY_HEADER = (b'ply\nformat binary_little_endian 1.0\nelement vertex 3\n'
+               b'property float x\nproperty float y\nproperty float z\n'
+               b'element face 1\nproperty list uchar int vertex_indices\nend_header\n')
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class Test_read_ply_mesh(unittest.TestCase):
+    """
+    Test for read_ply_mesh function.
+    """
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def _write(self, name, data):
+        filename = os.path.join(self._dir, name)
+        with open(filename, 'wb') as f:
+            f.write(data)
+        return filename
+
+    def test_Triangle(self):
+        """
+        Test read_ply_mesh and read_mesh_file with a single triangle, the
+        STL options being ignored.
+        """
+        vertices = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]], '<f4')
+        face = np.array([(3, (0, 1, 2))], [('count', 'u1'), ('indices', '<i4', (3,))])
+        filename = self._write('triangle.ply', _PLY_HEADER + vertices.tobytes() + face.tobytes())
+        mesh = read_ply_mesh(filename)
+        self.assertTrue(np.allclose(mesh.vertices, vertices))
+        self.assertTrue(np.array_equal(mesh.triangles, [[0, 1, 2]]))
+        mesh = read_mesh_file(filename, merge_vertices=False)
+        self.assertEqual(mesh.triangles.shape, (1, 3))
+
+    def test_Truncated(self):
+        """
+        Test read_ply_mesh raises IOError on a truncated vertex element.
+        """
+        vertices = np.zeros((2, 3), '<f4')
+        filename = self._write('truncated.ply', _PLY_HEADER + vertices.tobytes())
+        with self.assertRaises(IOError):
+            read_ply_mesh(filename)
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class Test_write_mesh(unittest.TestCase):
+    """
+    Test for write_stl_mesh and write_ply_mesh functions.
+    """
+
+    def setUp(self):
+        """
+        Set up with a meshed box in a temporary directory.
+        """
+        self._dir = tempfile.mkdtemp()
+        self._box = BRepPrimAPI_MakeBox(1.0, 2.0, 3.0).Shape()
+        self._mesh = get_shape_mesh_arrays(self._box, linear_deflection=0.1)
+
+    def tearDown(self):
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def _check(self, mesh):
+        self.assertEqual(len(mesh.triangles), len(self._mesh.triangles))
+        self.assertTrue(np.allclose(mesh.vertices.min(axis=0), (0.0, 0.0, 0.0)))
+        self.assertTrue(np.allclose(mesh.vertices.max(axis=0), (1.0, 2.0, 3.0)))
+
+    def test_write_stl_mesh(self):
+        """
+        Test write_stl_mesh round trip, from the shape and from its mesh.
+        """
+        for source in (self._box, self._mesh):
+            filename = os.path.join(self._dir, 'box.stl')
+            write_stl_mesh(source, filename, chunk_size=5)
+            self.assertEqual(os.path.getsize(filename), 84 + 50 * len(self._mesh.triangles))
+            self._check(read_stl_mesh(filename))
+            self._check(read_stl_mesh(filename, merge_vertices=False))
+
+    def test_write_ply_mesh(self):
+        """
+        Test write_ply_mesh round trip, with normals and face ids.
+        """
+        filename = os.path.join(self._dir, 'box.ply')
+        write_ply_mesh(self._mesh, filename, with_face_ids=True)
+        mesh = read_ply_mesh(filename)
+        self._check(mesh)
+        self.assertEqual(mesh.normals.shape, mesh.vertices.shape)
+        self.assertTrue(np.array_equal(mesh.triangles, self._mesh.triangles))
+
+
+if __name__ == '__main__':
+    unittest.main()
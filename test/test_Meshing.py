@@ -0,0 +1,73 @@
+# This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+# geometry kernel.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC
+# Copyright (C) 2019 Trevor Laughlin and the pyOCCT contributors
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+import unittest
+
+from OCCT.BRepPrimAPI import BRepPrimAPI_MakeBox
+from OCCT.gp import gp_Trsf, gp_Vec
+from OCCT.TopAbs import TopAbs_FACE
+from OCCT.TopExp import TopExp_Explorer
+from OCCT.TopLoc import TopLoc_Location
+
+from OCCT.Extend.Meshing import MeshingPolicy, _share_subshapes, mesh_shapes
+
+
+class Test_mesh_shapes(unittest.TestCase):
+    """
+    Test for OCCT.Extend.Meshing.mesh_shapes.
+    """
+
+    def test_Instances(self):
+        """
+        Test mesh_shapes with two located copies of one solid.
+        """
+        box = BRepPrimAPI_MakeBox(10, 20, 30).Shape()
+        trsf = gp_Trsf()
+        trsf.SetTranslation(gp_Vec(100, 0, 0))
+        copy = box.Moved(TopLoc_Location(trsf))
+        self.assertTrue(_share_subshapes([box, copy]))
+        self.assertFalse(_share_subshapes([box, BRepPrimAPI_MakeBox(1, 2, 3).Shape()]))
+
+        reports = mesh_shapes([box, copy], MeshingPolicy(1.0), workers=2)
+        self.assertTrue(all(report.done for report in reports))
+        self.assertEqual(reports[0].nb_triangles, reports[1].nb_triangles)
+        self.assertGreater(reports[0].nb_triangles, 0)
+
+    def test_AdjacentFaces(self):
+        """
+        Test mesh_shapes with two adjacent faces of one box, sharing an edge
+        but no face.
+        """
+        box = BRepPrimAPI_MakeBox(10, 20, 30).Shape()
+        faces = []
+        explorer = TopExp_Explorer(box, TopAbs_FACE)
+        while explorer.More():
+            faces.append(explorer.Current())
+            explorer.Next()
+        # faces of BRepPrimAPI_MakeBox: xmin, xmax, ymin, ymax, zmin, zmax
+        self.assertTrue(_share_subshapes([faces[0], faces[2]]))
+        self.assertFalse(_share_subshapes([faces[0], faces[1]]))
+
+        reports = mesh_shapes([faces[0], faces[2]], MeshingPolicy(1.0), workers=2)
+        self.assertTrue(all(report.done for report in reports))
+        self.assertTrue(all(report.nb_triangles > 0 for report in reports))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+# This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+# geometry kernel.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC
+# Copyright (C) 2019 Trevor Laughlin and the pyOCCT contributors
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+import unittest
+
+from OCCT.Message import Message_PyProgressIndicator
+
+
+class Test_Message_PyProgressIndicator(unittest.TestCase):
+    """
+    Test for Message_PyProgressIndicator class.
+    """
+
+    def test_Cancel(self):
+        """
+        Test Message_PyProgressIndicator::Cancel.
+        """
+        indicator = Message_PyProgressIndicator()
+        self.assertFalse(indicator.IsCancelled())
+        progress_range = indicator.Start()
+        self.assertFalse(progress_range.UserBreak())
+        indicator.Cancel()
+        self.assertTrue(indicator.IsCancelled())
+        self.assertTrue(progress_range.UserBreak())
+        indicator.Start()
+        self.assertFalse(indicator.IsCancelled())
+
+    def test_TimeLimit(self):
+        """
+        Test Message_PyProgressIndicator::SetTimeLimit.
+        """
+        indicator = Message_PyProgressIndicator(lambda position, name: None, 0.0)
+        indicator.SetTimeLimit(0.0)
+        self.assertTrue(indicator.UserBreak())
+        self.assertTrue(indicator.IsCancelled())
+        indicator.SetTimeLimit(-1.0)
+        indicator.Start()
+        self.assertFalse(indicator.UserBreak())
+
+    def test_Position(self):
+        """
+        Test Message_PyProgressIndicator::Position.
+        """
+        indicator = Message_PyProgressIndicator()
+        indicator.Start()
+        self.assertEqual(indicator.Position(), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
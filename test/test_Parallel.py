@@ -0,0 +1,99 @@
+# This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+# geometry kernel.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC
+# Copyright (C) 2019 Trevor Laughlin and the pyOCCT contributors
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from OCCT.BRepPrimAPI import BRepPrimAPI_MakeBox
+
+from OCCT.Extend.Meshing import MeshingPolicy, mesh_shapes
+from OCCT.Extend.Parallel import configure, get_config, is_parallel, parallel
+
+
+class Test_parallel(unittest.TestCase):
+    """
+    Test for OCCT.Extend.Parallel.configure and parallel.
+    """
+
+    def setUp(self):
+        self._config = get_config()
+
+    def tearDown(self):
+        configure(*self._config)
+
+    def test_Configure(self):
+        """
+        Test configure returns the previous settings.
+        """
+        previous = configure(bop=not self._config.bop, meshing=not self._config.meshing)
+        self.assertEqual(previous, self._config)
+        self.assertEqual(is_parallel('bop'), not self._config.bop)
+        self.assertEqual(is_parallel('meshing'), not self._config.meshing)
+        self.assertEqual(is_parallel('readers'), self._config.readers)
+        self.assertRaises(AssertionError, configure, threads=0)
+
+    def test_Restore(self):
+        """
+        Test parallel restores the previous settings on exit.
+        """
+        with parallel(threads=self._config.threads + 1, bop=not self._config.bop,
+                      meshing=not self._config.meshing, readers=not self._config.readers) as config:
+            self.assertEqual(config, get_config())
+            self.assertEqual(config.threads, self._config.threads + 1)
+            self.assertEqual(config.bop, not self._config.bop)
+            self.assertEqual(config.meshing, not self._config.meshing)
+            self.assertEqual(config.readers, not self._config.readers)
+        self.assertEqual(get_config(), self._config)
+
+    def test_RestoreOnError(self):
+        """
+        Test parallel restores the previous settings when an exception is
+        raised in its block.
+        """
+        with self.assertRaises(ValueError):
+            with parallel(bop=not self._config.bop, meshing=not self._config.meshing):
+                self.assertEqual(is_parallel('meshing'), not self._config.meshing)
+                raise ValueError('error in the block')
+        self.assertEqual(get_config(), self._config)
+
+    def test_Meshing(self):
+        """
+        Test the meshing parallel mode selects the workers of mesh_shapes.
+        """
+        shapes = [BRepPrimAPI_MakeBox(1, 2, 3).Shape(), BRepPrimAPI_MakeBox(4, 5, 6).Shape()]
+        with mock.patch('OCCT.Extend.Meshing.ThreadPoolExecutor', wraps=ThreadPoolExecutor) as pool:
+            with parallel(meshing=False):
+                reports = mesh_shapes(shapes, MeshingPolicy(0.5))
+            self.assertTrue(all(report.done for report in reports))
+            pool.assert_not_called()
+
+            with parallel(meshing=True):
+                reports = mesh_shapes(shapes, MeshingPolicy(0.5), force=True)
+            self.assertTrue(all(report.done for report in reports))
+            workers = min(os.cpu_count() or 1, len(shapes))
+            if workers > 1:
+                pool.assert_called_once_with(max_workers=workers)
+            else:
+                pool.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+# This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+# geometry kernel.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC
+# Copyright (C) 2019 Trevor Laughlin and the pyOCCT contributors
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+import unittest
+
+from OCCT.Poly import Poly_Triangulation
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class Test_Poly_Triangulation_NumPy(unittest.TestCase):
+    """
+    Test for Poly_Triangulation NumPy conversions.
+    """
+
+    def test_FromArrays(self):
+        """
+        Test Poly_Triangulation::FromArrays_ and Poly_Triangulation::Arrays.
+        """
+        nodes = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=float)
+        tris = np.array([[0, 2, 1], [0, 1, 3], [0, 3, 2], [1, 2, 3]])
+        tri = Poly_Triangulation.FromArrays_(nodes, tris)
+        self.assertEqual(tri.NbNodes(), 4)
+        self.assertEqual(tri.NbTriangles(), 4)
+        self.assertEqual(tri.Triangle(1).Value(2), 3)
+
+        nodes2, tris2, normals = tri.Arrays()
+        np.testing.assert_array_equal(nodes2, nodes)
+        np.testing.assert_array_equal(tris2, tris)
+        self.assertIsNone(normals)
+
+    def test_Normals(self):
+        """
+        Test Poly_Triangulation::FromArrays_ with normals.
+        """
+        nodes = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]], dtype=float)
+        normals = np.array([[0, 0, 1]] * 3, dtype=np.float32)
+        tri = Poly_Triangulation.FromArrays_(nodes, [[0, 1, 2]], normals)
+        self.assertTrue(tri.HasNormals())
+        np.testing.assert_allclose(tri.Arrays()[2], normals)
+
+    def test_BadIndex(self):
+        """
+        Test Poly_Triangulation::FromArrays_ with an out of range index.
+        """
+        nodes = np.zeros((3, 3))
+        self.assertRaises(IndexError, Poly_Triangulation.FromArrays_, nodes, [[0, 1, 3]])
+
+
+if __name__ == '__main__':
+    unittest.main()
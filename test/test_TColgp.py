@@ -20,9 +20,14 @@
 import unittest
 
 from OCCT.TColgp import TColgp_HArray1OfPnt, TColgp_Array1OfPnt, \
-    TColgp_HSequenceOfPnt, TColgp_SequenceOfPnt
+    TColgp_HSequenceOfPnt, TColgp_SequenceOfPnt, TColgp_Array2OfPnt
 from OCCT.gp import gp_Pnt
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class Test_TColgp_HArray1OfPnt(unittest.TestCase):
     """
@@ -140,5 +145,58 @@ class Test_TColgp_HSequenceOfPnt(unittest.TestCase):
         self.assertAlmostEqual(p.X(), 2.)
 
 
+@unittest.skipIf(np is None, 'numpy is not installed')
+class Test_TColgp_NumPy(unittest.TestCase):
+    """
+    Test for the NumPy support of the TColgp array types.
+    """
+
+    def test_Array1_view(self):
+        """
+        Test TColgp_Array1OfPnt::__array__ shares memory with the array.
+        """
+        arr = TColgp_Array1OfPnt(1, 3)
+        arr.SetValue(1, gp_Pnt(0, 0, 0))
+        arr.SetValue(2, gp_Pnt(1, 2, 3))
+        arr.SetValue(3, gp_Pnt(4, 5, 6))
+        view = np.asarray(arr)
+        self.assertEqual(view.shape, (3, 3))
+        self.assertEqual(view.dtype, np.float64)
+        self.assertAlmostEqual(view[1, 2], 3.)
+        view[2, 0] = 10.
+        self.assertAlmostEqual(arr.Value(3).X(), 10.)
+
+    def test_Array1_init(self):
+        """
+        Test TColgp_Array1OfPnt construction from a NumPy array.
+        """
+        data = np.arange(12, dtype=float).reshape(4, 3)
+        arr = TColgp_Array1OfPnt(data, 0)
+        self.assertEqual(arr.Lower(), 0)
+        self.assertEqual(arr.Length(), 4)
+        self.assertAlmostEqual(arr.Value(3).Z(), 11.)
+        self.assertRaises(ValueError, TColgp_Array1OfPnt, np.zeros((4, 2)), 0)
+
+    def test_Array2_view(self):
+        """
+        Test TColgp_Array2OfPnt::__array__ is laid out row by row.
+        """
+        data = np.arange(18, dtype=float).reshape(2, 3, 3)
+        arr = TColgp_Array2OfPnt(data, 1, 1)
+        self.assertEqual(arr.NbRows(), 2)
+        self.assertEqual(arr.NbColumns(), 3)
+        self.assertAlmostEqual(arr.Value(2, 1).X(), 9.)
+        self.assertTrue(np.array_equal(np.asarray(arr), data))
+
+    def test_HArray1_view(self):
+        """
+        Test TColgp_HArray1OfPnt::__array__.
+        """
+        data = np.ones((5, 3))
+        harr = TColgp_HArray1OfPnt(data)
+        self.assertEqual(harr.Lower(), 1)
+        self.assertTrue(np.array_equal(np.asarray(harr), data))
+
+
 if __name__ == '__main__':
     unittest.main()
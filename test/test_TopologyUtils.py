@@ -0,0 +1,185 @@
+# This file is part of pyOCCT which provides Python bindings to the OpenCASCADE
+# geometry kernel.
+#
+# Copyright (C) 2016-2018  Laughlin Research, LLC
+# Copyright (C) 2019 Trevor Laughlin and the pyOCCT contributors
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301 USA
+import math
+import unittest
+
+from OCCT.BRepBuilderAPI import BRepBuilderAPI_MakeEdge
+from OCCT.BRepPrimAPI import BRepPrimAPI_MakeBox, BRepPrimAPI_MakeCylinder
+from OCCT.TopAbs import TopAbs_COMPSOLID, TopAbs_EDGE, TopAbs_FACE, TopAbs_REVERSED, TopAbs_VERTEX
+from OCCT.TopExp import TopExp, TopExp_Explorer
+from OCCT.TopTools import TopTools_IndexedMapOfShape
+from OCCT.gp import gp_Ax2, gp_Circ
+
+from OCCT.Extend.TopologyUtils import (TopologyExplorer, discretize_edge, discretize_edge_array,
+                                       topology_graph)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class Test_TopologyExplorer(unittest.TestCase):
+    """
+    Test for TopologyExplorer class.
+    """
+
+    def test_number_of_edges(self):
+        """
+        Test TopologyExplorer::number_of_edges with and without
+        ignore_orientation.
+        """
+        box = BRepPrimAPI_MakeBox(1.0, 2.0, 3.0).Shape()
+        for ignore_orientation, nb_edges in ((True, 12), (False, 24)):
+            explorer = TopologyExplorer(box, ignore_orientation)
+            self.assertEqual(explorer.number_of_edges(), nb_edges)
+            self.assertEqual(explorer.number_of_edges(), len(list(explorer.edges())))
+            face = next(explorer.faces())
+            self.assertEqual(explorer.number_of_edges_from_face(face), 4)
+
+    def test_streaming(self):
+        """
+        Test the TopologyExplorer iterators, with and without
+        ignore_orientation, against TopExp_Explorer and the indexed maps.
+        """
+        box = BRepPrimAPI_MakeBox(1.0, 2.0, 3.0).Shape()
+        for topology_type, name, nb_unique in ((TopAbs_FACE, 'faces', 6), (TopAbs_EDGE, 'edges', 12),
+                                               (TopAbs_VERTEX, 'vertices', 8)):
+            _map = TopTools_IndexedMapOfShape()
+            TopExp.MapShapes_(box, topology_type, _map)
+            self.assertEqual(_map.Extent(), nb_unique)
+            nb_all = 0
+            explorer = TopExp_Explorer(box, topology_type)
+            while explorer.More():
+                nb_all += 1
+                explorer.Next()
+
+            for ignore_orientation, nb_shapes in ((True, nb_unique), (False, nb_all)):
+                topo = TopologyExplorer(box, ignore_orientation)
+                shapes = list(getattr(topo, name)())
+                self.assertEqual(len(shapes), nb_shapes)
+                self.assertEqual(getattr(topo, 'number_of_' + name)(), nb_shapes)
+                self.assertEqual(topo.count_subshapes()[topology_type], nb_shapes)
+                self.assertTrue(all(_map.Contains(shape) for shape in shapes))
+                # streamed explorer, deduplicated by a map with ignore_orientation
+                streamed = list(topo._loop_topo(topology_type, None, TopAbs_COMPSOLID))
+                self.assertEqual(len(streamed), nb_shapes)
+                if ignore_orientation:
+                    self.assertEqual(topo.indexed_map(topology_type).Extent(), nb_shapes)
+
+    def test_adjacency(self):
+        """
+        Test TopologyExplorer::adjacency on a box, each face having 4
+        neighbours through its edges.
+        """
+        explorer = TopologyExplorer(BRepPrimAPI_MakeBox(1.0, 2.0, 3.0).Shape())
+        edge_faces = explorer.adjacency(TopAbs_EDGE, TopAbs_FACE)
+        self.assertEqual(len(edge_faces), 12)
+        self.assertTrue(all(len(faces) == 2 and faces == sorted(faces) for faces in edge_faces))
+
+        neighbours = [set() for _ in range(explorer.indexed_map(TopAbs_FACE).Extent())]
+        for faces in edge_faces:
+            for i in faces:
+                neighbours[i].update(j for j in faces if j != i)
+        self.assertEqual(len(neighbours), 6)
+        self.assertTrue(all(len(faces) == 4 for faces in neighbours))
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class Test_discretize_edge_array(unittest.TestCase):
+    """
+    Test for discretize_edge_array function.
+    """
+
+    @staticmethod
+    def _make_arc():
+        """
+        Make an edge on half a circle.
+        """
+        return BRepBuilderAPI_MakeEdge(gp_Circ(gp_Ax2(), 2.0), 0.0, math.pi).Edge()
+
+    def test_Forward(self):
+        """
+        Test discretize_edge_array against discretize_edge.
+        """
+        edge = self._make_arc()
+        for algorithm in ('QuasiUniformDeflection', 'UniformAbscissa', 'UniformDeflection'):
+            points = discretize_edge_array(edge, 0.05, algorithm)
+            self.assertEqual(points.shape[1], 3)
+            self.assertTrue(np.allclose(points, discretize_edge(edge, 0.05, algorithm)))
+
+    def test_Reversed(self):
+        """
+        Test discretize_edge_array reverses the points of a REVERSED edge as
+        discretize_edge does.
+        """
+        edge = self._make_arc()
+        edge.Orientation(TopAbs_REVERSED)
+        points = discretize_edge_array(edge, 0.05)
+        self.assertTrue(np.allclose(points, discretize_edge(edge, 0.05)))
+        self.assertTrue(np.allclose(points[0], (-2.0, 0.0, 0.0)))
+        self.assertTrue(np.allclose(points[-1], (2.0, 0.0, 0.0)))
+
+    def test_UnknownAlgorithm(self):
+        """
+        Test discretize_edge_array raises on an unknown algorithm.
+        """
+        self.assertRaises(AssertionError, discretize_edge_array, self._make_arc(), 0.05, 'Unknown')
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class Test_topology_graph(unittest.TestCase):
+    """
+    Test for topology_graph function.
+    """
+
+    def test_Box(self):
+        """
+        Test the CSR arrays of a box.
+        """
+        graph = topology_graph(BRepPrimAPI_MakeBox(1.0, 2.0, 3.0).Shape())
+        self.assertEqual((graph.nb_solids, graph.nb_faces, graph.nb_edges), (1, 6, 12))
+        self.assertTrue(np.array_equal(graph.face_edges.indptr, np.arange(0, 25, 4)))
+        self.assertTrue(np.array_equal(graph.edge_faces.indptr, np.arange(0, 25, 2)))
+        self.assertTrue(np.array_equal(graph.edge_vertices.indptr, np.arange(0, 25, 2)))
+        self.assertTrue(np.array_equal(np.sort(graph.solid_faces.indices), np.arange(6)))
+        self.assertTrue(np.all(graph.face_types == 0))
+        self.assertTrue(np.all(graph.edge_types == 0))
+        for face in range(graph.nb_faces):
+            for edge in graph.face_edges.neighbours(face):
+                self.assertIn(face, graph.edge_faces.neighbours(edge))
+
+    def test_Seam(self):
+        """
+        Test a seam edge is listed twice in its face and its face once in
+        edge_faces.
+        """
+        graph = topology_graph(BRepPrimAPI_MakeCylinder(1.0, 2.0).Shape())
+        self.assertEqual((graph.nb_faces, graph.nb_edges), (3, 3))
+        self.assertEqual(len(graph.face_edges.indices), 6)
+        self.assertEqual(len(graph.edge_faces.indices), 5)
+        seam = np.flatnonzero(np.diff(graph.edge_faces.indptr) == 1)
+        self.assertEqual(len(seam), 1)
+        face = graph.edge_faces.neighbours(seam[0])[0]
+        self.assertEqual(np.count_nonzero(graph.face_edges.neighbours(face) == seam[0]), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()